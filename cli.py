@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PyVideoTrans 无界面命令行，不需要 PySide6 图形环境
+
+使用方法：
+    python cli.py run job.json          执行 job.json 中的一个或多个任务(对象或对象数组)，结束后退出
+    python cli.py serve --port 9011     启动 HTTP 任务接口，接口说明见 videotrans/task/headless.py
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# 将项目根目录添加到 Python 路径
+ROOT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PyVideoTrans headless runner')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_parser = sub.add_parser('run', help='run jobs from a JSON file and exit')
+    run_parser.add_argument('job_file', help='JSON job spec, an object or a list of objects')
+    serve_parser = sub.add_parser('serve', help='start the HTTP job API')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=9011)
+    serve_parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+
+    import warnings
+    warnings.filterwarnings('ignore')
+    os.environ['KMP_DUPLICATE_LIB_OK'] = 'True'
+    os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = "1"
+
+    from videotrans.configure import config
+    from videotrans.task import headless
+
+    if args.command == 'serve':
+        try:
+            headless.serve(host=args.host, port=args.port, threads=args.threads)
+        finally:
+            config.exit_soft = True
+        return 0
+
+    specs = json.loads(Path(args.job_file).read_text(encoding='utf-8'))
+    if isinstance(specs, dict):
+        specs = specs['jobs'] if isinstance(specs.get('jobs'), list) else [specs]
+    try:
+        ok = headless.run_jobs(specs)
+    except KeyboardInterrupt:
+        ok = False
+    finally:
+        # 通知各阶段工作线程退出
+        config.exit_soft = True
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
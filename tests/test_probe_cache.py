@@ -0,0 +1,68 @@
+"""
+util/help_ffmpeg.py ffprobe 探测缓存：磁盘缓存跨进程复用，磁盘缓存损坏或被锁定时只使用内存缓存，探测不失败
+"""
+import json
+import sqlite3
+
+import pytest
+
+from videotrans.configure import config
+from videotrans.util import help_ffmpeg
+
+
+@pytest.fixture(autouse=True)
+def probe_env(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_ffprobe(cmd):
+        calls.append(cmd[-1])
+        return json.dumps({"format": {"duration": "1.5"}, "streams": []})
+
+    monkeypatch.setattr(config, 'CACHE_DIR', tmp_path.as_posix())
+    monkeypatch.setitem(config.settings, 'ffprobe_disk_cache', True)
+    monkeypatch.setattr(help_ffmpeg, 'runffprobe', fake_ffprobe)
+    monkeypatch.setattr(help_ffmpeg, '_probe_cache', help_ffmpeg.OrderedDict())
+    monkeypatch.setattr(help_ffmpeg, '_probe_db', None)
+    yield calls
+    if help_ffmpeg._probe_db is not None:
+        help_ffmpeg._probe_db.close()
+
+
+@pytest.fixture
+def media(tmp_path):
+    path = tmp_path / 'a.wav'
+    path.write_bytes(b'RIFF' + b'\0' * 100)
+    return path.as_posix()
+
+
+def test_disk_cache_reused_after_memory_cleared(media, probe_env):
+    assert help_ffmpeg.probe_media(media)['format']['duration'] == '1.5'
+    help_ffmpeg._probe_cache.clear()
+    assert help_ffmpeg.probe_media(media)['format']['duration'] == '1.5'
+    assert len(probe_env) == 1
+
+
+def test_corrupted_disk_cache_is_rebuilt(media, probe_env, tmp_path):
+    (tmp_path / 'ffprobe_cache.db').write_bytes(b'not a sqlite database' * 10)
+    assert help_ffmpeg.probe_media(media)['format']['duration'] == '1.5'
+    help_ffmpeg._probe_cache.clear()
+    assert help_ffmpeg.probe_media(media)['format']['duration'] == '1.5'
+    assert len(probe_env) == 1
+
+
+def test_locked_disk_cache_falls_back_to_memory(media, probe_env, tmp_path, monkeypatch):
+    help_ffmpeg.probe_media(media)
+    help_ffmpeg._probe_cache.clear()
+    monkeypatch.setattr(help_ffmpeg._probe_db, 'timeout', 0.1)
+    help_ffmpeg._probe_db.close()
+    other = sqlite3.connect((tmp_path / 'ffprobe_cache.db').as_posix())
+    other.execute('BEGIN EXCLUSIVE')
+    try:
+        assert help_ffmpeg.probe_media(media)['format']['duration'] == '1.5'
+        assert help_ffmpeg.probe_media(media)['format']['duration'] == '1.5'
+        help_ffmpeg.invalidate_probe(media)
+    finally:
+        other.rollback()
+        other.close()
+    # 锁定期间探测一次，之后由内存缓存返回
+    assert len(probe_env) == 2
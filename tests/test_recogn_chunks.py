@@ -0,0 +1,123 @@
+"""
+云端识别片段并发发送：本地 http.server 模拟识别接口，片段 0 响应慢于片段 1，片段 2 首次请求失败
+检查合并后的字幕顺序与片段顺序一致，且只重发失败的片段
+"""
+import threading
+import time
+import urllib.request
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+_base = pytest.importorskip('videotrans.recognition._base')
+pytest.importorskip('videotrans.translator._base')
+
+from videotrans.configure import config
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = Counter()
+    # 成功响应的片段序号，按完成先后
+    finished = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        index = int(self.path.rsplit('/', 1)[-1])
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with self.lock:
+            self.hits[index] += 1
+            attempt = self.hits[index]
+        if index == 0:
+            time.sleep(0.5)
+        if index == 2 and attempt == 1:
+            self.send_response(500)
+            self.end_headers()
+            return
+        with self.lock:
+            self.finished.append(index)
+        data = f'chunk{index}:{len(body)}'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@dataclass
+class _ChunkRecogn(_base.BaseRecogn):
+    CHUNK_RETRY_DELAY = 0
+
+    def _exec(self):
+        items = []
+        sr = self.VAD_SAMPLE_RATE
+        for i in range(4):
+            items.append({"index": i, "start": i * sr // 2, "end": (i + 1) * sr // 2,
+                          "start_time": i * 500, "end_time": (i + 1) * 500, "text": ""})
+
+        def _recogn_chunk(it):
+            req = urllib.request.Request(f'{self.api_url}/{it["index"]}', data=self.chunk_bytes(it),
+                                         headers={"Content-Type": self.chunk_mime()})
+            with urllib.request.urlopen(req, timeout=10) as res:
+                return res.read().decode('utf-8')
+
+        for it, txt in zip(items, self._map_chunks(_recogn_chunk, items)):
+            it['text'] = txt
+        return items
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = Counter()
+    _Handler.finished = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/chunk'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def recogn(tmp_path, monkeypatch, server):
+    audio_file = tmp_path / 'audio.wav'
+    sf.write(audio_file, np.zeros(16000 * 2, dtype=np.float32), 16000, subtype='PCM_16')
+    monkeypatch.setattr(config, 'current_status', 'ing')
+    monkeypatch.setattr(config, 'exit_soft', False)
+    monkeypatch.setitem(config.settings, 'recogn_concurrency', '4')
+    monkeypatch.setitem(config.settings, 'recogn_rps', '0')
+    monkeypatch.setitem(config.settings, 'recogn_chunk_retry', '2')
+    monkeypatch.setitem(config.settings, 'recogn_upload_format', 'wav')
+    obj = _ChunkRecogn(detect_language='en', audio_file=audio_file.as_posix())
+    obj.api_url = server
+    obj.audio_data = sf.read(audio_file, dtype='float32')[0]
+    return obj
+
+
+def test_chunks_keep_order_and_retry_only_failed(recogn):
+    raws = recogn._exec()
+
+    assert [it['text'].split(':')[0] for it in raws] == ['chunk0', 'chunk1', 'chunk2', 'chunk3']
+    assert [it['start_time'] for it in raws] == [0, 500, 1000, 1500]
+    # 每个片段都上传了完整的 wav 数据
+    assert all(int(it['text'].split(':')[1]) > 16000 for it in raws)
+    assert _Handler.hits == {0: 1, 1: 1, 2: 2, 3: 1}
+
+
+def test_chunks_sent_concurrently(recogn):
+    recogn._exec()
+    # 片段 0 响应最慢，并发时其余片段先于它完成
+    assert _Handler.finished[-1] == 0
+    assert _Handler.finished.index(1) < _Handler.finished.index(0)
+
+
+def test_chunks_sent_in_order_without_concurrency(recogn, monkeypatch):
+    monkeypatch.setitem(config.settings, 'recogn_concurrency', '1')
+    raws = recogn._exec()
+    assert [it['text'].split(':')[0] for it in raws] == ['chunk0', 'chunk1', 'chunk2', 'chunk3']
+    assert _Handler.finished == [0, 1, 2, 3]
+    assert _Handler.hits == {0: 1, 1: 1, 2: 2, 3: 1}
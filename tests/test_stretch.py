@@ -0,0 +1,69 @@
+"""
+task/_stretch.py 内存变速：输出长度、单双声道、空输入，以及 WSOLA 变速后音高不变
+"""
+import numpy as np
+import pytest
+
+from videotrans.task._stretch import time_stretch, _wsola
+
+SR = 16000
+
+
+def _sine(seconds, freq=440.0, channels=1):
+    t = np.arange(int(SR * seconds)) / SR
+    wave = (0.5 * np.sin(2 * np.pi * freq * t) * 32767).astype(np.int16)
+    return np.repeat(wave[:, None], channels, axis=1)
+
+
+def _dominant_freq(mono):
+    spectrum = np.abs(np.fft.rfft(mono.astype(np.float32) * np.hanning(len(mono))))
+    return np.fft.rfftfreq(len(mono), 1 / SR)[int(np.argmax(spectrum))]
+
+
+@pytest.mark.parametrize('channels', [1, 2])
+@pytest.mark.parametrize('target_frames', [8000, 12345, 16000, 24000])
+def test_exact_length(channels, target_frames):
+    samples = _sine(1.0, channels=channels)
+    out = time_stretch(samples, SR, target_frames)
+    assert out.shape == (target_frames, channels)
+    assert out.dtype == np.int16
+
+
+@pytest.mark.parametrize('rate', [0.75, 1.5])
+def test_wsola_length_follows_rate(rate):
+    x = _sine(1.0).astype(np.float32) / 32768.0
+    y = _wsola(x, rate)
+    assert len(y) == int(len(x) / rate)
+
+
+@pytest.mark.parametrize('target_frames', [10000, 24000])
+def test_pitch_preserved(target_frames):
+    # target_frames 小于原长时加速(rate > 1)，大于原长时减速(rate < 1)
+    samples = _sine(1.0)
+    out = time_stretch(samples, SR, target_frames)
+    body = out[1024:-1024, 0]
+    # 频率分辨率约 SR/len，允许一个频点的误差
+    assert abs(_dominant_freq(body) - 440.0) <= SR / len(body) + 1e-6
+    # 变速后不是静音
+    assert np.abs(body).max() > 8000
+
+
+def test_stereo_channels_kept():
+    left = _sine(1.0, freq=440.0)[:, 0]
+    right = _sine(1.0, freq=880.0)[:, 0]
+    out = time_stretch(np.stack([left, right], axis=1), SR, 12000)
+    assert abs(_dominant_freq(out[1024:-1024, 0]) - 440.0) < 5
+    assert abs(_dominant_freq(out[1024:-1024, 1]) - 880.0) < 5
+
+
+@pytest.mark.parametrize('channels', [1, 2])
+def test_empty_input(channels):
+    out = time_stretch(np.zeros((0, channels), dtype=np.int16), SR, 500)
+    assert out.shape == (500, channels)
+    assert not out.any()
+
+
+@pytest.mark.parametrize('target_frames', [0, -10])
+def test_non_positive_target(target_frames):
+    out = time_stretch(_sine(0.5, channels=2), SR, target_frames)
+    assert out.shape == (0, 2)
@@ -0,0 +1,128 @@
+"""
+translator/_cache.py 行级翻译记忆：规范化命中、作用域隔离、行数不一致时不缓存，以及数据库损坏或被锁定时的表现
+"""
+import sqlite3
+from dataclasses import dataclass
+
+import pytest
+
+from videotrans.configure import config
+from videotrans.translator import _cache
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_DIR', tmp_path.as_posix())
+    _cache._db.close()
+    monkeypatch.setattr(_cache._db, 'timeout', 0.1)
+    yield tmp_path / 'translate_cache' / 'memory.db'
+    _cache._db.close()
+
+
+def test_normalized_hit_and_miss():
+    _cache.put_many('scope', [('Hello   world ', '你好 世界'), ('Second\tline', '第二行')])
+
+    found = _cache.get_many('scope', [' Hello world', 'Second line', 'Third line'])
+    assert found == {'Hello world': '你好 世界', 'Second line': '第二行'}
+    assert _cache.get_many('scope', ['Hello, world']) == {}
+
+
+def test_blank_lines_not_stored():
+    _cache.put_many('scope', [('  ', 'x'), ('source', '  ')])
+    assert _cache.get_many('scope', ['source', '  ']) == {}
+
+
+def test_scope_isolated():
+    _cache.put_many('model-a', [('Hello', '你好')])
+    assert _cache.get_many('model-a', ['Hello']) == {'Hello': '你好'}
+    assert _cache.get_many('model-b', ['Hello']) == {}
+
+
+def test_corrupted_db_is_rebuilt(temp_db):
+    temp_db.parent.mkdir(parents=True)
+    temp_db.write_bytes(b'not a sqlite database' * 10)
+
+    assert _cache.get_many('scope', ['Hello']) == {}
+    _cache.put_many('scope', [('Hello', '你好')])
+    assert _cache.get_many('scope', ['Hello']) == {'Hello': '你好'}
+
+
+def test_locked_db_degrades_to_miss(temp_db):
+    _cache.put_many('scope', [('Hello', '你好')])
+    other = sqlite3.connect(temp_db.as_posix())
+    other.execute('BEGIN EXCLUSIVE')
+    try:
+        # 被锁定时视为未命中、不写入，不抛出异常
+        assert _cache.get_many('scope', ['Hello']) == {}
+        _cache.put_many('scope', [('World', '世界')])
+    finally:
+        other.rollback()
+        other.close()
+    assert _cache.get_many('scope', ['Hello', 'World']) == {'Hello': '你好'}
+
+
+@pytest.fixture
+def trans_cls(monkeypatch):
+    _base = pytest.importorskip('videotrans.translator._base')
+    pytest.importorskip('tenacity')
+    monkeypatch.setattr(config, 'current_status', 'ing')
+    monkeypatch.setattr(config, 'exit_soft', False)
+    monkeypatch.setitem(config.settings, 'trans_cache_max_rows', 200000)
+    monkeypatch.setitem(config.settings, 'trans_thread', 5)
+    monkeypatch.setitem(config.settings, 'aisendsrt', False)
+
+    @dataclass
+    class _FakeTrans(_base.BaseTrans):
+        reply: str = ''
+
+        def __post_init__(self):
+            super().__post_init__()
+            self.sent = []
+
+        def _item_task(self, data):
+            self.sent.append(data)
+            return self.reply
+
+        def _signal(self, **kwargs):
+            pass
+
+    return _FakeTrans
+
+
+def _srt(*texts):
+    return [{"line": i + 1, "time": "", "text": t} for i, t in enumerate(texts)]
+
+
+def test_translator_caches_matching_lines(trans_cls):
+    first = trans_cls(text_list=_srt('One', 'Two'), target_code='zh', reply='一\n二')
+    first.run()
+    assert len(first.sent) == 1
+
+    second = trans_cls(text_list=_srt('One ', ' Two'), target_code='zh', reply='unused')
+    assert [it['text'] for it in second.run()] == ['一', '二']
+    assert second.sent == []
+
+
+def test_translator_skips_cache_when_line_count_differs(trans_cls):
+    first = trans_cls(text_list='One\nTwo', target_code='zh', reply='一\n二\n三')
+    assert first.run() == '一\n二\n三'
+    assert _cache.get_many(first._cache_scope(), ['One', 'Two']) == {}
+
+    again = trans_cls(text_list='One\nTwo', target_code='zh', reply='一\n二\n三')
+    assert again.run() == '一\n二\n三'
+    assert len(again.sent) == 1
+
+
+def test_translator_scope_includes_model_and_language(trans_cls):
+    base = trans_cls(text_list='One', target_code='zh')
+    other_lang = trans_cls(text_list='One', target_code='ja')
+    other_model = trans_cls(text_list='One', target_code='zh')
+    other_model.model_name = 'another-model'
+    scopes = {base._cache_scope(), other_lang._cache_scope(), other_model._cache_scope()}
+    assert len(scopes) == 3
+
+    base.reply = '一'
+    base.run()
+    other_lang.reply = 'いち'
+    assert other_lang.run() == 'いち'
+    assert other_lang.sent == [['One']]
@@ -0,0 +1,71 @@
+"""
+translator/_base.py：限速等待期间取消时不再发送请求，翻译记忆命中与未命中混合时字幕按原文顺序显示
+"""
+from dataclasses import dataclass
+
+import pytest
+
+from videotrans.configure import config
+
+_base = pytest.importorskip('videotrans.translator._base')
+pytest.importorskip('tenacity')
+
+
+@pytest.fixture(autouse=True)
+def env(tmp_path, monkeypatch):
+    from videotrans.translator import _cache
+    _cache._db.close()
+    monkeypatch.setattr(config, 'CACHE_DIR', tmp_path.as_posix())
+    monkeypatch.setattr(config, 'current_status', 'ing')
+    monkeypatch.setattr(config, 'exit_soft', False)
+    monkeypatch.setitem(config.settings, 'trans_cache_max_rows', 200000)
+    monkeypatch.setitem(config.settings, 'trans_thread', 2)
+    monkeypatch.setitem(config.settings, 'aisendsrt', False)
+    monkeypatch.setitem(config.settings, 'trans_concurrency', 1)
+    yield
+    _cache._db.close()
+
+
+@dataclass
+class _FakeTrans(_base.BaseTrans):
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.sent = []
+        self.subtitles = []
+
+    def _item_task(self, data):
+        self.sent.append(data)
+        return "\n".join(f'T:{line}' for line in data)
+
+    def _signal(self, **kwargs):
+        if kwargs.get('type') == 'subtitle':
+            self.subtitles.append(kwargs['text'].strip())
+
+
+def _srt(*texts):
+    return [{"line": i + 1, "time": "", "text": t} for i, t in enumerate(texts)]
+
+
+def test_cancel_while_rate_limited_skips_request(monkeypatch):
+    class _CancellingLimiter:
+        def acquire(self, tokens, rps, tpm, is_exit):
+            # 模拟等待限速期间任务被取消，acquire 随即返回
+            config.current_status = 'stop'
+
+    monkeypatch.setattr(_base, '_get_limiter', lambda name: _CancellingLimiter())
+    trans = _FakeTrans(text_list=_srt('One'), target_code='zh')
+    assert trans._send(['One']) is None
+    assert trans._text_task(['One']) is None
+    assert trans.sent == []
+
+
+def test_subtitles_emitted_in_source_order_with_cache_hits():
+    _FakeTrans(text_list=_srt('B', 'D'), target_code='zh').run()
+
+    trans = _FakeTrans(text_list=_srt('A', 'B', 'C', 'D', 'E'), target_code='zh')
+    result = trans.run()
+    assert [it['text'] for it in result] == ['T:A', 'T:B', 'T:C', 'T:D', 'T:E']
+    # B、D 命中翻译记忆，只发送未命中的行，界面仍按原文顺序显示
+    assert trans.sent == [['A', 'C'], ['E']]
+    assert trans.subtitles == ['T:A', 'T:B', 'T:C', 'T:D', 'T:E']
@@ -0,0 +1,112 @@
+"""
+tts/_cache.py 配音缓存：命中与未命中、容量淘汰、缓存键包含渠道/角色/模型，以及索引损坏或被锁定时的表现
+"""
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from videotrans.configure import config
+from videotrans.tts import _cache
+
+
+@pytest.fixture(autouse=True)
+def temp_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_DIR', tmp_path.as_posix())
+    _cache._db.close()
+    monkeypatch.setattr(_cache._db, 'timeout', 0.1)
+    monkeypatch.setattr(_cache, '_stats', {"hits": 0, "misses": 0})
+    monkeypatch.setitem(config.settings, 'tts_cache_max_mb', 2048)
+    yield tmp_path / 'dubbing_cache' / 'store.db'
+    _cache._db.close()
+
+
+def _audio(path, data=b'RIFF' + b'\0' * 100):
+    path.write_bytes(data)
+    return path.as_posix()
+
+
+def test_hit_and_miss(tmp_path):
+    _cache.put('key1', _audio(tmp_path / 'a.wav', b'audio-1'))
+
+    out = tmp_path / 'out.wav'
+    assert _cache.get('key1', out.as_posix())
+    assert out.read_bytes() == b'audio-1'
+    assert not _cache.get('key2', (tmp_path / 'miss.wav').as_posix())
+    assert not (tmp_path / 'miss.wav').exists()
+    assert _cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_missing_audio_file_is_miss(tmp_path):
+    _cache.put('key1', _audio(tmp_path / 'a.wav'))
+    (tmp_path / 'dubbing_cache' / 'store' / 'key1.wav').unlink()
+    assert not _cache.get('key1', (tmp_path / 'out.wav').as_posix())
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(_cache, 'max_bytes', lambda: 250)
+    _cache.put('old', _audio(tmp_path / 'a.wav'))
+    _cache.put('used', _audio(tmp_path / 'b.wav'))
+    assert _cache.get('old', (tmp_path / 'o.wav').as_posix())
+    _cache.put('new', _audio(tmp_path / 'c.wav'))
+
+    assert _cache.get('old', (tmp_path / 'o.wav').as_posix())
+    assert _cache.get('new', (tmp_path / 'n.wav').as_posix())
+    assert not _cache.get('used', (tmp_path / 'u.wav').as_posix())
+    assert not (tmp_path / 'dubbing_cache' / 'store' / 'used.wav').exists()
+
+
+def test_corrupted_index_is_rebuilt(tmp_path, temp_store):
+    temp_store.parent.mkdir(parents=True)
+    temp_store.write_bytes(b'not a sqlite database' * 10)
+
+    assert not _cache.get('key1', (tmp_path / 'out.wav').as_posix())
+    _cache.put('key1', _audio(tmp_path / 'a.wav', b'audio-1'))
+    assert _cache.get('key1', (tmp_path / 'out.wav').as_posix())
+
+
+def test_locked_index_degrades_to_miss(tmp_path, temp_store):
+    _cache.put('key1', _audio(tmp_path / 'a.wav'))
+    other = sqlite3.connect(temp_store.as_posix())
+    other.execute('BEGIN EXCLUSIVE')
+    try:
+        assert not _cache.get('key1', (tmp_path / 'out.wav').as_posix())
+        # 写入失败交给调用方记录日志
+        with pytest.raises(sqlite3.OperationalError):
+            _cache.put('key2', _audio(tmp_path / 'b.wav'))
+    finally:
+        other.rollback()
+        other.close()
+    assert _cache.get('key1', (tmp_path / 'out.wav').as_posix())
+    assert not _cache.get('key2', (tmp_path / 'out2.wav').as_posix())
+
+
+@pytest.fixture
+def cache_key():
+    _base = pytest.importorskip('videotrans.tts._base')
+
+    def _key(it, name='EdgeTTS', extra='', rate='+0%', volume='+0%', pitch='+0Hz'):
+        # 渠道名取自类名，用同名的简单类代替真实渠道
+        obj = type(name, (SimpleNamespace,), {})(rate=rate, volume=volume, pitch=pitch,
+                                                   _cache_extra=lambda: extra)
+        return _base.BaseTTS._cache_key(obj, it)
+
+    return _key
+
+
+def test_key_normalizes_text(cache_key):
+    assert cache_key({"text": "Hello   world ", "role": "a"}) == cache_key({"text": " Hello world", "role": "a"})
+
+
+def test_key_includes_scope(cache_key):
+    base = cache_key({"text": "Hello", "role": "voice-a"})
+    assert base != cache_key({"text": "Hello", "role": "voice-b"})
+    assert base != cache_key({"text": "Hello", "role": "voice-a"}, name='AzureTTS')
+    assert base != cache_key({"text": "Hello", "role": "voice-a"}, extra='model-2')
+    assert base != cache_key({"text": "Hello", "role": "voice-a"}, rate='+10%')
+
+
+def test_no_key_for_cloned_voice_or_disabled_cache(cache_key, monkeypatch):
+    assert cache_key({"text": "Hello", "role": "clone", "ref_wav": "ref.wav"}) is None
+    monkeypatch.setitem(config.settings, 'tts_cache_max_mb', 0)
+    assert cache_key({"text": "Hello", "role": "voice-a"}) is None
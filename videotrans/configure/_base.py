@@ -11,6 +11,11 @@ class BaseCon:
     uuid: Optional[str] = field(default=None, init=False)
     shound_del: bool = field(default=False, init=False)
 
+    def _token(self):
+        """所属任务的取消标记，没有所属任务(如测试)时为 None"""
+        from ._task_state import get
+        return get(self.uuid)
+
     def _signal(self, **kwargs):
         if 'uuid' not in kwargs:
             kwargs['uuid'] = self.uuid
@@ -102,4 +107,4 @@ class BaseCon:
         cmd += [
             output_wav_file_path
         ]
-        return tools.runffmpeg(cmd, force_cpu=True)
+        return tools.runffmpeg(cmd, uuid=self.uuid, force_cpu=True)
@@ -7,6 +7,7 @@ import os
 import re
 import sys
 import tempfile
+import threading
 from pathlib import Path
 from queue import Queue
 
@@ -35,6 +36,10 @@ _temp_path = _root_path / _tmpname
 _temp_path.mkdir(parents=True, exist_ok=True)
 TEMP_DIR = _temp_path.as_posix()
 Path(TEMP_DIR + '/dubbing_cache').mkdir(exist_ok=True)
+# 跨任务、跨会话复用的缓存目录 cache，退出软件时不删除，仅在"清理缓存"时清空
+_cache_path = _root_path / "cache"
+_cache_path.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = _cache_path.as_posix()
 # 日志目录 logs
 _logs_path = _root_path / "logs"
 _logs_path.mkdir(parents=True, exist_ok=True)
@@ -88,17 +93,20 @@ if defaulelang == 'zh' and not Path(ROOT_DIR+"/huggingface.lock").exists():
 # 存储所有任务的进度队列，以uuid为键
 # 根据uuid将日志进度等信息存入队列，如果不存在则创建
 uuid_logs_queue = {}
+# 任一任务有新消息时置位，界面线程据此唤醒并一次取出所有任务的消息，无需逐个队列等待
+uuid_logs_event = threading.Event()
 
 
 def push_queue(uuid, jsondata):
     if uuid in stoped_uuid_set:
         return
-    if uuid not in uuid_logs_queue:
-        uuid_logs_queue[uuid] = Queue()
     try:
+        q = uuid_logs_queue.setdefault(uuid, Queue())
         # 暂停时会重设为字符串 stop
-        if isinstance(uuid_logs_queue[uuid], Queue):
-            uuid_logs_queue[uuid].put_nowait(jsondata)
+        if isinstance(q, Queue):
+            # 队列无上限，put_nowait 不会阻塞工作线程
+            q.put_nowait(jsondata)
+            uuid_logs_event.set()
     except Exception:
         pass
 
@@ -127,18 +135,31 @@ box_recogn = 'stop'
 # 倒计时数秒
 task_countdown = 0
 #####################################
+class StageQueue(Queue):
+    """
+    流水线各阶段使用的阻塞队列
+    保留 append/len 的 list 用法，消费者通过 get(timeout=) 阻塞等待，任务入队即被唤醒，无需轮询
+    """
+
+    def append(self, item):
+        self.put_nowait(item)
+
+    def __len__(self):
+        return self.qsize()
+
+
 # 预先处理队列
-prepare_queue = []
+prepare_queue = StageQueue()
 # 识别队列
-regcon_queue = []
+regcon_queue = StageQueue()
 # 翻译队列
-trans_queue = []
+trans_queue = StageQueue()
 # 配音队列
-dubb_queue = []
+dubb_queue = StageQueue()
 # 音视频画面对齐
-align_queue = []
+align_queue = StageQueue()
 # 合成队列
-assemb_queue = []
+assemb_queue = StageQueue()
 # 执行模式 gui 或 api
 exec_mode = "gui"
 # funasr模型
@@ -211,6 +232,28 @@ def parse_init(update_data=None):
         "zijiehuoshan_model": "",
         "model_list": "tiny,tiny.en,base,base.en,small,small.en,medium,medium.en,large-v1,large-v2,large-v3,large-v3-turbo,distil-whisper-small.en,distil-whisper-medium.en,distil-whisper-large-v2,distil-whisper-large-v3",
         "remove_silence": False,
+        # 配音加速引擎 wsola=内存变速 pyrubberband=需安装pyrubberband ffmpeg=ffmpeg滤镜
+        "audio_speed_engine": "wsola",
+        # 视频慢速时并发裁切片段数，0=根据CPU核数自动决定
+        "video_clip_workers": 0,
+        # 视频慢速时片段数不超过该值则用单个滤镜图一次编码完成，0=始终逐片段裁切
+        "video_filtergraph_max_segments": 300,
+        # ffprobe 探测结果同时保存到 cache/ffprobe_cache.db，重启后仍可复用
+        "ffprobe_disk_cache": False,
+        # 配音内容缓存上限(MB)，相同渠道、角色、文本和参数的台词只合成一次，0=不缓存
+        "tts_cache_max_mb": 2048,
+        # 配音渠道共用连接池大小和同一主机的最大并发请求数，可写为 "10,GPTSoVITS:2" 单独设置某渠道，0=不限制并发
+        "tts_max_connections": "10",
+        "tts_host_concurrency": "0",
+        # 人声分离时每批送入模型的窗口数，显存或内存不足时调小
+        "separate_batch_size": 4,
+        # 云端语音识别(Gemini/Qwen3-ASR/OpenAI兼容接口)同时发送的片段请求数和每秒请求数上限，可写为 "4,GeminiRecogn:2" 单独设置某渠道，每秒请求数0=不限制
+        "recogn_concurrency": "1",
+        "recogn_rps": "0",
+        # 单个识别片段请求失败后的重试次数，只重发失败的片段
+        "recogn_chunk_retry": 2,
+        # 云端语音识别上传片段的编码格式 wav/flac/mp3/opus，均为16k单声道，flac无损，mp3和opus体积约为wav的1/8，渠道不支持时按wav上传
+        "recogn_upload_format": "flac",
         "vad": True,
         "threshold": 0.45,
         "min_speech_duration_ms": 1000,
@@ -226,14 +269,31 @@ def parse_init(update_data=None):
         "aitrans_thread": 50,
         "retries": 2,
         "translation_wait": 0,
+        # 同时发出的翻译请求数，及每个翻译渠道每秒请求数、每分钟token数上限，0=不限制
+        "trans_concurrency": 1,
+        "trans_rps": 0,
+        "trans_tpm": 0,
+        # 翻译记忆最多保存的行数，超出后淘汰最久未使用的，0=不使用翻译缓存
+        "trans_cache_max_rows": 200000,
         "dubbing_wait": 1,
         "dubbing_thread": 5,
+        # 流水线各阶段同时处理的任务数，识别默认1个以免争抢GPU
+        "prepare_workers": 1,
+        "recogn_workers": 1,
+        "trans_workers": 1,
+        "dubbing_workers": 1,
+        "align_workers": 1,
+        "assemb_workers": 1,
         "save_segment_audio": False,
         "countdown_sec": 120,
         "backaudio_volume": 0.8,
         "separate_sec": 600,
         "loop_backaudio": True,
         "cuda_com_type": "default",  # int8 int8_float16 int8_float32
+        # faster-whisper 模型常驻进程空闲多少秒后退出，0=每个任务单独启动进程加载模型
+        "whisper_server_idle": 300,
+        # 均等分割识别时 faster-whisper 批量推理的批大小，0=逐段识别
+        "whisper_batch_size": 0,
         "initial_prompt_zh-cn": "在每行末尾添加标点符号，在每个句子末尾添加标点符号。",
         "initial_prompt_zh-tw": "在每行末尾添加標點符號，在每個句子末尾添加標點符號。",
         "initial_prompt_en": "Add punctuation at the end of each line, and punctuation at the end of each sentence.",
@@ -0,0 +1,113 @@
+"""
+单个任务的取消标记和状态
+
+每个任务(BaseTask)创建时按 uuid 注册一个 TaskToken，识别、翻译、配音、音画对齐和 ffmpeg 都通过 uuid 取得同一个 token，
+取消只影响该任务，并会立即结束该任务正在运行的 ffmpeg 子进程。
+scope 是界面中对应功能的全局停止开关名(current_status/box_tts/box_trans/box_recogn)，用于兼容界面的“停止”按钮，
+api 模式下为 None，仅由 token 自身、config.stoped_uuid_set 和 config.exit_soft 决定。
+"""
+import threading
+import weakref
+from typing import Optional
+
+
+class TaskCancelled(Exception):
+    """任务已取消，正在执行的操作被中止"""
+    pass
+
+
+class TaskToken:
+
+    def __init__(self, uuid: str, scope: Optional[str] = None):
+        self.uuid = uuid
+        self.scope = scope
+        # ing 执行中 stop 已取消 end 已完成 error 出错
+        self.status = 'ing'
+        self._event = threading.Event()
+        self._procs = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        from . import config
+        if config.exit_soft or self.uuid in config.stoped_uuid_set or (
+                self.scope and getattr(config, self.scope, 'ing') != 'ing'):
+            self.cancel()
+            return True
+        return False
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.status = 'stop'
+            self._event.set()
+            procs = list(self._procs)
+        from . import config
+        # 丢弃该任务后续的进度消息，流水线各阶段不再继续
+        config.stoped_uuid_set.add(self.uuid)
+        for proc in procs:
+            _kill(proc)
+
+    def wait(self, seconds: float) -> bool:
+        """等待最多 seconds 秒，期间被取消时立即返回 True"""
+        return self._event.wait(seconds) or self.cancelled
+
+    def add_process(self, proc):
+        """登记子进程，取消时结束它；已取消时立即结束"""
+        with self._lock:
+            if not self._event.is_set():
+                self._procs.add(proc)
+                return
+        _kill(proc)
+
+    def check(self):
+        """已取消时抛出 TaskCancelled"""
+        if self.cancelled:
+            raise TaskCancelled(self.uuid)
+
+    def remove_process(self, proc):
+        with self._lock:
+            self._procs.discard(proc)
+
+
+def _kill(proc):
+    try:
+        if proc.poll() is None:
+            proc.kill()
+    except Exception:
+        pass
+
+
+# 任务对象持有 token，任务释放后自动移除
+_tokens = weakref.WeakValueDictionary()
+_tokens_lock = threading.Lock()
+
+
+def register(uuid: str, scope: Optional[str] = None) -> TaskToken:
+    with _tokens_lock:
+        token = _tokens.get(uuid)
+        if token is None or token.cancelled:
+            token = TaskToken(uuid, scope)
+            _tokens[uuid] = token
+        else:
+            token.scope = scope
+        return token
+
+
+def get(uuid: Optional[str]) -> Optional[TaskToken]:
+    if not uuid:
+        return None
+    with _tokens_lock:
+        return _tokens.get(uuid)
+
+
+def cancel(uuid: str) -> bool:
+    """取消指定任务，返回是否存在该任务"""
+    token = get(uuid)
+    if token is None:
+        return False
+    token.cancel()
+    return True
@@ -295,6 +295,8 @@ class WinActionSub:
         if question == QtWidgets.QMessageBox.Yes:
             shutil.rmtree(config.TEMP_DIR, ignore_errors=True)
             shutil.rmtree(config.TEMP_HOME, ignore_errors=True)
+            # 配音缓存、翻译记忆等跨会话缓存只在此处清空，退出软件时保留
+            shutil.rmtree(config.CACHE_DIR, ignore_errors=True)
             self.remove_qsettings_data()
             QtWidgets.QMessageBox.information(self.main,
                                               'Please restart the software' if config.defaulelang != 'zh' else '请重启软件',
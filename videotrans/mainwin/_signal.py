@@ -1,4 +1,3 @@
-import json
 import queue
 import shutil
 import time
@@ -9,57 +8,90 @@ from videotrans.configure import config
 
 
 class UUIDSignalThread(QThread):
-    uito = Signal(str)
+    """
+    主界面所有任务共用的消息通道
+    任一任务 push_queue 后被唤醒，一次取出全部任务的消息，消息字典直接发送给界面，不经 json 序列化
+    进度类消息按任务合并，每个任务最多每 PROGRESS_INTERVAL 秒刷新一次，只保留最新的一条
+    """
+    uito = Signal(object)
+    # 同一任务进度消息的最短刷新间隔，即最多 10 次/秒
+    PROGRESS_INTERVAL = 0.1
+    # 只更新进度按钮文字的消息，可合并
+    PROGRESS_TYPES = ('set_precent', 'logs')
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.parent = parent
+        # uuid -> {type: 最新消息}，等待下次刷新
+        self._pending = {}
+        # uuid -> 上次发送进度消息的时间
+        self._last_emit = {}
 
     def _remove_queue(self):
-        for uuid in config.stoped_uuid_set:
+        for uuid in list(config.stoped_uuid_set):
+            config.uuid_logs_queue.pop(uuid, None)
+            self._pending.pop(uuid, None)
+            self._last_emit.pop(uuid, None)
+
+    def _flush(self, uuid, now, force=False):
+        pending = self._pending.get(uuid)
+        if not pending:
+            return
+        if not force and now - self._last_emit.get(uuid, 0) < self.PROGRESS_INTERVAL:
+            return
+        del self._pending[uuid]
+        self._last_emit[uuid] = now
+        for data in pending.values():
+            self.uito.emit(data)
+
+    def _drain(self, uuid, now):
+        q = config.uuid_logs_queue.get(uuid)
+        if not isinstance(q, queue.Queue):
+            return
+        while True:
             try:
-                del config.uuid_logs_queue[uuid]
-            except:
-                pass
+                data = q.get_nowait()
+            except queue.Empty:
+                break
+            if not data:
+                continue
+            if data.get('type') in self.PROGRESS_TYPES:
+                pending = self._pending.setdefault(uuid, {})
+                # 先删除再写入，保持各类型按最后到达的顺序发送
+                pending.pop(data['type'], None)
+                pending[data['type']] = data
+                continue
+            # 其他消息(字幕、成功、出错等)不合并，发送前先送出之前的进度，保证顺序
+            self._flush(uuid, now, force=True)
+            self.uito.emit(data)
 
     def run(self):
         if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
-            self.uito.emit(json.dumps(
-                {"type": "ffmpeg", "text": '请安装ffmpeg' if config.defaulelang == 'zh' else 'Please install ffmpeg'}))
+            self.uito.emit(
+                {"type": "ffmpeg", "text": '请安装ffmpeg' if config.defaulelang == 'zh' else 'Please install ffmpeg'})
         while 1:
             if config.exit_soft:
                 return
+            # 有未到刷新时间的进度时，最多等到下一次刷新
+            config.uuid_logs_event.wait(self.PROGRESS_INTERVAL if self._pending else 0.5)
+            config.uuid_logs_event.clear()
+            while len(config.global_msg) > 0:
+                self.uito.emit(config.global_msg.pop(0))
             if len(self.parent.win_action.obj_list) < 1:
-                if len(config.global_msg) > 0:
-                    self.uito.emit(json.dumps(config.global_msg.pop(0)))
                 self._remove_queue()
-                time.sleep(1)
                 continue
             # 找出未停止的
             uuid_list = [obj['uuid'] for obj in self.parent.win_action.obj_list if
                          obj['uuid'] not in config.stoped_uuid_set]
+            self._remove_queue()
             # 全部结束
             if len(uuid_list) < 1:
-                self.uito.emit(json.dumps({"type": "end"}))
+                self.uito.emit({"type": "end"})
                 time.sleep(0.1)
-                self._remove_queue()
                 continue
-            while len(uuid_list) > 0:
-                uuid = uuid_list.pop(0)
+            now = time.time()
+            for uuid in uuid_list:
                 if config.exit_soft:
                     return
-                if uuid in config.stoped_uuid_set:
-                    try:
-                        del config.uuid_logs_queue[uuid]
-                    except:
-                        pass
-                    continue
-                try:
-                    q: queue.Queue = config.uuid_logs_queue.get(uuid)
-                    if not q:
-                        continue
-                    data = q.get(block=True, timeout=0.1)
-                    if data:
-                        self.uito.emit(json.dumps(data))
-                except Exception:
-                    pass
+                self._drain(uuid, now)
+                self._flush(uuid, now)
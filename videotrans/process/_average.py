@@ -1,4 +1,3 @@
-import json
 import os
 import re
 import tempfile
@@ -6,15 +5,16 @@ import time
 from pathlib import Path
 
 import zhconv
-from faster_whisper import WhisperModel
-from huggingface_hub.errors import LocalEntryNotFoundError
 from pydub import AudioSegment
 
-from videotrans.util.tools import ms_to_time_string, vail_file, cleartext
+from videotrans.util.tools import ms_to_time_string, cleartext
 
 
 def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file, q, settings,
-        TEMP_DIR, ROOT_DIR, defaulelang, proxy=None):
+        TEMP_DIR, ROOT_DIR, defaulelang, model, proxy=None):
+    """
+    model 为常驻识别进程已加载的模型
+    """
     os.chdir(ROOT_DIR)
 
     def write_log(jsondata):
@@ -23,56 +23,58 @@ def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file,
         except:
             pass
 
-    tmp_path = Path(tempfile.gettempdir() + f'/recogn_{time.time()}')
-    tmp_path.mkdir(parents=True, exist_ok=True)
-    tmp_path = tmp_path.as_posix()
+    # 高级设置 whisper_batch_size > 0 时整段解码为数组后批量识别，不再逐段导出wav
+    # BatchedInferencePipeline 每段最长30s，超出时仍逐段识别
+    batch_size = int(float(settings.get('whisper_batch_size', 0)))
+    batched = batch_size > 0 and int(float(settings.get('interval_split', 1))) <= 30
 
-    nonslient_file = f'{tmp_path}/detected_voice.json'
-    normalized_sound = AudioSegment.from_wav(audio_file)
-    if vail_file(nonslient_file):
-        nonsilent_data = json.load(open(nonslient_file, 'r'))
+    if batched:
+        from faster_whisper import decode_audio
+        audio_data = decode_audio(audio_file, sampling_rate=16000)
+        total_ms = int(len(audio_data) * 1000 / 16000)
     else:
-        nonsilent_data = _shorten_voice_old(normalized_sound, settings)
-        with open(nonslient_file, 'w') as f:
-            f.write(json.dumps(nonsilent_data))
+        tmp_path = Path(tempfile.gettempdir() + f'/recogn_{time.time()}')
+        tmp_path.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_path.as_posix()
+        normalized_sound = AudioSegment.from_wav(audio_file)
+        total_ms = len(normalized_sound)
 
+    nonsilent_data = _shorten_voice_old(total_ms, settings)
     total_length = len(nonsilent_data)
 
-    if model_name.startswith('distil-'):
-        com_type = "default"
-    elif is_cuda:
-        com_type = settings['cuda_com_type']
-    else:
-        com_type = settings['cuda_com_type']
-
-    down_root = ROOT_DIR + "/models"
-    msg = f'[{model_name}]若不存在将从 hf-mirror.com 下载到 models 目录内' if defaulelang == 'zh' else f'If [{model_name}] not exists, download model from huggingface'
-    write_log({"text": msg, "type": "logs"})
-
-    try:
-        model = WhisperModel(
-            model_name,
-            device="cuda" if is_cuda else "cpu",
-            compute_type=com_type,
-            download_root=down_root)
-    except LocalEntryNotFoundError:
-        err['msg'] = '下载模型失败了请确认网络稳定后重试，如果已使用代理，请尝试关闭。 访问网址  https://pvt9.com/820  可查看详细详细解决方案' if defaulelang == 'zh' else 'Download model failed, please confirm network stable and try again. Visit https://pvt9.com/820 for more detail.'
-        return
-    except Exception as e:
-        error = str(e)
-        if "Unable to open file 'model.bin'" in error:
-            err['msg'] = '可能网络原因模型下载中断，请尝试删掉models文件夹内相应模型文件夹，然后重试' if defaulelang == 'zh' else 'Maybe model download failed, please delete the corresponding model folder in the models directory and try again'
-        elif "CUBLAS_STATUS_NOT_SUPPORTED" in error:
-            err['msg'] = "数据类型不兼容：请打开菜单--工具--高级选项--faster/openai语音识别调整--CUDA数据类型--选择 float16，保存后重试" if defaulelang == 'zh' else 'Incompatible data type: Please open the menu - Tools - Advanced options - Faster/OpenAI speech recognition adjustment - CUDA data type - select float16, save and try again'
-        elif "cudaErrorNoKernelImageForDevice" in error:
-            err['msg'] = "pytorch和cuda版本不兼容，请更新显卡驱动后，安装或重装CUDA12.x及cuDNN9.x" if defaulelang == 'zh' else 'Pytorch and cuda versions are incompatible. Please update the graphics card driver and install or reinstall CUDA12.x and cuDNN9.x'
-        else:
-            err['msg'] = str(e)
-        return
-
     write_log({"text": model_name + " Loaded", "type": "logs"})
     prompt = settings.get(f'initial_prompt_{detect_language}') if detect_language != 'auto' else None
+
+    def append_line(text, start_time, end_time):
+        text = re.sub(r'&#\d+;', '', text.replace('&#39;', "'")).strip()
+
+        if not text or re.match(r'^[，。、？‘’“”；：（｛｝【】）:;"\'\s \d`!@#$%^&*()_+=.,?/\\-]*$', text):
+            return
+
+        if detect['langcode'][:2] == 'zh' and settings['zh_hant_s']:
+            text = zhconv.convert(text, 'zh-hans')
+
+        start = ms_to_time_string(ms=start_time)
+        end = ms_to_time_string(ms=end_time)
+        text = cleartext(text)
+        srt_line = {
+            "line": len(raws) + 1,
+            "time": f"{start} --> {end}",
+            "text": text,
+            "start_time": start_time,
+            "end_time": end_time,
+            "startraw": start,
+            "endraw": end
+        }
+        raws.append(srt_line)
+        write_log({"text": f"{srt_line['line']}\n{srt_line['time']}\n{srt_line['text']}\n\n", "type": "subtitle"})
+        write_log({"text": f" {srt_line['line']}/{total_length}", "type": "logs"})
+
     try:
+        if batched:
+            _run_batched(model, audio_data, nonsilent_data, append_line, detect, prompt=prompt,
+                         batch_size=batch_size, detect_language=detect_language, settings=settings, TEMP_DIR=TEMP_DIR)
+            return
         last_detect = detect_language
         for i, duration in enumerate(nonsilent_data):
             if not Path(TEMP_DIR + f'/{os.getpid()}.lock').exists():
@@ -98,30 +100,7 @@ def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file,
                 last_detect = detect['langcode']
             for t in segments:
                 text += t.text + " "
-
-            text = re.sub(r'&#\d+;', '', text.replace('&#39;', "'")).strip()
-
-            if not text or re.match(r'^[，。、？‘’“”；：（｛｝【】）:;"\'\s \d`!@#$%^&*()_+=.,?/\\-]*$', text):
-                continue
-
-            if detect['langcode'][:2] == 'zh' and settings['zh_hant_s']:
-                text = zhconv.convert(text, 'zh-hans')
-
-            start = ms_to_time_string(ms=start_time)
-            end = ms_to_time_string(ms=end_time)
-            text = cleartext(text)
-            srt_line = {
-                "line": len(raws) + 1,
-                "time": f"{start} --> {end}",
-                "text": text,
-                "start_time": start_time,
-                "end_time": end_time,
-                "startraw": start,
-                "endraw": end
-            }
-            raws.append(srt_line)
-            write_log({"text": f"{srt_line['line']}\n{srt_line['time']}\n{srt_line['text']}\n\n", "type": "subtitle"})
-            write_log({"text": f" {srt_line['line']}/{total_length}", "type": "logs"})
+            append_line(text, start_time, end_time)
     except (LookupError, ValueError, AttributeError, ArithmeticError) as e:
         err['msg'] = f'{e}'
         if detect_language == 'auto':
@@ -137,18 +116,56 @@ def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file,
             pass
 
 
+def _run_batched(model, audio_data, nonsilent_data, append_line, detect, *, prompt, batch_size, detect_language,
+                 settings, TEMP_DIR):
+    """
+    将各等分片段作为 clip_timestamps 交给 BatchedInferencePipeline 批量识别。
+    返回的 segment 时间为整段音频中的绝对时间，按开始时间归属到所在片段，片段识别完后再生成字幕行
+    """
+    from bisect import bisect_right
+    from faster_whisper import BatchedInferencePipeline
+
+    pipeline = BatchedInferencePipeline(model=model)
+    segments, info = pipeline.transcribe(
+        audio_data,
+        beam_size=int(settings['beam_size']),
+        best_of=int(settings['best_of']),
+        vad_filter=False,
+        clip_timestamps=[{"start": start / 1000, "end": end / 1000} for start, end, _ in nonsilent_data],
+        batch_size=batch_size,
+        language=detect_language.split('-')[0] if detect_language != 'auto' else None,
+        initial_prompt=prompt if prompt else None
+    )
+    if detect_language == 'auto':
+        detect['langcode'] = 'zh-cn' if info.language[:2] == 'zh' else info.language
+
+    starts = [start / 1000 for start, _, _ in nonsilent_data]
+    current, text = -1, ""
+    for segment in segments:
+        if not Path(TEMP_DIR + f'/{os.getpid()}.lock').exists():
+            return
+        index = max(0, bisect_right(starts, segment.start + 0.01) - 1)
+        if index != current:
+            if current >= 0:
+                append_line(text, nonsilent_data[current][0], nonsilent_data[current][1])
+            current, text = index, ""
+        text += segment.text + " "
+    if current >= 0:
+        append_line(text, nonsilent_data[current][0], nonsilent_data[current][1])
+
+
 # split audio by silence
-def _shorten_voice_old(normalized_sound, settings):
+def _shorten_voice_old(total_ms, settings):
     max_interval = int(float(settings.get('interval_split', 1))) * 1000
     nonsilent_data = []
     import math
-    maxlen = math.ceil(len(normalized_sound) / max_interval)
+    maxlen = math.ceil(total_ms / max_interval)
     for i in range(maxlen):
         if i < maxlen - 1:
             end_time = i * max_interval + max_interval
             start_time = i * max_interval
         else:
-            end_time = len(normalized_sound)
+            end_time = total_ms
             start_time = i * max_interval
         nonsilent_data.append((start_time, end_time, False))
     return nonsilent_data
@@ -1,19 +1,17 @@
 import multiprocessing
 import os
 import re
-import time
 from pathlib import Path
 
-from faster_whisper import WhisperModel
-from huggingface_hub.errors import LocalEntryNotFoundError
-
 from videotrans.util.tools import cleartext
 
 
 def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file,
-        q: multiprocessing.Queue, ROOT_DIR, TEMP_DIR, settings, defaulelang, proxy=None):
+        q: multiprocessing.Queue, ROOT_DIR, TEMP_DIR, settings, defaulelang, model, proxy=None):
+    """
+    model 为常驻识别进程已加载的模型
+    """
     os.chdir(ROOT_DIR)
-    down_root = ROOT_DIR + "/models"
     settings['whisper_threads'] = int(float(settings.get('whisper_threads', 1)))
 
     def write_log(jsondata):
@@ -23,38 +21,6 @@ def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file,
             pass
 
     try:
-
-        msg = f'[{model_name}]若不存在将从 hf-mirror.com 下载到 models 目录内' if defaulelang == 'zh' else f'If [{model_name}] not exists, download model from huggingface'
-        write_log({"text": msg, "type": "logs"})
-        if model_name.startswith('distil-'):
-            com_type = "default"
-        elif is_cuda:
-            com_type = settings['cuda_com_type']
-        else:
-            com_type = settings['cuda_com_type']
-        try:
-            model = WhisperModel(
-                model_name,
-                device="cuda" if is_cuda else "cpu",
-                compute_type=com_type,
-                download_root=down_root
-            )
-        except LocalEntryNotFoundError:
-            err['msg'] = '下载模型失败了请确认网络稳定后重试，如果已使用代理，请尝试关闭。 访问网址  https://pvt9.com/820  可查看详细详细解决方案' if defaulelang == 'zh' else 'Download model failed, please confirm network stable and try again. Visit https://pvt9.com/820 for more detail.'
-            return
-        except Exception as e:
-            print(f'@@@@@@@@@@@@@{e}')
-            error = str(e)
-            if "Unable to open file 'model.bin'" in error:
-                err['msg'] = '可能网络原因模型下载中断，请尝试删掉models文件夹内相应模型文件夹，然后重试' if defaulelang == 'zh' else 'Maybe model download failed, please delete the corresponding model folder in the models directory and try again'
-            elif "CUBLAS_STATUS_NOT_SUPPORTED" in error:
-                err['msg'] = "数据类型不兼容：请打开菜单--工具--高级选项--faster/openai语音识别调整--CUDA数据类型--选择 float16，保存后重试" if defaulelang == 'zh' else 'Incompatible data type: Please open the menu - Tools - Advanced options - Faster/OpenAI speech recognition adjustment - CUDA data type - select float16, save and try again'
-            elif "cudaErrorNoKernelImageForDevice" in error:
-                err['msg'] = "pytorch和cuda版本不兼容，请更新显卡驱动后，安装或重装CUDA12.x及cuDNN9.x" if defaulelang == 'zh' else 'Pytorch and cuda versions are incompatible. Please update the graphics card driver and install or reinstall CUDA12.x and cuDNN9.x'
-            else:
-                err['msg'] = str(e)
-            return
-
         write_log({"text": model_name + " Loaded", "type": "logs"})
         prompt = settings.get(f'initial_prompt_{detect_language}') if detect_language != 'auto' else None
         segments, info = model.transcribe(
@@ -103,4 +69,3 @@ def run(raws, err, detect, *, model_name, is_cuda, detect_language, audio_file,
                 torch.cuda.empty_cache()
         except:
             pass
-        time.sleep(2)
@@ -0,0 +1,209 @@
+"""
+faster-whisper 识别进程
+
+同一 (模型名, 设备, 计算类型) 的模型只在子进程中加载一次，之后的识别任务通过队列发送音频路径，
+识别过程中的日志和字幕通过结果队列实时传回，父进程阻塞读取；识别结果在任务结束时作为一帧整体传回，
+不再经过 Manager 代理逐条往返。空闲超过 whisper_server_idle 秒后由父进程通知其退出以释放显存，
+whisper_server_idle=0 时每个任务启动一次性进程，执行完即退出。
+取消语义与独立进程一致：每个任务开始前写入 TEMP_DIR/{pid}.lock，删除该文件即停止当前任务。
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from videotrans.configure import config
+
+
+def serve(jobs, results, *, model_name, is_cuda, settings, ROOT_DIR, defaulelang):
+    """子进程入口，加载模型后循环处理任务，收到 None 时退出"""
+    from videotrans.process import _average, _overall
+    from videotrans.process._whisper import load_model
+
+    os.chdir(ROOT_DIR)
+    msg = f'[{model_name}]若不存在将从 hf-mirror.com 下载到 models 目录内' if defaulelang == 'zh' else f'If [{model_name}] not exists, download model from huggingface'
+    results.put({"text": msg, "type": "logs"})
+    err = {"msg": ""}
+    model = load_model(err, model_name=model_name, is_cuda=is_cuda, settings=settings, ROOT_DIR=ROOT_DIR,
+                       defaulelang=defaulelang)
+    runners = {"overall": _overall.run, "avg": _average.run}
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        if model is None:
+            # 模型加载失败时返回错误后退出，下次任务由父进程重新启动并重试加载
+            results.put({"type": "done", "raws": [], "err": err['msg'], "langcode": job['detect_language']})
+            return
+        raws = []
+        job_err = {"msg": ""}
+        detect = {"langcode": job['detect_language']}
+        runners[job['kind']](raws, job_err, detect, model=model, model_name=model_name, is_cuda=is_cuda,
+                             detect_language=job['detect_language'], audio_file=job['audio_file'], q=results,
+                             settings=job['settings'], ROOT_DIR=ROOT_DIR, TEMP_DIR=job['TEMP_DIR'],
+                             defaulelang=defaulelang)
+        results.put({"type": "done", "raws": raws, "err": job_err['msg'], "langcode": detect['langcode']})
+
+
+class WhisperServer:
+    """父进程中对识别进程的封装，同一时间只执行一个任务"""
+
+    def __init__(self, key, *, model_name, is_cuda):
+        self.key = key
+        ctx = multiprocessing.get_context('spawn')
+        self.jobs = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(target=serve, args=(self.jobs, self.results), kwargs={
+            "model_name": model_name,
+            "is_cuda": is_cuda,
+            "settings": config.settings,
+            "ROOT_DIR": config.ROOT_DIR,
+            "defaulelang": config.defaulelang
+        }, daemon=True)
+        self.process.start()
+        self.busy = threading.Lock()
+        self.last_used = time.time()
+        # 已通过 get_server 取得、尚未 release_server 的调用方数量，仅在 _servers_lock 内读写
+        self.holders = 0
+        # 已从 _servers 中移除，最后一个持有者释放时关闭
+        self.retired = False
+        config.logger.info(f'识别进程已启动 pid:{self.process.pid} {key=}')
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def run(self, kind, *, audio_file, detect_language, on_message, is_cancelled):
+        """
+        执行一次识别任务，返回 (raws, 错误信息, 检测到的语言)
+        on_message 接收日志和字幕消息，is_cancelled 返回 True 时删除锁文件停止当前任务
+        """
+        with self.busy:
+            pidfile = config.TEMP_DIR + f'/{self.process.pid}.lock'
+            with open(pidfile, 'w', encoding='utf-8') as f:
+                f.write(f'{self.process.pid}')
+            self.jobs.put({
+                "kind": kind,
+                "audio_file": audio_file,
+                "detect_language": detect_language,
+                "settings": config.settings,
+                "TEMP_DIR": config.TEMP_DIR
+            })
+            try:
+                while True:
+                    if is_cancelled():
+                        Path(pidfile).unlink(missing_ok=True)
+                    try:
+                        data = self.results.get(timeout=0.2)
+                    except queue.Empty:
+                        if not self.process.is_alive():
+                            return [], '识别进程意外退出' if config.defaulelang == 'zh' else 'Recognition process exited unexpectedly', detect_language
+                        continue
+                    if data['type'] == 'done':
+                        return data['raws'], data['err'], data['langcode']
+                    on_message(data)
+            finally:
+                Path(pidfile).unlink(missing_ok=True)
+                self.last_used = time.time()
+
+    def stop(self):
+        try:
+            self.jobs.put(None)
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+        except Exception:
+            pass
+        config.logger.info(f'识别进程已退出 {self.key=}')
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+_reaper_started = False
+
+
+def recognize(kind, *, model_name, is_cuda, audio_file, detect_language, on_message, is_cancelled):
+    """
+    执行一次识别任务，返回 (raws, 错误信息, 检测到的语言)
+    kind 为 overall(整体识别) 或 avg(均等分割)
+    """
+    if int(float(config.settings.get('whisper_server_idle', 300))) > 0:
+        server = get_server(model_name, is_cuda)
+        try:
+            return server.run(kind, audio_file=audio_file, detect_language=detect_language, on_message=on_message,
+                              is_cancelled=is_cancelled)
+        finally:
+            release_server(server)
+    server = WhisperServer(_server_key(model_name, is_cuda), model_name=model_name, is_cuda=is_cuda)
+    try:
+        return server.run(kind, audio_file=audio_file, detect_language=detect_language, on_message=on_message,
+                          is_cancelled=is_cancelled)
+    finally:
+        server.stop()
+
+
+def _server_key(model_name, is_cuda):
+    from videotrans.process._whisper import get_compute_type
+    return model_name, "cuda" if is_cuda else "cpu", get_compute_type(model_name, config.settings)
+
+
+def get_server(model_name, is_cuda):
+    """
+    获取或启动对应 (模型名, 设备, 计算类型) 的常驻识别进程，调用方用完后须调用 release_server。
+    启动新模型时关闭其他无人持有的进程，避免多个大模型同时占用显存；
+    仍被持有的进程先移出 _servers，由最后一个持有者释放时关闭
+    """
+    global _reaper_started
+    key = _server_key(model_name, is_cuda)
+    with _servers_lock:
+        server = _servers.get(key)
+        if server is not None and not server.is_alive():
+            _servers.pop(key)
+            server.retired = True
+            if server.holders < 1:
+                server.stop()
+            server = None
+        if server is None:
+            for other_key, other in list(_servers.items()):
+                _servers.pop(other_key)
+                other.retired = True
+                if other.holders < 1:
+                    other.stop()
+            server = WhisperServer(key, model_name=model_name, is_cuda=is_cuda)
+            _servers[key] = server
+        server.holders += 1
+        # 刷新空闲时间，避免刚取出就被回收
+        server.last_used = time.time()
+        if not _reaper_started:
+            _reaper_started = True
+            threading.Thread(target=_reap_idle, daemon=True).start()
+        return server
+
+
+def release_server(server):
+    """释放 get_server 取得的进程，已被替换的进程在无人持有后关闭"""
+    with _servers_lock:
+        server.holders -= 1
+        server.last_used = time.time()
+        if not server.retired or server.holders > 0:
+            return
+    server.stop()
+
+
+def _reap_idle():
+    """空闲超时后关闭无人持有的常驻识别进程"""
+    while True:
+        time.sleep(5)
+        idle = int(float(config.settings.get('whisper_server_idle', 300)))
+        expired = []
+        with _servers_lock:
+            for key, server in list(_servers.items()):
+                if server.holders > 0:
+                    continue
+                if not server.is_alive() or time.time() - server.last_used > idle:
+                    _servers.pop(key)
+                    server.retired = True
+                    expired.append(server)
+        for server in expired:
+            server.stop()
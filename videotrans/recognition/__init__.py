@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import Union, List, Dict
 
 from videotrans import translator
-from videotrans.configure import config
+from videotrans.configure import config, _task_state
 
 # 判断各个语音识别模式是否支持所选语言
 # 支持返回True，不支持返回错误文字字符串
@@ -184,7 +184,10 @@ def run(*,
         target_code=None,
         subtitle_type=0
         ) -> Union[List[Dict], None]:
-    if config.exit_soft or (config.current_status != 'ing' and config.box_recogn != 'ing'):
+    token = _task_state.get(uuid)
+    if token is not None and token.cancelled:
+        return
+    if token is None and (config.exit_soft or (config.current_status != 'ing' and config.box_recogn != 'ing')):
         return
     if model_name and model_name.startswith('distil-'):
         model_name = model_name.replace('-whisper', '')
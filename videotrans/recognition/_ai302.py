@@ -30,7 +30,7 @@ class AI302Recogn(BaseRecogn):
         apikey = config.params.get('ai302_key')
         # 转为 mp3
         tmpfile = self.cache_folder + f'/ai302tmp-{time.time()}.mp3'
-        tools.runffmpeg(['-y', '-i', self.audio_file, '-ac', '1', '-ar', '16000', tmpfile])
+        tools.runffmpeg(['-y', '-i', self.audio_file, '-ac', '1', '-ar', '16000', tmpfile], uuid=self.uuid)
         self._signal(text=f"start speech to srt")
         langcode = self.detect_language[:2].lower()
         url = "https://api.302.ai/v1/audio/transcriptions"
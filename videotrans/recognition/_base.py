@@ -1,4 +1,9 @@
+import hashlib
+import io
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
@@ -7,10 +12,19 @@ from tenacity import RetryError
 
 from videotrans.configure import config
 from videotrans.configure._base import BaseCon
-from videotrans.configure._except import SpeechToTextError
+from videotrans.configure._except import SpeechToTextError, NO_RETRY_EXCEPT
 from videotrans.util import tools
 
 
+# 识别片段上传格式 -> (soundfile format, subtype, mime, 扩展名)，均为 16k 单声道
+UPLOAD_CODECS = {
+    "wav": ("WAV", "PCM_16", "audio/wav", "wav"),
+    "flac": ("FLAC", "PCM_16", "audio/flac", "flac"),
+    "mp3": ("MP3", "MPEG_LAYER_III", "audio/mpeg", "mp3"),
+    "opus": ("OGG", "OPUS", "audio/ogg", "ogg"),
+}
+
+
 @dataclass
 class BaseRecogn(BaseCon):
     detect_language: Optional[str] = None
@@ -34,9 +48,20 @@ class BaseRecogn(BaseCon):
     join_word_flag: str = field(init=False)
     jianfan: bool = field(init=False)
     maxlen: int = field(init=False)
+    # speech_segments() 解码得到的 16k 单声道音频
+    audio_data: Any = field(default=None, init=False, repr=False)
+    # 上传识别片段的编码格式，以及本任务已上传的片段数和字节数
+    upload_format: str = field(default='wav', init=False)
+    upload_chunks: int = field(default=0, init=False)
+    upload_bytes: int = field(default=0, init=False)
+    upload_lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
 
-
-
+    # VAD 切割语音片段时的采样率
+    VAD_SAMPLE_RATE = 16000
+    # 该渠道接口可接受的上传格式，不在其中时按 wav 上传
+    UPLOAD_FORMATS = ('wav',)
+    # 识别片段请求失败后重试前等待的秒数
+    CHUNK_RETRY_DELAY = 5
 
     def __post_init__(self):
         super().__init__()
@@ -58,6 +83,7 @@ class BaseRecogn(BaseCon):
 
         if not tools.vail_file(self.audio_file):
             raise RuntimeError(f'No {self.audio_file}')
+        self.upload_format = self._resolve_upload_format()
 
     # run->_exec
     def run(self) -> Union[List[Dict], None]:
@@ -74,6 +100,10 @@ class BaseRecogn(BaseCon):
             config.logger.exception(e, exc_info=True)
             raise
         finally:
+            if self.upload_chunks:
+                config.logger.info(
+                    f'[{self.uuid}] {self.__class__.__name__} 上传识别片段 {self.upload_chunks} 个，'
+                    f'格式 {self.upload_format}，共 {self.upload_bytes / 1024 / 1024:.2f}MB')
             if self.shound_del:
                 self._set_proxy(type='del')
 
@@ -210,8 +240,144 @@ class BaseRecogn(BaseCon):
                 new_raws.append(it)
         self.raws=new_raws
         
+    def _vad_options(self) -> dict:
+        return {
+            "threshold": float(config.settings['threshold']),
+            "min_speech_duration_ms": int(config.settings['min_speech_duration_ms']),
+            "max_speech_duration_s": float(config.settings['max_speech_duration_s']) if float(
+                config.settings['max_speech_duration_s']) > 0 else float('inf'),
+            "min_silence_duration_ms": int(config.settings['min_silence_duration_ms']),
+            "speech_pad_ms": int(config.settings['speech_pad_ms'])
+        }
+
+    def speech_segments(self) -> List[Dict]:
+        """
+        解码 audio_file 一次并执行一次 VAD，返回语音片段列表
+        每项含 start_time/end_time(毫秒)、start/end(采样点)、text、time，片段音频通过 chunk_audio/chunk_bytes/chunk_file 获取
+        片段时间按音频内容和 VAD 参数缓存在 tmp/vad_cache，重试或切换识别渠道时无需再次 VAD
+        """
+        from faster_whisper.audio import decode_audio
+        sr = self.VAD_SAMPLE_RATE
+        self.audio_data = decode_audio(self.audio_file, sampling_rate=sr)
+
+        vad_p = self._vad_options()
+        md5 = hashlib.md5()
+        with open(self.audio_file, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                md5.update(block)
+        md5.update(json.dumps(vad_p, sort_keys=True).encode('utf-8'))
+        cache_file = Path(f'{config.TEMP_DIR}/vad_cache/{md5.hexdigest()}.json')
+        try:
+            speech_chunks = json.loads(cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+            speech_chunks = [{"start": it["start"], "end": it["end"]} for it in
+                             get_speech_timestamps(self.audio_data, vad_options=VadOptions(**vad_p))]
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(speech_chunks), encoding='utf-8')
+
+        data = []
+        for it in speech_chunks:
+            start_ms = int(round(it["start"] / sr * 1000))
+            end_ms = int(round(it["end"] / sr * 1000))
+            data.append({
+                "start": it["start"],
+                "end": it["end"],
+                "start_time": start_ms,
+                "end_time": end_ms,
+                "text": "",
+                "time": tools.ms_to_time_string(ms=start_ms) + ' --> ' + tools.ms_to_time_string(ms=end_ms)
+            })
+        return data
+
+    def _resolve_upload_format(self) -> str:
+        """recogn_upload_format 不被该渠道接受，或 libsndfile 版本过旧无法编码 mp3/opus 时，按 wav 上传"""
+        import soundfile as sf
+        upload_format = str(config.settings.get('recogn_upload_format', 'flac')).strip().lower()
+        if upload_format not in self.UPLOAD_FORMATS or upload_format not in UPLOAD_CODECS:
+            return 'wav'
+        sf_format, subtype, _, _ = UPLOAD_CODECS[upload_format]
+        if subtype not in sf.available_subtypes(sf_format):
+            config.logger.warning(f'当前 libsndfile 不支持编码 {upload_format}，识别片段改为上传 wav')
+            return 'wav'
+        return upload_format
+
+    def chunk_audio(self, it):
+        """片段对应的 16k 单声道 float32 数组"""
+        return self.audio_data[it['start']:it['end']]
+
+    def chunk_bytes(self, it) -> bytes:
+        """片段按 upload_format 编码后的数据，用于上传，并计入本任务上传字节数"""
+        import soundfile as sf
+        sf_format, subtype, _, _ = UPLOAD_CODECS[self.upload_format]
+        buf = io.BytesIO()
+        sf.write(buf, self.chunk_audio(it), self.VAD_SAMPLE_RATE, format=sf_format, subtype=subtype)
+        data = buf.getvalue()
+        with self.upload_lock:
+            self.upload_chunks += 1
+            self.upload_bytes += len(data)
+        return data
+
+    def chunk_mime(self) -> str:
+        return UPLOAD_CODECS[self.upload_format][2]
+
+    def chunk_name(self, it) -> str:
+        return f"chunk-{it['start_time']}_{it['end_time']}.{UPLOAD_CODECS[self.upload_format][3]}"
+
+    def chunk_file(self, it) -> str:
+        """片段保存为文件，仅用于只接受本地文件路径的接口"""
+        file_name = f"{self.cache_folder or config.TEMP_DIR}/{self.chunk_name(it)}"
+        Path(file_name).write_bytes(self.chunk_bytes(it))
+        return file_name
+
+    def _send_chunk(self, func, it):
+        """
+        经过本渠道限速器后调用 func(it)，失败时只重发该片段，最多重试 recogn_chunk_retry 次
+        已取消时返回 None
+        """
+        from videotrans.translator._base import _get_limiter
+        name = self.__class__.__name__
+        retries = max(0, int(config.settings.get('recogn_chunk_retry', 2)))
+        rps = tools.provider_setting('recogn_rps', name, 0)
+        for attempt in range(retries + 1):
+            _get_limiter(name).acquire(1, rps, 0, self._exit)
+            if self._exit():
+                return None
+            try:
+                return func(it)
+            except NO_RETRY_EXCEPT:
+                raise
+            except Exception as e:
+                if attempt >= retries:
+                    raise
+                config.logger.warning(f'{name} 识别片段请求失败，{self.CHUNK_RETRY_DELAY}秒后第{attempt + 1}次重试:{e}')
+                token = self._token()
+                if token is not None:
+                    token.wait(self.CHUNK_RETRY_DELAY)
+                else:
+                    time.sleep(self.CHUNK_RETRY_DELAY)
+
+    def _map_chunks(self, func, items):
+        """
+        依次返回每个片段的识别结果，顺序与 items 一致
+        recogn_concurrency > 1 时由有界线程池并发请求
+        """
+        concurrency = max(1, tools.provider_setting('recogn_concurrency', self.__class__.__name__, 1))
+        if concurrency <= 1 or len(items) <= 1:
+            for it in items:
+                yield self._send_chunk(func, it)
+            return
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            yield from pool.map(lambda it: self._send_chunk(func, it), items)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     # True 退出
     def _exit(self) -> bool:
+        token = self._token()
+        if token is not None:
+            return token.cancelled
         if config.exit_soft or (config.current_status != 'ing' and config.box_recogn != 'ing'):
             return True
         return False
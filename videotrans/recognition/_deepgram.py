@@ -49,7 +49,7 @@ class DeepgramRecogn(BaseRecogn):
             return
         if os.path.getsize(self.audio_file) > 52428800:
             tools.runffmpeg(
-                ['-y', '-i', self.audio_file, '-ac', '1', '-ar', '16000', self.cache_folder + '/deepgram-tmp.mp3'])
+                ['-y', '-i', self.audio_file, '-ac', '1', '-ar', '16000', self.cache_folder + '/deepgram-tmp.mp3'], uuid=self.uuid)
             self.audio_file = self.cache_folder + '/deepgram-tmp.mp3'
         with open(self.audio_file, "rb") as file:
             buffer_data = file.read()
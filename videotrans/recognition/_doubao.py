@@ -32,7 +32,7 @@ class DoubaoRecogn(BaseRecogn):
         # 尺寸大于190MB，转为 mp3
         if os.path.getsize(self.audio_file) > 199229440:
             tools.runffmpeg(
-                ['-y', '-i', self.audio_file, '-ac', '1', '-ar', '16000', self.cache_folder + '/doubao-tmp.mp3'])
+                ['-y', '-i', self.audio_file, '-ac', '1', '-ar', '16000', self.cache_folder + '/doubao-tmp.mp3'], uuid=self.uuid)
             self.audio_file = self.cache_folder + '/doubao-tmp.mp3'
         with open(self.audio_file, 'rb') as f:
             files = f.read()
@@ -1,16 +1,13 @@
 import multiprocessing
-import threading
 import time
-from dataclasses import dataclass, field
-from pathlib import Path
+from dataclasses import dataclass
 from typing import List
 
 
 
 from videotrans.configure import config
-from videotrans.process._overall import run
+from videotrans.process._server import recognize
 from videotrans.recognition._base import BaseRecogn
-from videotrans.util import tools
 
 """
 faster-whisper
@@ -23,8 +20,6 @@ funasr
 @dataclass
 class FasterAll(BaseRecogn):
 
-    pidfile: str = field(default="", init=False)
-
     def __post_init__(self):
         super().__post_init__()
 
@@ -34,26 +29,13 @@ class FasterAll(BaseRecogn):
         else:
             self.maxlen = int(config.settings.get('other_len', 80))
 
-    # 获取新进程的结果
-    def _get_signal_from_process(self, q: multiprocessing.Queue):
-        while not self.has_done:
-            try:
-                if self._exit() and self.pidfile and Path(self.pidfile).exists():
-                    Path(self.pidfile).unlink(missing_ok=True)
-                    return
-                if not q.empty():
-                    data = q.get_nowait()
-                    if self.inst and self.inst.precent < 50:
-                        self.inst.precent += 0.1
-
-                    if data:
-                        if self.inst and self.inst.status_text and data['type'] == 'logs':
-                            self.inst.status_text = data['text']
-                        self._signal(text=data['text'], type=data['type'])
-            except:
-                pass
-            time.sleep(0.2)
-
+    def _on_process_message(self, data):
+        if self.inst and self.inst.precent < 50:
+            self.inst.precent += 0.1
+        if data:
+            if self.inst and self.inst.status_text and data['type'] == 'logs':
+                self.inst.status_text = data['text']
+            self._signal(text=data['text'], type=data['type'])
 
     def _exec(self):
         # 修复CUDA fork问题：强制使用spawn方法
@@ -73,61 +55,31 @@ class FasterAll(BaseRecogn):
                 continue
             break
 
-        ctx = multiprocessing.get_context('spawn')
-        # 创建队列用于在进程间传递结果
-        result_queue = ctx.Queue()
         try:
             self.has_done = False
-            threading.Thread(target=self._get_signal_from_process, args=(result_queue,)).start()
             self.error = ''
-            with ctx.Manager() as manager:
-                raws = manager.list([])
-                err = manager.dict({"msg": ""})
-                detect = manager.dict({"langcode": self.detect_language})
-                # 创建并启动新进程
-                process = ctx.Process(target=run, args=(raws, err, detect), kwargs={
-                    "model_name": self.model_name,
-                    "is_cuda": self.is_cuda,
-                    "detect_language": self.detect_language,
-                    "audio_file": self.audio_file,
-                    "q": result_queue,
-                    "settings": config.settings,
-                    "defaulelang": config.defaulelang,
-                    "ROOT_DIR": config.ROOT_DIR,
-                    "TEMP_DIR": config.TEMP_DIR,
-                    "proxy": tools.set_proxy()
-                })
-                process.start()
-                self.pidfile = config.TEMP_DIR + f'/{process.pid}.lock'
-                config.logger.info(f'开始创建 pid:{self.pidfile=}')
-                with open(self.pidfile, 'w', encoding='utf-8') as f:
-                    f.write(f'{process.pid}')
-                # 等待进程执行完毕
-                process.join()
-                if err['msg']:
-                    self.error = str(err['msg'])
-                elif len(list(raws))>0:
-                    self.error = ''
-                    if self.detect_language == 'auto' and self.inst and hasattr(self.inst, 'set_source_language'):
-                        config.logger.info(f'需要自动检测语言，当前检测出的语言为{detect["langcode"]=}')
-                        self.detect_language = detect['langcode']
-
-                    if not config.settings['rephrase']:
+            raws, error, langcode = recognize(
+                'overall', model_name=self.model_name, is_cuda=self.is_cuda, audio_file=self.audio_file,
+                detect_language=self.detect_language, on_message=self._on_process_message, is_cancelled=self._exit)
+            if error:
+                self.error = str(error)
+            elif len(raws) > 0:
+                self.error = ''
+                if self.detect_language == 'auto' and self.inst and hasattr(self.inst, 'set_source_language'):
+                    config.logger.info(f'需要自动检测语言，当前检测出的语言为{langcode=}')
+                    self.detect_language = langcode
+
+                if not config.settings['rephrase']:
+                    self.get_srtlist(raws)
+                else:
+                    try:
+                        words_list = []
+                        for it in raws:
+                            words_list += it['words']
+                        self._signal(text="正在重新断句..." if config.defaulelang == 'zh' else "Re-segmenting...")
+                        self.raws = self.re_segment_sentences(words_list, self.detect_language[:2])
+                    except:
                         self.get_srtlist(raws)
-                    else:
-                        try:
-                            words_list = []
-                            for it in list(raws):
-                                words_list += it['words']
-                            self._signal(text="正在重新断句..." if config.defaulelang == 'zh' else "Re-segmenting...")
-                            self.raws = self.re_segment_sentences(words_list, self.detect_language[:2])
-                        except:
-                            self.get_srtlist(raws)
-                try:
-                    if process.is_alive():
-                        process.terminate()
-                except:
-                    pass
         except (KeyError,IndexError,NameError) as e:
             config.logger.exception(f'{e}', exc_info=True)
             self.error = f"{e}"
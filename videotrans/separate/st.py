@@ -1,60 +1,15 @@
 import hashlib
 import os
-import traceback
 from pathlib import Path
 
 import librosa
+import numpy as np
 import soundfile as sf
 
-from pydub import AudioSegment
-
 from videotrans.configure import config
+from videotrans.configure._task_state import TaskCancelled
 
-from videotrans.separate.vr import AudioPre
-
-
-def uvr(*, model_name=None, save_root=None, inp_path=None, source="logs", uuid=None, percent=[0, 1]):
-    infos = []
-    pre_fun=None
-    try:
-        import torch
-        func = AudioPre
-        pre_fun = func(
-            agg=10,
-            model_path=config.ROOT_DIR + f"/uvr5_weights/{model_name}.pth",
-            device="cuda" if torch.cuda.is_available() else "cpu",
-            is_half=False,
-            source=source
-        )
-        done = 0
-        try:
-            y, sr = librosa.load(inp_path, sr=None)
-            info = sf.info(inp_path)
-            channels = info.channels
-            need_reformat = 0
-            pre_fun._path_audio_(
-                inp_path,
-                ins_root=save_root,
-                uuid=uuid,
-                percent=percent
-            )
-            done = 1
-        except  Exception:
-            traceback.print_exc()
-    except:
-        infos.append(traceback.format_exc())
-        yield "\n".join(infos)
-    finally:
-        try:
-            if hasattr(pre_fun, "model"):
-                del pre_fun.model
-            del pre_fun
-        except Exception:
-            traceback.print_exc()
-        import torch
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-    yield "\n".join(infos)
+from videotrans.separate.vr import get_engine
 
 
 def convert_to_pure_eng_num(string):
@@ -65,76 +20,116 @@ def convert_to_pure_eng_num(string):
     return hex_digest
 
 
-def split_audio(file_path):
-    audio = AudioSegment.from_wav(file_path)
-    segment_length = 300
+# 相邻片段重叠的秒数，重叠部分交叉淡化拼接，消除切割处的接缝
+OVERLAP_SEC = 1.0
+
+
+def _segment_length():
     try:
-        segment_length = int(config.settings['bgm_split_time'])
+        return max(10, int(config.settings['bgm_split_time']))
     except Exception:
-        pass
-    output_folder = Path(config.TEMP_DIR) / "separate"
-    output_folder.mkdir(parents=True, exist_ok=True)
-    output_folder = output_folder.as_posix()
-
-    total_length = len(audio)  # Total length in milliseconds
-    segment_length_ms = segment_length * 1000  # Convert segment length to milliseconds
-    segments = []
-
-    for i in range(0, total_length, segment_length_ms):
-        start = i
-        end = min(i + segment_length_ms, total_length)
-        segment = audio[start:end]
-        segment_filename = os.path.join(output_folder, f"segment_{i // 1000}.wav")
-        # 如果音频不是2通道，16kHz，则进行转换
-        if segment.channels != 2:
-            segment = segment.set_channels(2)
-        if segment.frame_rate != 44100:
-            segment = segment.set_frame_rate(44100)
-        segment.export(segment_filename, format="wav")
-        segments.append(segment_filename)
-
-    return segments
-
-
-def concatenate_audio(input_wav_list, out_wav):
-    combined = AudioSegment.empty()
-    for wav_file in input_wav_list:
-        audio = AudioSegment.from_wav(wav_file)
-        if audio.channels != 2:
-            audio = audio.set_channels(2)
-        if audio.frame_rate != 44100:
-            audio = audio.set_frame_rate(44100)
-        combined += audio
-
-    combined.export(out_wav, format="wav")
+        return 300
+
+
+def _to_stereo(block):
+    """(n, channels) -> (2, n)"""
+    if block.shape[1] == 1:
+        block = np.repeat(block, 2, axis=1)
+    return np.ascontiguousarray(block[:, :2].T)
+
+
+def _fit_length(wave, length):
+    """补零或截断到指定长度，分离结果长度与输入可能相差不足一帧"""
+    if len(wave) >= length:
+        return wave[:length]
+    return np.pad(wave, ((0, length - len(wave)), (0, 0)))
+
+
+class _OverlapWriter:
+    """
+    按顺序写入各片段的分离结果，片段首部与上一片段保留的尾部线性交叉淡化
+    每个片段除最后一个外，末尾 overlap 个采样点暂不写入，等待与下一片段首部混合
+    """
+
+    def __init__(self, file, samplerate):
+        self.f = sf.SoundFile(file, 'w', samplerate=samplerate, channels=2, subtype='PCM_16', format='WAV')
+        self.tail = None
+
+    def write(self, wave, overlap, is_last):
+        if self.tail is not None:
+            n = min(len(self.tail), len(wave))
+            fade = np.linspace(0, 1, n, dtype=np.float32)[:, None]
+            self.f.write(self.tail[:n] * (1 - fade) + wave[:n] * fade)
+            wave = wave[n:]
+            self.tail = None
+        if is_last or overlap <= 0:
+            self.f.write(wave)
+            return
+        keep = min(overlap, len(wave))
+        self.f.write(wave[:len(wave) - keep])
+        self.tail = wave[len(wave) - keep:]
+
+    def close(self):
+        self.f.close()
 
 
 # path 是需要保存vocal.wav的目录
 def start(audio, path, source="logs", uuid=None):
+    """
+    分段读取 audio 进行人声背景分离，结果直接追加写入 path/instrument.wav 和 path/vocal.wav
+    每段长度为 bgm_split_time 秒并向后多读 OVERLAP_SEC 秒，内存占用只与片段长度有关，与音频总时长无关
+    """
     Path(path).mkdir(parents=True, exist_ok=True)
-    reslist = split_audio(audio)
-    vocal_list = []
-    instr_list = []
-    grouplen = len(reslist)
-    per = round(1 / grouplen, 2)
-    for i, audio_seg in enumerate(reslist):
-        if config.exit_soft or (uuid in config.stoped_uuid_set):
-            return
-        audio_path = Path(audio_seg)
-        path_dir = audio_path.parent / audio_path.stem
-        path_dir.mkdir(parents=True, exist_ok=True)
+    engine = get_engine("HP2")
+    in_sr = engine.input_sr()
+    out_sr = engine.mp.param["sr"]
+    res_type = engine.mp.param["band"][len(engine.mp.param["band"])]["res_type"]
+    instr_file = Path(f"{path}/instrument.wav").as_posix()
+    vocal_file = Path(f"{path}/vocal.wav").as_posix()
+    # 先写入临时文件，完成后再改名，中途取消或出错时不留下不完整的结果
+    instr_part = instr_file[:-4] + '.part.wav'
+    vocal_part = vocal_file[:-4] + '.part.wav'
+
+    with sf.SoundFile(audio) as reader:
+        file_sr = reader.samplerate
+        total = reader.frames
+        if total < 1:
+            raise Exception('separate bgm error: empty audio')
+        seg = _segment_length() * file_sr
+        overlap = int(OVERLAP_SEC * file_sr)
+        # 剩余部分不超过重叠长度时已被上一片段读入，无需单独成段
+        starts = [pos for pos in range(0, total, seg) if pos == 0 or total - pos > overlap]
+        per = round(1 / len(starts), 2)
+        instr_writer = _OverlapWriter(instr_part, out_sr)
+        vocal_writer = _OverlapWriter(vocal_part, out_sr)
+        done = False
         try:
-            gr = uvr(model_name="HP2", save_root=path_dir.as_posix(), inp_path=Path(audio_seg).as_posix(),
-                     source=source, uuid=uuid, percent=[i * per, per])
-            print(next(gr))
-            print(next(gr))
-        except StopIteration:
-            vocal_list.append((path_dir / 'vocal.wav').as_posix())
-            instr_list.append((path_dir / 'instrument.wav').as_posix())
-        except Exception as e:
-            raise
-
-    if len(vocal_list) < 1 or len(instr_list) < 1:
-        raise Exception('separate bgm error')
-    concatenate_audio(instr_list, Path(f"{path}/instrument.wav").as_posix())
-    concatenate_audio(vocal_list, Path(f"{path}/vocal.wav").as_posix())
+            for i, pos in enumerate(starts):
+                if config.exit_soft or (uuid in config.stoped_uuid_set):
+                    raise TaskCancelled(uuid)
+                is_last = i == len(starts) - 1
+                reader.seek(pos)
+                block = reader.read(min(seg + overlap, total - pos), dtype='float32', always_2d=True)
+                wave = _to_stereo(block)
+                if file_sr != in_sr:
+                    wave = librosa.resample(wave, orig_sr=file_sr, target_sr=in_sr, res_type=res_type)
+                with engine.lock:
+                    wav_instrument, wav_vocals = engine.separate(wave, uuid=uuid, percent=[i * per, per],
+                                                                 source=source)
+                # 分离中途退出软件时返回 None
+                if wav_instrument is None:
+                    raise TaskCancelled(uuid)
+                length = round(len(block) * out_sr / file_sr)
+                out_overlap = 0 if is_last else round(overlap * out_sr / file_sr)
+                instr_writer.write(_fit_length(wav_instrument, length), out_overlap, is_last)
+                vocal_writer.write(_fit_length(wav_vocals, length), out_overlap, is_last)
+            done = True
+        finally:
+            instr_writer.close()
+            vocal_writer.close()
+            if done:
+                os.replace(instr_part, instr_file)
+                os.replace(vocal_part, vocal_file)
+            else:
+                Path(instr_part).unlink(missing_ok=True)
+                Path(vocal_part).unlink(missing_ok=True)
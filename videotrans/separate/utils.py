@@ -5,6 +5,7 @@ import torch
 
 # from tqdm import tqdm
 from videotrans.configure import config
+from videotrans.configure._task_state import TaskCancelled
 from videotrans.util import tools
 
 
@@ -36,23 +37,24 @@ def inference(X_spec, device, model, aggressiveness, data, source="logs", uuid=N
             X_mag_pad, roi_size, n_window, device, model, aggressiveness, is_half=True, source="logs"
     ):
         model.eval()
+        # 每次送入模型的窗口数，窗口大小相同，可直接堆叠为一个批次
+        try:
+            batch_size = max(1, int(float(config.settings.get('separate_batch_size', 4))))
+        except (TypeError, ValueError):
+            batch_size = 4
         with torch.no_grad():
             preds = []
-
-            iterations = [n_window]
-
-            total_iterations = sum(iterations)
-            for i in range(n_window):
+            for b in range(0, n_window, batch_size):
                 if config.exit_soft or (uuid in config.stoped_uuid_set):
-                    return
-                jd = (percent[0] + (percent[1] * (i + 1) / n_window)) * 100
+                    raise TaskCancelled(uuid)
+                batch = range(b, min(b + batch_size, n_window))
+                jd = (percent[0] + percent[1] * (batch[-1] + 1) / n_window) * 100
                 jd = 100 if jd >= 100 else jd
                 tools.set_process(text=f"{config.transobj['Separating background music']} {round(jd, 1)}%", type=source,
                                   uuid=uuid)
-                start = i * roi_size
-                X_mag_window = X_mag_pad[
-                               None, :, :, start: start + data["window_size"]
-                               ]
+                X_mag_window = np.stack([
+                    X_mag_pad[:, :, i * roi_size: i * roi_size + data["window_size"]] for i in batch
+                ])
                 X_mag_window = torch.from_numpy(X_mag_window)
                 if is_half:
                     X_mag_window = X_mag_window.half()
@@ -61,7 +63,7 @@ def inference(X_spec, device, model, aggressiveness, data, source="logs", uuid=N
                 pred = model.predict(X_mag_window, aggressiveness)
 
                 pred = pred.detach().cpu().numpy()
-                preds.append(pred[0])
+                preds.extend(pred)
 
             pred = np.concatenate(preds, axis=2)
         return pred
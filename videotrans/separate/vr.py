@@ -1,8 +1,7 @@
-import os
+import threading
 
 import librosa
 import numpy as np
-import soundfile as sf
 import torch
 
 from videotrans.configure import config
@@ -38,38 +37,28 @@ class AudioPre:
 
         self.mp = mp
         self.model = model
+        # 同一模型被多个任务共用时逐个推理，避免显存/内存成倍占用
+        self.lock = threading.Lock()
 
-    def _path_audio_(
-            self, music_file, ins_root=None, format="wav", is_hp3=False, uuid=None, percent=[0, 1]
-    ):
+    def input_sr(self):
+        """separate() 接收的音频采样率"""
+        return self.mp.param["band"][len(self.mp.param["band"])]["sr"]
 
-        if ins_root is None:
-            return "No save root."
-        name = os.path.splitext(os.path.basename(music_file))[0]
-        if ins_root is not None:
-            os.makedirs(ins_root, exist_ok=True)
-        vocal_root = ins_root
-
-        X_wave, y_wave, X_spec_s, y_spec_s = {}, {}, {}, {}
+    def separate(self, wave, uuid=None, percent=[0, 1], source=None):
+        """
+        分离一段双声道音频
+        wave: shape 为 (2, n) 的 float32 数组，采样率为 input_sr()
+        返回 (wav_instrument, wav_vocals)，shape 均为 (n', 2)，采样率为 mp.param["sr"]
+        """
+        X_wave, X_spec_s = {}, {}
         bands_n = len(self.mp.param["band"])
         for d in range(bands_n, 0, -1):
             if config.exit_soft:
-                return
+                return None, None
 
             bp = self.mp.param["band"][d]
             if d == bands_n:  # high-end band
-                (
-                    X_wave[d],
-                    _,
-                ) = librosa.core.load(
-                    music_file,
-                    sr=bp["sr"],
-                    mono=False,
-                    dtype=np.float32,
-                    res_type=bp["res_type"],
-                )
-                if X_wave[d].ndim == 1:
-                    X_wave[d] = np.asfortranarray([X_wave[d], X_wave[d]])
+                X_wave[d] = np.asfortranarray(wave, dtype=np.float32)
             else:  # lower bands
                 X_wave[d] = librosa.core.resample(
                     X_wave[d + 1],
@@ -86,7 +75,6 @@ class AudioPre:
                 self.mp.param["mid_side_b2"],
                 self.mp.param["reverse"],
             )
-            # pdb.set_trace()
             if d == bands_n and self.data["high_end_process"] != "none":
                 input_high_end_h = (bp["n_fft"] // 2 - bp["crop_stop"]) + (
                         self.mp.param["pre_filter_stop"] - self.mp.param["pre_filter_start"]
@@ -103,7 +91,7 @@ class AudioPre:
         }
         with torch.no_grad():
             pred, X_mag, X_phase = inference(
-                X_spec_m, self.device, self.model, aggressiveness, self.data, self.source,
+                X_spec_m, self.device, self.model, aggressiveness, self.data, source or self.source,
                 uuid=uuid,
                 percent=percent
             )
@@ -114,52 +102,41 @@ class AudioPre:
         y_spec_m = pred * X_phase
         v_spec_m = X_spec_m - y_spec_m
 
-        if ins_root is not None:
-            if self.data["high_end_process"].startswith("mirroring"):
-                input_high_end_ = spec_utils.mirroring(
-                    self.data["high_end_process"], y_spec_m, input_high_end, self.mp
-                )
-                wav_instrument = spec_utils.cmb_spectrogram_to_wave(
-                    y_spec_m, self.mp, input_high_end_h, input_high_end_
-                )
-            else:
-                wav_instrument = spec_utils.cmb_spectrogram_to_wave(y_spec_m, self.mp)
-            config.logger.info("%s instruments done" % name)
-            if is_hp3 == True:
-                head = "vocal"
-            else:
-                head = "instrument"
-            if format in ["wav", "flac"]:
-                sf.write(
-                    os.path.join(
-                        ins_root,
-                        head + ".{}".format(format),
-                    ),
-                    (np.array(wav_instrument) * 32768).astype("int16"),
-                    self.mp.param["sr"],
-                )  #
+        if self.data["high_end_process"].startswith("mirroring"):
+            input_high_end_ = spec_utils.mirroring(
+                self.data["high_end_process"], y_spec_m, input_high_end, self.mp
+            )
+            wav_instrument = spec_utils.cmb_spectrogram_to_wave(
+                y_spec_m, self.mp, input_high_end_h, input_high_end_
+            )
+            input_high_end_ = spec_utils.mirroring(
+                self.data["high_end_process"], v_spec_m, input_high_end, self.mp
+            )
+            wav_vocals = spec_utils.cmb_spectrogram_to_wave(
+                v_spec_m, self.mp, input_high_end_h, input_high_end_
+            )
+        else:
+            wav_instrument = spec_utils.cmb_spectrogram_to_wave(y_spec_m, self.mp)
+            wav_vocals = spec_utils.cmb_spectrogram_to_wave(v_spec_m, self.mp)
+        return wav_instrument, wav_vocals
 
-        if vocal_root is not None:
-            if is_hp3 == True:
-                head = "instrument"
-            else:
-                head = "vocal"
-            if self.data["high_end_process"].startswith("mirroring"):
-                input_high_end_ = spec_utils.mirroring(
-                    self.data["high_end_process"], v_spec_m, input_high_end, self.mp
-                )
-                wav_vocals = spec_utils.cmb_spectrogram_to_wave(
-                    v_spec_m, self.mp, input_high_end_h, input_high_end_
-                )
-            else:
-                wav_vocals = spec_utils.cmb_spectrogram_to_wave(v_spec_m, self.mp)
-            config.logger.info("%s vocals done" % name)
-            if format in ["wav", "flac"]:
-                sf.write(
-                    os.path.join(
-                        vocal_root,
-                        head + ".{}".format(format),
-                    ),
-                    (np.array(wav_vocals) * 32768).astype("int16"),
-                    self.mp.param["sr"],
-                )
+
+# 已加载的模型，key 为 (模型名, 设备)，进程内只加载一次
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(model_name="HP2", agg=10) -> AudioPre:
+    """返回常驻的分离模型，首次调用时加载权重"""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    key = (model_name, device, agg)
+    with _engines_lock:
+        if key not in _engines:
+            config.logger.info(f'加载人声分离模型 {model_name} -> {device}')
+            _engines[key] = AudioPre(
+                agg=agg,
+                model_path=config.ROOT_DIR + f"/uvr5_weights/{model_name}.pth",
+                device=device,
+                is_half=False
+            )
+        return _engines[key]
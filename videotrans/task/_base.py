@@ -38,6 +38,11 @@ class BaseTask(BaseCon):
     # 是否需要嵌入配音或字幕
     shoud_hebing: bool = False
 
+    # 本任务的取消标记和状态，由 uuid 在识别、翻译、配音和 ffmpeg 中共享
+    token: Any = field(default=None, init=False, repr=False)
+    # 界面中控制该功能的全局停止开关名，子功能需重写
+    cancel_scope = 'current_status'
+
     def __post_init__(self):
         # 调用父类的真实 __init__
         super().__init__()
@@ -47,6 +52,9 @@ class BaseTask(BaseCon):
 
         if "uuid" in self.cfg and self.cfg['uuid']:
             self.uuid = self.cfg['uuid']
+        if self.uuid:
+            from videotrans.configure import _task_state
+            self.token = _task_state.register(self.uuid, None if config.exec_mode == 'api' else self.cancel_scope)
 
     # 预先处理，例如从视频中拆分音频、人声背景分离、转码等
     def prepare(self):
@@ -153,8 +161,10 @@ class BaseTask(BaseCon):
         config.logger.info(f'处理后目标字幕：{target_srt_list=}')
         return target_srt_list
 
-    # 完整流程判断是否需退出，子功能需重写
+    # 判断是否需退出，子功能通过 cancel_scope 指定对应的全局停止开关
     def _exit(self):
-        if config.exit_soft or config.current_status != 'ing':
+        if self.token is not None:
+            return self.token.cancelled
+        if config.exit_soft or getattr(config, self.cancel_scope) != 'ing':
             return True
         return False
@@ -18,6 +18,7 @@ from videotrans.util import tools
 
 @dataclass
 class DubbingSrt(BaseTask):
+    cancel_scope = 'box_tts'
     is_multi_role: bool = field(init=False)
     shoud_dubbing: bool = field(default=True, init=False)
 
@@ -128,7 +129,7 @@ class DubbingSrt(BaseTask):
                 await communicate_task.save(tmp_name)
 
                 if not self.cfg["target_wav"].endswith('.mp3'):
-                    tools.runffmpeg(['-y', '-i', tmp_name, '-b:a', '128k', self.cfg['target_wav']])
+                    tools.runffmpeg(['-y', '-i', tmp_name, '-b:a', '128k', self.cfg['target_wav']], uuid=self.uuid)
                 await asyncio.sleep(0.1)
 
             asyncio.run(_async_dubb())
@@ -164,7 +165,7 @@ class DubbingSrt(BaseTask):
 
             # 要保存到的文件
             filename_md5 = tools.get_md5(
-                f"{self.cfg['tts_type']}-{it['start_time']}-{it['end_time']}-{voice_role}-{rate}-{self.cfg['volume']}-{self.cfg['pitch']}-{len(it['text'])}-{i}")
+                f"{self.uuid}-{self.cfg['tts_type']}-{it['start_time']}-{it['end_time']}-{voice_role}-{rate}-{self.cfg['volume']}-{self.cfg['pitch']}-{it['text']}-{i}")
             tmp_dict = {
                 "line": it['line'],
                 "text": it['text'],
@@ -182,11 +183,16 @@ class DubbingSrt(BaseTask):
         if not self.queue_tts or len(self.queue_tts) < 1:
             raise RuntimeError(f'Queue tts length is 0')
         # 具体配音操作
-        tts.run(
+        dubbed = tts.run(
             queue_tts=copy.deepcopy(self.queue_tts),
             language=self.cfg['target_language_code'],
             uuid=self.uuid
         )
+        # 配音阶段已读取各片段时长，对齐阶段直接使用
+        durations = {it['filename']: it['dubb_time'] for it in dubbed or [] if it.get('dubb_time')}
+        for it in self.queue_tts:
+            if it['filename'] in durations:
+                it['dubb_time'] = durations[it['filename']]
         if config.settings.get('save_segment_audio', False):
             outname = self.cfg['target_dir'] + f'/segment_audio_{self.cfg["noextname"]}'
             Path(outname).mkdir(parents=True, exist_ok=True)
@@ -200,7 +206,7 @@ class DubbingSrt(BaseTask):
     def align(self) -> None:
         if self.cfg['target_sub'].endswith('.txt') or len(self.queue_tts) == 1:
             if self.cfg['tts_type'] != tts.EDGE_TTS:
-                tools.runffmpeg(['-y', '-i', self.queue_tts[0]['filename'], '-b:a', '128k', self.cfg['target_wav']])
+                tools.runffmpeg(['-y', '-i', self.queue_tts[0]['filename'], '-b:a', '128k', self.cfg['target_wav']], uuid=self.uuid)
             return
 
         if self.cfg['voice_autorate']:
@@ -224,7 +230,7 @@ class DubbingSrt(BaseTask):
                 try:
                     volume = 1 + float(volume) / 100
                     tmp_name = self.cfg['cache_folder'] + f'/volume-{volume}-{Path(self.cfg["target_wav"]).name}'
-                    tools.runffmpeg(['-y', '-i', self.cfg['target_wav'], '-af', f"volume={volume}", tmp_name])
+                    tools.runffmpeg(['-y', '-i', self.cfg['target_wav'], '-af', f"volume={volume}", tmp_name], uuid=self.uuid)
                 except:
                     pass
             self.queue_tts = rate_inst.run()
@@ -249,8 +255,3 @@ class DubbingSrt(BaseTask):
                 Path(self.cfg['shound_del_name']).unlink(missing_ok=True)
         except:
             pass
-
-    def _exit(self):
-        if config.exit_soft or config.box_tts != 'ing':
-            return True
-        return False
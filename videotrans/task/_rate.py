@@ -1,16 +1,93 @@
 import json
 import os
 import shutil
-import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from pydub import AudioSegment
 
-from videotrans.configure import config
+from videotrans.configure import config, _task_state
 from videotrans.util import tools
 
 
+def decode_pcm(filename, sample_rate, channels):
+    """解码音频文件为 (帧数, 声道数) 的 int16 数组"""
+    import numpy as np
+    segment = AudioSegment.from_file(filename).set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2)
+    return np.frombuffer(segment.raw_data, dtype=np.int16).reshape((-1, channels))
+
+
+class AudioTimeline:
+    """
+    按时间轴顺序把配音和静音流式写入同一个WAV文件。
+    每个配音只解码一次，静音直接写入零值，不再生成中间片段文件，也不再调用ffmpeg拼接。
+    """
+
+    # 写入静音时每次分配的最大帧数，避免长静音一次性占用大量内存
+    SILENCE_CHUNK_FRAMES = 44100 * 10
+
+    def __init__(self, output, sample_rate=44100, channels=2):
+        import soundfile as sf
+        self.output = output
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+        self._file = sf.SoundFile(output, mode='w', samplerate=sample_rate, channels=channels, format='WAV',
+                                  subtype='PCM_16')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def duration_ms(self):
+        return int(self.frames * 1000 / self.sample_rate)
+
+    def ms_to_frames(self, ms):
+        return int(ms * self.sample_rate / 1000)
+
+    def frames_to_ms(self, frames):
+        return int(frames * 1000 / self.sample_rate)
+
+    def load(self, filename):
+        """解码音频文件为 (帧数, 声道数) 的 int16 数组，采样率和声道统一为时间轴参数"""
+        return decode_pcm(filename, self.sample_rate, self.channels)
+
+    def add_silence(self, ms):
+        self._write_silence_frames(self.ms_to_frames(ms))
+
+    def add_clip(self, samples, canvas_ms=None):
+        """
+        写入已解码的配音。canvas_ms 不为None时片段固定为该时长，配音超出部分截断，不足部分补静音
+        返回实际写入的时长(ms)
+        """
+        start = self.frames
+        if canvas_ms is not None:
+            canvas_frames = self.ms_to_frames(canvas_ms)
+            samples = samples[:canvas_frames]
+        if len(samples) > 0:
+            self._file.write(samples)
+            self.frames += len(samples)
+        if canvas_ms is not None:
+            self._write_silence_frames(canvas_frames - len(samples))
+        return self.frames_to_ms(self.frames - start)
+
+    def _write_silence_frames(self, frames):
+        import numpy as np
+        while frames > 0:
+            n = min(frames, self.SILENCE_CHUNK_FRAMES)
+            self._file.write(np.zeros((n, self.channels), dtype=np.int16))
+            self.frames += n
+            frames -= n
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
 class SpeedRate:
     """
 通过音频加速和视频慢放来对齐翻译配音和原始视频时间轴。
@@ -101,9 +178,6 @@ class SpeedRate:
         self.cache_folder = cache_folder if cache_folder else Path(
             f'{config.TEMP_DIR}/{str(uuid if uuid else time.time())}').as_posix()
         Path(self.cache_folder).mkdir(parents=True, exist_ok=True)
-        # 音频片段缓存目录
-        self.audio_clips_folder = Path(f'{self.cache_folder}/audio_clips').as_posix()
-        Path(self.audio_clips_folder).mkdir(parents=True, exist_ok=True)
 
         self.target_audio_original = target_audio
         self.target_audio = Path(f'{self.cache_folder}/final_audio{Path(target_audio).suffix}').as_posix()
@@ -111,6 +185,8 @@ class SpeedRate:
         self.max_audio_speed_rate = 100
         self.max_video_pts_rate = 10
         self.source_video_fps = 30
+        # 视频片段并发裁切数及每个片段的编码线程数
+        self.clip_workers, self.clip_threads = self._get_clip_workers()
 
         # 检测并设置可用的音频变速滤镜
         self.audio_speed_filter = self._check_ffmpeg_filters()
@@ -119,28 +195,25 @@ class SpeedRate:
             f"SpeedRate 初始化。音频加速: {self.shoud_audiorate}, 视频慢速: {self.shoud_videorate}, 音频变速引擎: {self.audio_speed_filter}")
         config.logger.info(f"所有中间音频将统一为: {self.AUDIO_SAMPLE_RATE}Hz, {self.AUDIO_CHANNELS} 声道。")
 
+    def _exit(self):
+        token = _task_state.get(self.uuid)
+        if token is not None:
+            return token.cancelled
+        return config.exit_soft
+
     def _check_ffmpeg_filters(self):
         """
         检查FFmpeg支持的音频变速滤镜，优先使用rubberband。
         """
-        try:
-            # 运行ffmpeg -filters命令并捕获输出
-            result = subprocess.run([config.FFMPEG_BIN, '-filters'], capture_output=True, text=True, encoding='utf-8',
-                                    errors='ignore')
-            filters_output = result.stdout
-
-            if 'rubberband' in filters_output:
-                config.logger.info("检测到FFmpeg支持 'rubberband' 滤镜，将优先使用。")
-                return 'rubberband'
-            elif 'atempo' in filters_output:
-                config.logger.info("未检测到 'rubberband' 滤镜，将使用 'atempo' 滤镜。")
-                return 'atempo'
-            else:
-                config.logger.warning("FFmpeg中未检测到 'rubberband' 或 'atempo' 滤镜，音频加速功能可能受限。")
-                return None
-        except Exception as e:
-            config.logger.error(f"检查FFmpeg滤镜时出错: {e}。将无法使用高质量音频变速。")
-            return None
+        filters = tools.ffmpeg_capabilities()['filters']
+        if 'rubberband' in filters:
+            config.logger.info("检测到FFmpeg支持 'rubberband' 滤镜，将优先使用。")
+            return 'rubberband'
+        elif 'atempo' in filters:
+            config.logger.info("未检测到 'rubberband' 滤镜，将使用 'atempo' 滤镜。")
+            return 'atempo'
+        config.logger.warning("FFmpeg中未检测到 'rubberband' 或 'atempo' 滤镜，音频加速功能可能受限。")
+        return None
 
     def run(self):
         # =========================================================================================
@@ -155,23 +228,17 @@ class SpeedRate:
         self._execute_audio_speedup()
         clip_meta_list_with_real_durations = self._execute_video_processing()
 
-        audio_concat_list = self._recalculate_timeline_and_merge_audio(clip_meta_list_with_real_durations)
-        if audio_concat_list:
-            self._finalize_files(audio_concat_list)
+        merged_wav = self._recalculate_timeline_and_merge_audio(clip_meta_list_with_real_durations)
+        if merged_wav:
+            self._finalize_files(merged_wav)
         return self.queue_tts
 
-    def _standardize_audio_segment(self, segment):
-        """[新增] 辅助函数，用于将任何AudioSegment对象标准化"""
-        return segment.set_frame_rate(self.AUDIO_SAMPLE_RATE).set_channels(self.AUDIO_CHANNELS)
-
     def _run_no_rate_change_mode(self):
         """
         模式 不对音频视频做任何加减速处理。
-        [重构] 现在此模式也使用基于FFmpeg的流式拼接，以处理大文件。
         1. 准备数据。
-        2. 循环中，生成每个音频片段（配音+静音）的临时WAV文件。
-        3. 生成一个文件列表供FFmpeg concat使用。
-        4. 调用通用的 `_finalize_files` 方法来处理拼接和与视频的最终对齐。
+        2. 循环中，将每个配音及其前后静音按顺序流式写入同一个时间轴WAV。
+        3. 调用通用的 `_finalize_files` 方法来处理格式转换和与视频的最终对齐。
         """
         process_text = "[纯净模式] 正在拼接音频..." if config.defaulelang == 'zh' else "[Pure Mode] Merging audio..."
         tools.set_process(text=process_text, uuid=self.uuid)
@@ -179,78 +246,66 @@ class SpeedRate:
 
         self._prepare_data()
 
-        audio_concat_list = []
         last_end_time = 0
-        total_audio_duration = 0
-
-        for i, it in enumerate(self.queue_tts):
-            # 1. 填充字幕前的静音
-            silence_duration = it['start_time_source'] - last_end_time
-            if silence_duration > self.MIN_CLIP_DURATION_MS:
-                silence_clip_path = Path(self.audio_clips_folder, f"{i:05d}_pre_silence.wav").as_posix()
-                # [修正] 标准化静音参数
-                silent_segment = AudioSegment.silent(duration=silence_duration)
-                self._standardize_audio_segment(silent_segment).export(silence_clip_path, format="wav")
-                audio_concat_list.append(silence_clip_path)
-                config.logger.info(f"字幕[{it['line']}]前，生成静音片段 {silence_duration}ms")
-                total_audio_duration += silence_duration
-
-            # 加载并处理配音片段
-            segment = None
-            dubb_duration = 0
-            if tools.vail_file(it['filename']):
-                try:
-                    # [修正] 标准化加载的音频
-                    segment = AudioSegment.from_file(it['filename'])
-                    segment = self._standardize_audio_segment(segment)
-                    dubb_duration = len(segment)
-                except Exception as e:
-                    config.logger.error(f"字幕[{it['line']}] 加载音频文件 {it['filename']} 失败: {e}，将忽略此片段。")
-            else:
-                config.logger.warning(f"字幕[{it['line']}] 配音文件不存在: {it['filename']}，将忽略此片段。")
-
-            it['dubb_time'] = dubb_duration
-
-            if not segment:
-                last_end_time = it['end_time_source']
-                continue
-
-            it['start_time'] = total_audio_duration
-            it['end_time'] = it['start_time'] + it['dubb_time']
-            it['startraw'], it['endraw'] = tools.ms_to_time_string(ms=it['start_time']), tools.ms_to_time_string(
-                ms=it['end_time'])
+        with self._create_timeline() as timeline:
+            for i, it in enumerate(self.queue_tts):
+                # 1. 填充字幕前的静音
+                silence_duration = it['start_time_source'] - last_end_time
+                if silence_duration > self.MIN_CLIP_DURATION_MS:
+                    timeline.add_silence(silence_duration)
+                    config.logger.info(f"字幕[{it['line']}]前，写入静音 {silence_duration}ms")
+
+                # 加载配音片段
+                samples = self._load_dubbing(timeline, it)
+                it['dubb_time'] = timeline.frames_to_ms(len(samples)) if samples is not None else 0
+
+                if samples is None or it['dubb_time'] <= 0:
+                    last_end_time = it['end_time_source']
+                    continue
 
-            # 导出当前配音片段
-            dub_clip_path = Path(self.audio_clips_folder, f"{i:05d}_dub.wav").as_posix()
-            segment.export(dub_clip_path, format="wav")
-            audio_concat_list.append(dub_clip_path)
-            total_audio_duration += dubb_duration
-            config.logger.info(
-                f"字幕[{it['line']}] 已生成配音片段，时长: {dubb_duration}ms, 新时间区间: {it['start_time']}-{it['end_time']}")
+                it['start_time'] = timeline.duration_ms
+                it['end_time'] = it['start_time'] + it['dubb_time']
+                it['startraw'], it['endraw'] = tools.ms_to_time_string(ms=it['start_time']), tools.ms_to_time_string(
+                    ms=it['end_time'])
 
-            # 填充配音后的静音
-            if i < len(self.queue_tts) - 1:
-                next_start_time = self.queue_tts[i + 1]['start_time_source']
-                available_space = next_start_time - it['start_time_source']
-                if available_space >= dubb_duration:
-                    remaining_silence = available_space - dubb_duration
-                    if remaining_silence > self.MIN_CLIP_DURATION_MS:
-                        post_silence_path = Path(self.audio_clips_folder, f"{i:05d}_post_silence.wav").as_posix()
-                        # [修正] 标准化静音参数
-                        silent_segment = AudioSegment.silent(duration=remaining_silence)
-                        self._standardize_audio_segment(silent_segment).export(post_silence_path, format="wav")
-                        audio_concat_list.append(post_silence_path)
-                        total_audio_duration += remaining_silence
-                        config.logger.info(f"字幕[{it['line']}]后，生成剩余静音片段 {remaining_silence}ms")
-                    last_end_time = next_start_time
+                dubb_duration = timeline.add_clip(samples)
+                config.logger.info(
+                    f"字幕[{it['line']}] 已写入配音，时长: {dubb_duration}ms, 新时间区间: {it['start_time']}-{it['end_time']}")
+
+                # 填充配音后的静音
+                if i < len(self.queue_tts) - 1:
+                    next_start_time = self.queue_tts[i + 1]['start_time_source']
+                    available_space = next_start_time - it['start_time_source']
+                    if available_space >= dubb_duration:
+                        remaining_silence = available_space - dubb_duration
+                        if remaining_silence > self.MIN_CLIP_DURATION_MS:
+                            timeline.add_silence(remaining_silence)
+                            config.logger.info(f"字幕[{it['line']}]后，写入剩余静音 {remaining_silence}ms")
+                        last_end_time = next_start_time
+                    else:
+                        last_end_time = it['start_time_source'] + dubb_duration
                 else:
-                    last_end_time = it['start_time_source'] + dubb_duration
-            else:
-                last_end_time = it['start_time'] + it['dubb_time']
+                    last_end_time = it['start_time'] + it['dubb_time']
 
-        self._finalize_files(audio_concat_list)
+        self._finalize_files(timeline.output)
         config.logger.info("================== [纯净模式] 处理完成 ==================")
 
+    def _create_timeline(self):
+        """创建统一采样参数的时间轴，输出到缓存目录下的临时WAV"""
+        output = Path(f'{self.cache_folder}/temp_concatenated.wav').as_posix()
+        return AudioTimeline(output, sample_rate=self.AUDIO_SAMPLE_RATE, channels=self.AUDIO_CHANNELS)
+
+    def _load_dubbing(self, timeline, it):
+        """解码字幕对应的配音，文件不存在或解码失败时返回None"""
+        if not tools.vail_file(it['filename']):
+            config.logger.warning(f"字幕[{it['line']}] 配音文件不存在: {it['filename']}，使用静音替代。")
+            return None
+        try:
+            return timeline.load(it['filename'])
+        except Exception as e:
+            config.logger.error(f"字幕[{it['line']}] 加载音频文件 {it['filename']} 失败: {e}，使用静音替代。")
+            return None
+
     def _prepare_data(self):
         """
         此阶段为所有后续计算提供基础数据。关键是计算出 `source_duration` (原始时长)
@@ -273,7 +328,9 @@ class SpeedRate:
             it['start_time_source'] = it['start_time']
             it['end_time_source'] = it['end_time']
             it['source_duration'] = it['end_time_source'] - it['start_time_source']
-            it['dubb_time'] = self._get_audio_time_ms(it['filename'], line=it['line'])
+            # 配音阶段已记录时长时不再探测
+            if not it.get('dubb_time') or not tools.vail_file(it['filename']):
+                it['dubb_time'] = self._get_audio_time_ms(it['filename'], line=it['line'])
             it['final_audio_duration_theoretical'] = it['dubb_time']
             it['final_video_duration_theoretical'] = it['source_duration']
             # 用于存储探测到的物理时长
@@ -392,16 +449,20 @@ class SpeedRate:
 
     def _execute_audio_speedup(self):
         """
-        使用FFmpeg的`rubberband`或`atempo`滤镜进行高质量音频变速。
+        对超长配音进行保持音高的加速。
+        默认在内存中用 wsola/pyrubberband 变速并由线程池并发处理，输出帧数精确，无需再探测时长；
+        高级设置 audio_speed_engine=ffmpeg 时使用FFmpeg的`rubberband`或`atempo`滤镜，内存变速失败时也回退到该方式。
         """
         tools.set_process(text="[3/5] 处理音频..." if config.defaulelang == 'zh' else "[3/5] Processing audio...",
                           uuid=self.uuid)
         config.logger.info("================== [阶段 3/5] 执行音频加速 ==================")
 
-        if not self.audio_speed_filter:
+        engine = config.settings.get('audio_speed_engine', 'wsola')
+        if engine == 'ffmpeg' and not self.audio_speed_filter:
             config.logger.warning("音频加速被跳过，因为未找到合适的FFmpeg滤镜。")
             return
 
+        jobs = []
         for it in self.queue_tts:
             target_duration_ms = int(it['final_audio_duration_theoretical'])
             current_duration_ms = it['dubb_time']
@@ -415,48 +476,86 @@ class SpeedRate:
                 if speedup_ratio < 1.01: continue
 
                 config.logger.info(
-                    f"字幕[{it['line']}]：[执行] 音频加速，倍率={speedup_ratio:.2f} (从 {current_duration_ms}ms -> {target_duration_ms}ms) 使用 {self.audio_speed_filter} 引擎。")
-
-                input_file = it['filename']
-                temp_output_file = f"{Path(input_file).parent / (Path(input_file).stem + '_temp')}.wav"
-
-                cmd = ['-y', '-i', input_file]
-
-                filter_str = ""
-                if self.audio_speed_filter == 'rubberband':
-                    filter_str = f"rubberband=tempo={speedup_ratio}"
-                elif self.audio_speed_filter == 'atempo':
-                    tempo_filters = []
-                    current_tempo = speedup_ratio
-                    while current_tempo > 4.0:
-                        tempo_filters.append("atempo=4.0")
-                        current_tempo /= 4.0
-                    if current_tempo >= 0.5:
-                        tempo_filters.append(f"atempo={current_tempo}")
-                    filter_str = ",".join(tempo_filters)
-
-                if not filter_str:
-                    config.logger.error(f"字幕[{it['line']}] 无法为倍率 {speedup_ratio:.2f} 构建有效的filter字符串，跳过变速。")
-                    continue
+                    f"字幕[{it['line']}]：[执行] 音频加速，倍率={speedup_ratio:.2f} (从 {current_duration_ms}ms -> {target_duration_ms}ms) 使用 {engine} 引擎。")
+                jobs.append((it, speedup_ratio, target_duration_ms))
 
-                target_duration_sec = target_duration_ms / 1000.0
-                cmd.extend(['-filter:a', filter_str, '-t', f'{target_duration_sec:.4f}'])
+        if not jobs:
+            return
+        if engine == 'ffmpeg':
+            for it, speedup_ratio, target_duration_ms in jobs:
+                self._ffmpeg_speedup(it, speedup_ratio, target_duration_ms)
+            return
 
-                # [修正] 确保输出是标准化的WAV
-                cmd.extend(['-ar', str(self.AUDIO_SAMPLE_RATE), '-ac', str(self.AUDIO_CHANNELS), '-c:a', 'pcm_s16le',
-                            temp_output_file])
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+            list(pool.map(lambda job: self._stretch_speedup(engine, *job), jobs))
 
-                try:
-                    if tools.runffmpeg(cmd, force_cpu=True):
-                        shutil.move(temp_output_file, input_file)
-                        it['dubb_time'] = self._get_audio_time_ms(input_file, line=it['line'])
-                        config.logger.info(f"字幕[{it['line']}] 音频变速成功，新时长: {it['dubb_time']}ms")
-                    else:
-                        raise RuntimeError("ffmpeg command failed")
-                except Exception as e:
-                    config.logger.error(f"字幕[{it['line']}]：FFmpeg音频加速失败 {it['filename']}: {e}")
-                    if Path(temp_output_file).exists():
-                        os.remove(temp_output_file)
+    def _stretch_speedup(self, engine, it, speedup_ratio, target_duration_ms):
+        """在内存中把单个配音变速到目标时长并覆盖原文件，失败时回退到ffmpeg滤镜"""
+        if self._exit(): return
+        import soundfile as sf
+        from videotrans.task._stretch import time_stretch
+
+        input_file = it['filename']
+        temp_output_file = f"{Path(input_file).parent / (Path(input_file).stem + '_temp')}.wav"
+        try:
+            samples = decode_pcm(input_file, self.AUDIO_SAMPLE_RATE, self.AUDIO_CHANNELS)
+            target_frames = int(target_duration_ms * self.AUDIO_SAMPLE_RATE / 1000)
+            stretched = time_stretch(samples, self.AUDIO_SAMPLE_RATE, target_frames, engine=engine)
+            sf.write(temp_output_file, stretched, self.AUDIO_SAMPLE_RATE, format='WAV', subtype='PCM_16')
+            shutil.move(temp_output_file, input_file)
+            tools.invalidate_probe(input_file)
+            it['dubb_time'] = int(len(stretched) * 1000 / self.AUDIO_SAMPLE_RATE)
+            config.logger.info(f"字幕[{it['line']}] 音频变速成功，新时长: {it['dubb_time']}ms")
+        except Exception as e:
+            config.logger.error(f"字幕[{it['line']}]：内存音频加速失败 {input_file}: {e}")
+            if Path(temp_output_file).exists():
+                os.remove(temp_output_file)
+            if self.audio_speed_filter:
+                self._ffmpeg_speedup(it, speedup_ratio, target_duration_ms)
+
+    def _ffmpeg_speedup(self, it, speedup_ratio, target_duration_ms):
+        """使用FFmpeg的`rubberband`或`atempo`滤镜对单个配音变速"""
+        input_file = it['filename']
+        temp_output_file = f"{Path(input_file).parent / (Path(input_file).stem + '_temp')}.wav"
+
+        cmd = ['-y', '-i', input_file]
+
+        filter_str = ""
+        if self.audio_speed_filter == 'rubberband':
+            filter_str = f"rubberband=tempo={speedup_ratio}"
+        elif self.audio_speed_filter == 'atempo':
+            tempo_filters = []
+            current_tempo = speedup_ratio
+            while current_tempo > 4.0:
+                tempo_filters.append("atempo=4.0")
+                current_tempo /= 4.0
+            if current_tempo >= 0.5:
+                tempo_filters.append(f"atempo={current_tempo}")
+            filter_str = ",".join(tempo_filters)
+
+        if not filter_str:
+            config.logger.error(f"字幕[{it['line']}] 无法为倍率 {speedup_ratio:.2f} 构建有效的filter字符串，跳过变速。")
+            return
+
+        target_duration_sec = target_duration_ms / 1000.0
+        cmd.extend(['-filter:a', filter_str, '-t', f'{target_duration_sec:.4f}'])
+
+        # [修正] 确保输出是标准化的WAV
+        cmd.extend(['-ar', str(self.AUDIO_SAMPLE_RATE), '-ac', str(self.AUDIO_CHANNELS), '-c:a', 'pcm_s16le',
+                    temp_output_file])
+
+        try:
+            if tools.runffmpeg(cmd, force_cpu=True, uuid=self.uuid):
+                shutil.move(temp_output_file, input_file)
+                tools.invalidate_probe(input_file)
+                it['dubb_time'] = self._get_audio_time_ms(input_file, line=it['line'])
+                config.logger.info(f"字幕[{it['line']}] 音频变速成功，新时长: {it['dubb_time']}ms")
+            else:
+                raise RuntimeError("ffmpeg command failed")
+        except Exception as e:
+            config.logger.error(f"字幕[{it['line']}]：FFmpeg音频加速失败 {it['filename']}: {e}")
+            if Path(temp_output_file).exists():
+                os.remove(temp_output_file)
 
     def _execute_video_processing(self):
         """
@@ -475,17 +574,21 @@ class SpeedRate:
 
         clip_meta_list = self._create_clip_meta()
 
-        for task in clip_meta_list:
-            if config.exit_soft: return None
-            # PTS > 1.01 才应用，避免浮点数误差导致不必要的处理
-            pts_param = str(task['pts']) if task.get('pts', 1.0) > 1.01 else None
-            self._cut_to_intermediate(ss=task['ss'], to=task['to'], source=self.novoice_mp4_original, pts=pts_param,
-                                      out=task['out'])
-
-            real_duration_ms = 0
-            if Path(task['out']).exists() and Path(task['out']).stat().st_size > 1024:
-                real_duration_ms = self._get_video_duration_safe(task['out'])
-
+        # 片段数不超过阈值时，用一条 filter_complex 一次解码编码生成最终无声视频，省去中间片段和二次编码
+        if self._use_filtergraph(clip_meta_list):
+            if self._render_with_filtergraph(clip_meta_list):
+                return clip_meta_list
+            if self._exit(): return None
+            config.logger.warning("单次滤镜图处理失败，回退到逐片段裁切模式。")
+
+        # 各片段的裁切和探测互不依赖，由有界线程池并发启动 ffmpeg/ffprobe 子进程
+        # pool.map 按提交顺序返回结果，保证拼接列表顺序确定
+        config.logger.info(f"并发处理 {len(clip_meta_list)} 个视频片段，同时执行数: {self.clip_workers}")
+        with ThreadPoolExecutor(max_workers=self.clip_workers) as pool:
+            real_durations = list(pool.map(self._process_clip, clip_meta_list))
+        if self._exit(): return None
+
+        for task, real_duration_ms in zip(clip_meta_list, real_durations):
             task['real_duration_ms'] = real_duration_ms
 
             if task['type'] == 'sub':
@@ -544,23 +647,116 @@ class SpeedRate:
             json.dump(clip_meta_list, f, ensure_ascii=False, indent=2)
         return clip_meta_list
 
+    def _use_filtergraph(self, clip_meta_list):
+        """片段数在高级设置 video_filtergraph_max_segments 以内时使用单次滤镜图，0=禁用"""
+        try:
+            max_segments = int(float(config.settings.get('video_filtergraph_max_segments', 300)))
+        except (TypeError, ValueError):
+            max_segments = 300
+        if not clip_meta_list or max_segments <= 0:
+            return False
+        if len(clip_meta_list) > max_segments:
+            config.logger.info(f"视频片段数 {len(clip_meta_list)} 超过单次滤镜图上限 {max_segments}，使用逐片段裁切模式。")
+            return False
+        return True
+
+    def _render_with_filtergraph(self, clip_meta_list):
+        """
+        将 clip_meta_list 构建为 split/trim/setpts/concat 滤镜图，一次解码编码生成最终无声视频。
+        片段按时间顺序且互不重叠，concat 逐个消费各分支，不会在 split 处积压帧。
+        无法逐个探测片段，真实时长按 fps 滤镜输出的帧数计算，成功返回 True
+        """
+        fps = self.source_video_fps
+        segments = []
+        for task in clip_meta_list:
+            pts = task['pts'] if task.get('pts', 1.0) > 1.01 else 1.0
+            frames = round((task['to'] - task['ss']) * pts * fps / 1000)
+            # 不足一帧的片段在逐片段模式下同样会被视为无效(<1024B)
+            task['real_duration_ms'] = int(frames * 1000 / fps) if frames > 0 else 0
+            if frames > 0:
+                segments.append((task, pts))
+        if not segments:
+            config.logger.error("没有任何有效的视频片段，视频处理失败！")
+            return False
+
+        lines = ['[0:v]split=' + str(len(segments)) + ''.join(f'[v{i}]' for i in range(len(segments)))]
+        for i, (task, pts) in enumerate(segments):
+            chain = f"[v{i}]trim=start={task['ss'] / 1000:.3f}:end={task['to'] / 1000:.3f},setpts=PTS-STARTPTS"
+            if pts > 1.0:
+                chain += f",setpts={pts}*PTS"
+            lines.append(f"{chain},fps={fps}[s{i}]")
+        lines.append(''.join(f'[s{i}]' for i in range(len(segments))) + f'concat=n={len(segments)}:v=1:a=0,format=yuv420p[vout]')
+
+        graph_path = Path(f'{self.cache_folder}/filter_graph.txt').as_posix()
+        with open(graph_path, 'w', encoding='utf-8') as f:
+            f.write(';\n'.join(lines))
+
+        final_video_path = Path(f'{self.cache_folder}/merged_{self.noextname}.mp4').as_posix()
+        video_codec = config.settings['video_codec']
+        cmd = ['-y', '-i', self.novoice_mp4_original, '-filter_complex_script', graph_path, '-map', '[vout]',
+               '-c:v', f'libx{video_codec}', '-crf', str(config.settings.get("crf", 23)), '-preset',
+               config.settings.get('preset', 'fast'), '-an', final_video_path]
+        config.logger.info(f"使用单次滤镜图处理 {len(segments)} 个视频片段: {graph_path}")
+        try:
+            tools.runffmpeg(cmd, uuid=self.uuid)
+        except Exception as e:
+            config.logger.error(f"单次滤镜图处理视频失败: {e}")
+            return False
+        if not Path(final_video_path).exists() or Path(final_video_path).stat().st_size < 1024:
+            return False
+
+        shutil.copy2(final_video_path, self.novoice_mp4)
+        tools.invalidate_probe(self.novoice_mp4)
+        config.logger.info(f"最终无声视频已成功生成并复制到: {self.novoice_mp4}")
+        for task in clip_meta_list:
+            if task['type'] == 'sub':
+                self.queue_tts[task['index']]['final_video_duration_real'] = task['real_duration_ms']
+        return True
+
+    def _process_clip(self, task):
+        """裁切单个片段并返回其物理时长(ms)，在线程池中执行"""
+        if self._exit(): return 0
+        # PTS > 1.01 才应用，避免浮点数误差导致不必要的处理
+        pts_param = str(task['pts']) if task.get('pts', 1.0) > 1.01 else None
+        self._cut_to_intermediate(ss=task['ss'], to=task['to'], source=self.novoice_mp4_original, pts=pts_param,
+                                  out=task['out'])
+
+        if Path(task['out']).exists() and Path(task['out']).stat().st_size > 1024:
+            return self._get_video_duration_safe(task['out'])
+        return 0
+
+    def _get_clip_workers(self):
+        """
+        片段并发数，高级设置 video_clip_workers 为0时按CPU核数自动决定
+        同时返回每个 ffmpeg 进程可用的编码线程数，避免多个编码进程争抢CPU
+        """
+        cpu_nums = os.cpu_count() or 2
+        try:
+            workers = int(float(config.settings.get('video_clip_workers', 0)))
+        except (TypeError, ValueError):
+            workers = 0
+        if workers <= 0:
+            workers = max(1, cpu_nums // 2)
+        workers = min(workers, cpu_nums)
+        return workers, max(1, cpu_nums // workers)
+
     def _cut_to_intermediate(self, ss, to, source, pts, out):
         """将视频片段裁切为标准化的中间格式"""
         cmd = ['-y', '-ss', tools.ms_to_time_string(ms=ss, sepflag='.'), '-to',
                tools.ms_to_time_string(ms=to, sepflag='.'), '-i', source,
                '-an', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '10',
-               '-pix_fmt', 'yuv420p', '-r', str(self.source_video_fps)]
+               '-pix_fmt', 'yuv420p', '-r', str(self.source_video_fps), '-threads', str(self.clip_threads)]
         if pts: cmd.extend(['-vf', f'setpts={pts}*PTS,fps={self.source_video_fps}'])
         cmd.append(out)
 
         config.logger.info(f"正在生成中间片段: {Path(out).name}, 原始范围: {ss}-{to}, PTS={pts or '1.0'}")
 
         try:
-            tools.runffmpeg(cmd, force_cpu=True)
+            tools.runffmpeg(cmd, force_cpu=True, uuid=self.uuid)
             if not Path(out).exists() and pts:
                 config.logger.warning(f"中间片段 {Path(out).name} 生成失败，尝试无PTS参数重试。")
                 if pts: cmd.pop(-2); cmd.pop(-2)
-                tools.runffmpeg(cmd, force_cpu=True)
+                tools.runffmpeg(cmd, force_cpu=True, uuid=self.uuid)
             if Path(out).exists():
                 st_size = Path(out).stat().st_size
                 if st_size < 1024:
@@ -590,7 +786,7 @@ class SpeedRate:
 
         intermediate_merged_path = Path(f'{self.cache_folder}/intermediate_merged.mp4').as_posix()
         concat_cmd = ['-y', '-f', 'concat', '-safe', '0', '-i', concat_txt_path, '-c', 'copy', intermediate_merged_path]
-        tools.runffmpeg(concat_cmd, force_cpu=True)
+        tools.runffmpeg(concat_cmd, force_cpu=True, uuid=self.uuid)
 
         if not Path(intermediate_merged_path).exists():
             config.logger.error("拼接后的中间视频文件未能生成，视频处理失败！")
@@ -601,10 +797,11 @@ class SpeedRate:
         finalize_cmd = ['-y', '-i', intermediate_merged_path, '-c:v', f'libx{video_codec}', '-crf',
                         str(config.settings.get("crf", 23)), '-preset', config.settings.get('preset', 'fast'), '-an',
                         final_video_path]
-        tools.runffmpeg(finalize_cmd)
+        tools.runffmpeg(finalize_cmd, uuid=self.uuid)
 
         if Path(final_video_path).exists():
             shutil.copy2(final_video_path, self.novoice_mp4)
+            tools.invalidate_probe(self.novoice_mp4)
             config.logger.info(f"最终无声视频已成功生成并复制到: {self.novoice_mp4}")
         else:
             config.logger.error("最终视频编码失败，保留原始无声视频。")
@@ -626,84 +823,61 @@ class SpeedRate:
         """
         [修正] 音频重建阶段。
         根据 `shoud_videorate` 的值，正确分发到物理时间轴或理论时间轴模型。
+        返回写好的时间轴WAV路径
         """
-        process_text = "[5/5] 生成音频片段..." if config.defaulelang == 'zh' else "[5/5] Generating audio clips..."
+        process_text = "[5/5] 生成音频时间轴..." if config.defaulelang == 'zh' else "[5/5] Building audio timeline..."
         tools.set_process(text=process_text, uuid=self.uuid)
-        config.logger.info("================== [阶段 5/5] 生成音频片段以供拼接 ==================")
+        config.logger.info("================== [阶段 5/5] 生成音频时间轴 ==================")
 
         # [关键修正] 严格根据 `shoud_videorate` 和 `clip_meta_list` 的有效性来选择路径
-        if self.shoud_videorate and clip_meta_list:
-            config.logger.info("进入物理时间轴模型（基于视频片段真实时长）构建音频。")
-            return self._recalculate_timeline_based_on_physical_video(clip_meta_list)
-        else:
-            config.logger.info("进入理论时间轴模型（基于计算偏移）构建音频。")
-            return self._recalculate_timeline_with_theoretical_offset()
+        with self._create_timeline() as timeline:
+            if self.shoud_videorate and clip_meta_list:
+                config.logger.info("进入物理时间轴模型（基于视频片段真实时长）构建音频。")
+                self._recalculate_timeline_based_on_physical_video(timeline, clip_meta_list)
+            else:
+                config.logger.info("进入理论时间轴模型（基于计算偏移）构建音频。")
+                self._recalculate_timeline_with_theoretical_offset(timeline)
+        return timeline.output if timeline.frames > 0 else None
 
-    def _recalculate_timeline_based_on_physical_video(self, clip_meta_list):
+    def _recalculate_timeline_based_on_physical_video(self, timeline, clip_meta_list):
         """
-        [新增] 基于视频片段的物理真实时长来构建音频片段列表。
+        [新增] 基于视频片段的物理真实时长来构建音频时间轴。
         此方法仅在 `shoud_videorate=True` 时被调用。
         """
-        audio_concat_list = []
-        current_timeline_ms = 0
-
-        for i, task in enumerate(clip_meta_list):
+        for task in clip_meta_list:
             task_real_duration = int(task.get('real_duration_ms', 0))
             if task_real_duration <= 0:
                 continue
 
-            clip_path = Path(self.audio_clips_folder, f"v_clip_{i:05d}.wav").as_posix()
-            segment = None
-
             if task['type'] == 'gap':
-                segment = AudioSegment.silent(duration=task_real_duration)
-                config.logger.info(f"生成物理间隙音频片段：时长 {task_real_duration}ms -> {clip_path}")
-                current_timeline_ms += task_real_duration
+                timeline.add_silence(task_real_duration)
+                config.logger.info(f"写入物理间隙静音：时长 {task_real_duration}ms")
 
             elif task['type'] == 'sub':
                 it = self.queue_tts[task['index']]
-                it['start_time'] = current_timeline_ms
+                it['start_time'] = timeline.duration_ms
                 it['end_time'] = it['start_time'] + it['dubb_time']
                 it['startraw'], it['endraw'] = tools.ms_to_time_string(ms=it['start_time']), tools.ms_to_time_string(
                     ms=it['end_time'])
                 config.logger.info(
                     f"字幕[{it['line']}] 字幕时间精确化：新区间 {it['start_time']}-{it['end_time']} (配音时长 {it['dubb_time']}ms)")
 
-                # 创建一个与视频片段等长的静音画布
-                base_segment = AudioSegment.silent(duration=task_real_duration)
-
-                if tools.vail_file(it['filename']):
-                    try:
-                        audio_clip = AudioSegment.from_file(it['filename'])
-                        # 将配音叠加到静音画布的开头
-                        segment = base_segment.overlay(audio_clip)
-                    except Exception as e:
-                        config.logger.error(f"字幕[{it['line']}] 加载音频失败: {e}，使用等长静音替代。")
-                        segment = base_segment
+                # 配音放在与视频片段等长的画布开头，不存在或加载失败时写入等长静音
+                samples = self._load_dubbing(timeline, it)
+                if samples is None:
+                    timeline.add_silence(task_real_duration)
                 else:
-                    config.logger.warning(f"字幕[{it['line']}] 配音文件不存在，使用等长静音替代。")
-                    segment = base_segment
-
-                current_timeline_ms += task_real_duration
-                config.logger.info(f"字幕[{it['line']}] 音频流重建：生成片段，时长 {task_real_duration}ms -> {clip_path}")
+                    timeline.add_clip(samples, canvas_ms=task_real_duration)
+                config.logger.info(f"字幕[{it['line']}] 音频流重建：写入片段，时长 {task_real_duration}ms")
 
-            if segment:
-                # [核心修正] 导出前统一所有片段的参数
-                self._standardize_audio_segment(segment).export(clip_path, format="wav")
-                audio_concat_list.append(clip_path)
-
-        return audio_concat_list
-
-    def _recalculate_timeline_with_theoretical_offset(self):
+    def _recalculate_timeline_with_theoretical_offset(self, timeline):
         """
-        [修正] 备用方法：当不处理视频时，生成基于理论 time_offset 的音频片段列表。
+        [修正] 备用方法：当不处理视频时，基于理论 time_offset 构建音频时间轴。
         修正了时间轴计算的逻辑错误，避免不正确的静音累积。
         """
-        audio_concat_list = []
         time_offset = 0
-        current_timeline_ms = 0
 
-        for i, it in enumerate(self.queue_tts):
+        for it in self.queue_tts:
             target_start_time = it['start_time_source'] + time_offset
 
             it['start_time'] = target_start_time
@@ -713,15 +887,10 @@ class SpeedRate:
             config.logger.info(
                 f"字幕[{it['line']}] 字幕时间精确化：新区间 {it['start_time']}-{it['end_time']} (配音时长 {it['dubb_time']}ms)")
 
-            silence_needed = max(0, target_start_time - current_timeline_ms)
+            silence_needed = max(0, target_start_time - timeline.duration_ms)
 
             if silence_needed > self.MIN_CLIP_DURATION_MS:
-                silence_path = Path(self.audio_clips_folder, f"t_clip_{i:05d}_silence.wav").as_posix()
-                # [修正] 标准化
-                silent_segment = AudioSegment.silent(duration=silence_needed)
-                self._standardize_audio_segment(silent_segment).export(silence_path, format="wav")
-                audio_concat_list.append(silence_path)
-                current_timeline_ms += silence_needed
+                timeline.add_silence(silence_needed)
                 config.logger.info(f"理论模式：字幕[{it['line']}]前插入静音 {silence_needed}ms")
 
             final_segment_duration = int(it['final_audio_duration_theoretical'])
@@ -729,41 +898,22 @@ class SpeedRate:
                 time_offset += (final_segment_duration - it['source_duration'])
                 continue
 
-            # 创建一个目标时长的静音画布
-            base_segment = AudioSegment.silent(duration=final_segment_duration)
-            segment = base_segment
-            if tools.vail_file(it['filename']):
-                try:
-                    audio_clip = AudioSegment.from_file(it['filename'])
-                    # 叠加配音
-                    segment = base_segment.overlay(audio_clip)
-                except Exception as e:
-                    config.logger.error(f"字幕[{it['line']}] 加载音频失败: {e}，使用等长静音替代。")
+            # 配音放在目标时长的画布开头
+            samples = self._load_dubbing(timeline, it)
+            if samples is None:
+                timeline.add_silence(final_segment_duration)
             else:
-                config.logger.warning(f"字幕[{it['line']}] 配音文件不存在，使用等长静音替代。")
+                timeline.add_clip(samples, canvas_ms=final_segment_duration)
 
-            clip_path = Path(self.audio_clips_folder, f"t_clip_{i:05d}_sub.wav").as_posix()
-            # [修正] 标准化
-            self._standardize_audio_segment(segment).export(clip_path, format="wav")
-            audio_concat_list.append(clip_path)
-
-            current_timeline_ms += final_segment_duration
             time_offset += (final_segment_duration - it['source_duration'])
-            config.logger.info(f"理论模式：字幕[{it['line']}]生成片段，时长 {final_segment_duration}ms，累积时间偏移 {time_offset}ms")
+            config.logger.info(f"理论模式：字幕[{it['line']}]写入片段，时长 {final_segment_duration}ms，累积时间偏移 {time_offset}ms")
 
         # 理论模式下的最终视频时长
         final_video_duration = self.raw_total_time + time_offset
-        final_gap = final_video_duration - current_timeline_ms
+        final_gap = final_video_duration - timeline.duration_ms
         if final_gap > self.MIN_CLIP_DURATION_MS:
-            # final_gap_path = Path(self.audio_clips_folder, "t_clip_zzzz_final_gap.wav").as_posix()
-            final_gap_path = Path(self.audio_clips_folder, "t_clip_zzzz_final_gap.wav").as_posix()
-            # [修正] 标准化
-            silent_segment = AudioSegment.silent(duration=final_gap)
-            self._standardize_audio_segment(silent_segment).export(final_gap_path, format="wav")
-            audio_concat_list.append(final_gap_path)
+            timeline.add_silence(final_gap)
             config.logger.info(f"理论模式：末尾添加静音 {final_gap}ms")
-        config.logger.info(f"{audio_concat_list=}")
-        return audio_concat_list
 
     def _get_video_duration_safe(self, file_path):
         """
@@ -783,17 +933,17 @@ class SpeedRate:
             config.logger.error(f"探测视频时长时发生严重错误: {e}。文件 -> {file_path}。将视其时长为0。")
             return 0
 
-    def _finalize_files(self, audio_concat_list):
+    def _finalize_files(self, merged_wav):
         """
-        负责使用FFmpeg拼接音频片段列表，并执行最后的音视频对齐检查。
+        负责将时间轴WAV转为目标格式，并执行最后的音视频对齐检查。
         """
         final_step_text = "[最终步骤] 拼接音频并对齐..." if config.defaulelang == 'zh' else '[Final Step] Concatenating audio and finalizing...'
         tools.set_process(text=final_step_text, uuid=self.uuid)
         config.logger.info("================== [最终步骤] 拼接音频、对齐并交付 ==================")
 
         try:
-            # 初始拼接
-            self._ffmpeg_concat_audio(audio_concat_list, self.target_audio)
+            # 时间轴WAV转为目标格式
+            self._export_timeline_audio(merged_wav, self.target_audio)
 
             if not tools.vail_file(self.target_audio):
                 raise RuntimeError(f"音频拼接失败，最终文件未生成: {self.target_audio}")
@@ -834,8 +984,9 @@ class SpeedRate:
                         cmd.extend(["-c:a", "libmp3lame", "-q:a", "2"])
                     cmd.append(padded_audio_path)
 
-                    if tools.runffmpeg(cmd) and tools.vail_file(padded_audio_path):
+                    if tools.runffmpeg(cmd, uuid=self.uuid) and tools.vail_file(padded_audio_path):
                         shutil.move(padded_audio_path, self.target_audio)
+                        tools.invalidate_probe(self.target_audio)
                         config.logger.info("音频补齐静音并重新导出完成。")
                     else:
                         config.logger.error("使用apad滤镜填充静音失败！")
@@ -853,8 +1004,9 @@ class SpeedRate:
                            '-preset', config.settings.get('preset', 'fast'),
                            '-an', final_video_path]
 
-                    if tools.runffmpeg(cmd, force_cpu=True) and Path(final_video_path).exists():
+                    if tools.runffmpeg(cmd, force_cpu=True, uuid=self.uuid) and Path(final_video_path).exists():
                         shutil.copy2(final_video_path, self.novoice_mp4)
+                        tools.invalidate_probe(self.novoice_mp4)
                         config.logger.info("视频定格延长操作成功。")
                     else:
                         config.logger.error("视频定格延长操作失败！音视频可能存在时长不一致。")
@@ -891,74 +1043,34 @@ class SpeedRate:
             config.logger.error(f"字幕[{line or 'N/A'}]：获取音频文件 {file_path} 时长失败: {e}")
             return 0
 
-    def _ffmpeg_concat_audio(self, file_list, output_path):
+    def _export_timeline_audio(self, merged_wav, output_path):
         """
-        [核心修正] 使用混合拼接法来健壮地拼接大量音频文件，以规避Windows命令行长度限制。
-        步骤1: 使用concat demuxer + 重新编码，生成一个临时的、干净的WAV文件。
-        步骤2: 将这个临时的WAV文件转码为最终的目标格式。
+        将时间轴WAV转为最终的目标格式，目标为wav时直接复制，完成后删除临时WAV。
         """
-        if not file_list:
-            config.logger.warning("音频拼接列表为空，无法生成最终音频。")
+        if not tools.vail_file(merged_wav):
+            config.logger.warning("音频时间轴文件不存在，无法生成最终音频。")
             return
 
-        concat_txt_path = Path(f'{self.cache_folder}/audio_clips/audio_concat_list.txt').as_posix()
-        temp_wav_output = Path(f'{self.cache_folder}/temp_concatenated.wav').as_posix()
-
         try:
-            # 步骤1: 使用concat demuxer进行稳定的拼接
-            config.logger.info(f"混合拼接步骤1: 创建包含 {len(file_list)} 个文件的拼接列表。{concat_txt_path=}")
-            tools.create_concat_txt(file_list, concat_txt=concat_txt_path)
-            if not Path(concat_txt_path).exists():
-                raise RuntimeError(f"No {concat_txt_path}")
-
-            cmd_step1 = [
-                "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", concat_txt_path,
-                "-c:a", "pcm_s16le",
-                "-ar", str(self.AUDIO_SAMPLE_RATE),
-                "-ac", str(self.AUDIO_CHANNELS),
-                temp_wav_output
-            ]
-            config.logger.info(f"混合拼接步骤1: 正在将列表拼接并重新编码为临时WAV文件: {temp_wav_output}")
-            tools.runffmpeg(cmd_step1, force_cpu=True)
-            os.chdir(config.ROOT_DIR)
-
-            if not tools.vail_file(temp_wav_output):
-                config.logger.error(f"音频拼接失败，临时文件 {temp_wav_output} 未生成。")
-                return
-
-            # 步骤2: 将拼接好的临时WAV转码为最终格式
-            config.logger.info(f"混合拼接步骤2: 正在将临时WAV转码为最终格式: {output_path}")
-            cmd_step2 = ["-y", "-i", temp_wav_output]
-
             ext = Path(output_path).suffix.lower()
             if ext == '.wav':
-                # 如果目标就是wav，直接复制即可
-                cmd_step2.extend(["-c:a", "copy"])
-            elif ext == '.m4a':
-                cmd_step2.extend(["-c:a", "aac", "-b:a", "128k"])
-            else:  # 默认mp3
-                cmd_step2.extend(["-c:a", "libmp3lame", "-q:a", "2"])
-
-            cmd_step2.append(str(output_path))
-            if ext == '.wav' and output_path[-4:] == '.wav':
                 try:
-                    shutil.copy2(temp_wav_output, output_path)
+                    shutil.copy2(merged_wav, output_path)
                 except shutil.SameFileError:
                     pass
-            else:
-                tools.runffmpeg(cmd_step2, force_cpu=True)
+                return
 
+            config.logger.info(f"正在将时间轴WAV转码为最终格式: {output_path}")
+            cmd = ["-y", "-i", merged_wav]
+            if ext == '.m4a':
+                cmd.extend(["-c:a", "aac", "-b:a", "128k"])
+            else:  # 默认mp3
+                cmd.extend(["-c:a", "libmp3lame", "-q:a", "2"])
+            cmd.append(str(output_path))
+            tools.runffmpeg(cmd, force_cpu=True, uuid=self.uuid)
         finally:
-            pass
-            # 清理临时文件
             try:
-                if Path(concat_txt_path).exists():
-                    os.remove(concat_txt_path)
-                if Path(temp_wav_output).exists():
-                    os.remove(temp_wav_output)
-                config.logger.info("已清理音频拼接临时文件。")
+                if Path(merged_wav).exists() and Path(merged_wav).as_posix() != Path(output_path).as_posix():
+                    os.remove(merged_wav)
             except Exception as e:
-                config.logger.warning(f"清理音频拼接临时文件失败: {e}")
+                config.logger.warning(f"清理音频时间轴临时文件失败: {e}")
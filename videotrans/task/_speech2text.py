@@ -16,6 +16,7 @@ from videotrans.util import tools
 
 @dataclass
 class SpeechToText(BaseTask):
+    cancel_scope = 'box_recogn'
     # 输出的识别结果格式 ，srt txt 等
     out_format: str = field(init=False)
     # 在这个子类中，shoud_recogn 总是 True，我们直接在定义中声明。
@@ -129,7 +130,7 @@ class SpeechToText(BaseTask):
                 f.write(content)
             self.cfg['target_sub'] = self.cfg['target_sub'][:-3] + 'txt'
         elif self.out_format != 'srt':
-            tools.runffmpeg(['-y', '-i', self.cfg['target_sub'], self.cfg['target_sub'][:-3] + self.out_format])
+            tools.runffmpeg(['-y', '-i', self.cfg['target_sub'], self.cfg['target_sub'][:-3] + self.out_format], uuid=self.uuid)
             Path(self.cfg['target_sub']).unlink(missing_ok=True)
             self.cfg['target_sub'] = self.cfg['target_sub'][:-3] + self.out_format
 
@@ -141,8 +142,3 @@ class SpeechToText(BaseTask):
                 shutil.copy2(self.cfg['target_sub'], f'{p.parent.as_posix()}/{p.stem}.{self.out_format}')
         except:
             pass
-
-    def _exit(self):
-        if config.exit_soft or config.box_recogn != 'ing':
-            return True
-        return False
@@ -0,0 +1,84 @@
+# 内存中的音频变速，供 SpeedRate 对配音片段加速使用
+# wsola: 纯 NumPy 实现的 WSOLA 算法，保持音高不变，无外部依赖
+# pyrubberband: 安装了 pyrubberband 及 rubberband 命令行时可用，音质更好
+import numpy as np
+
+from videotrans.configure import config
+
+# 每帧约23ms，语音变速常用的窗口长度
+FRAME_SIZE = 1024
+# 相邻帧寻找最佳拼接位置的搜索范围(采样点)
+TOLERANCE = 256
+
+
+def time_stretch(samples, sample_rate, target_frames, engine='wsola'):
+    """
+    将 (帧数, 声道数) 的 int16 数组变速到恰好 target_frames 帧，音高不变。
+    返回的数组长度严格等于 target_frames，调用方无需再探测时长。
+    engine 为 pyrubberband 但不可用时回退到 wsola
+    """
+    if target_frames <= 0 or len(samples) == 0:
+        return np.zeros((max(0, target_frames), samples.shape[1]), dtype=np.int16)
+
+    rate = len(samples) / target_frames
+    x = samples.astype(np.float32) / 32768.0
+    y = None
+    if engine == 'pyrubberband':
+        try:
+            import pyrubberband
+            y = pyrubberband.time_stretch(x, sample_rate, rate)
+        except Exception as e:
+            config.logger.warning(f"pyrubberband 变速失败，改用 wsola: {e}")
+    if y is None:
+        y = _wsola(x, rate)
+
+    y = _fit_length(y, target_frames)
+    return (np.clip(y, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def _fit_length(y, frames):
+    if len(y) >= frames:
+        return y[:frames]
+    return np.concatenate([y, np.zeros((frames - len(y), y.shape[1]), dtype=y.dtype)])
+
+
+def _wsola(x, rate):
+    """
+    WSOLA(Waveform Similarity Overlap-Add)：以固定输出步长叠加汉宁窗帧，
+    每帧在名义读取位置附近 ±TOLERANCE 内寻找与上一帧自然延续最相似的位置，避免相位断裂
+    """
+    frame = FRAME_SIZE
+    hop_out = frame // 2
+    hop_in = hop_out * rate
+    out_len = int(len(x) / rate)
+    n_frames = out_len // hop_out + 1
+
+    # 前后填充，保证搜索窗口和最后一帧都不越界
+    pad = TOLERANCE + frame
+    xp = np.concatenate([np.zeros((pad, x.shape[1]), dtype=x.dtype), x,
+                         np.zeros((pad + int(hop_in) + frame, x.shape[1]), dtype=x.dtype)])
+    mono = xp.mean(axis=1)
+    window = np.hanning(frame).astype(np.float32)
+
+    y = np.zeros((n_frames * hop_out + frame, x.shape[1]), dtype=np.float32)
+    norm = np.zeros(n_frames * hop_out + frame, dtype=np.float32)
+
+    delta = 0
+    for k in range(n_frames):
+        pos = pad + int(k * hop_in) + delta
+        o = k * hop_out
+        y[o:o + frame] += xp[pos:pos + frame] * window[:, None]
+        norm[o:o + frame] += window
+
+        # 上一帧自然延续的波形作为模板，在下一名义位置附近寻找最相似的起点
+        template = mono[pos + hop_out:pos + hop_out + frame]
+        nominal = pad + int((k + 1) * hop_in)
+        region = mono[nominal - TOLERANCE:nominal + TOLERANCE + frame]
+        if len(region) < frame + 2 * TOLERANCE or not template.any():
+            delta = 0
+            continue
+        delta = int(np.argmax(np.correlate(region, template, mode='valid'))) - TOLERANCE
+
+    norm[norm < 1e-6] = 1.0
+    y /= norm[:, None]
+    return y[:out_len]
@@ -15,6 +15,7 @@ from videotrans.util import tools
 
 @dataclass
 class TranslateSrt(BaseTask):
+    cancel_scope = 'box_trans'
     # 输出格式，例如单语字幕 双语字幕等。
     out_format: int = field(init=False)
     # 在这个子类中，shoud_trans 总是 True，我们直接在定义中声明这一点。
@@ -93,7 +94,3 @@ class TranslateSrt(BaseTask):
                 Path(self.cfg['shound_del_name']).unlink(missing_ok=True)
         except:
             pass
-    def _exit(self):
-        if config.exit_soft or config.box_trans != 'ing':
-            return True
-        return False
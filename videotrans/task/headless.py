@@ -0,0 +1,315 @@
+"""
+无界面运行视频翻译任务，不导入 PySide6
+
+由 JSON 任务描述创建 TransCreate 并投入 job.py 的各阶段队列，进度消息从 config.uuid_logs_queue 读取后保存在任务记录中。
+任务描述示例，未填写的项使用软件中上次保存的设置(params.json):
+    {
+        "name": "/data/1.mp4",
+        "target_dir": "/data/out",
+        "source_language": "en",
+        "target_language": "zh-cn",
+        "translate_type": 0,
+        "tts_type": 0,
+        "voice_role": "zh-CN-YunxiNeural",
+        "subtitle_type": 1
+    }
+HTTP 接口见 serve()，同一进程内可连续处理多个任务，识别模型和各类缓存保持常驻。
+"""
+import copy
+import json
+import threading
+import time
+from pathlib import Path
+from queue import Empty
+
+from videotrans.configure import config, _task_state
+from videotrans.util import tools
+
+# 可在任务描述中设置的参数，其余同界面中的设置
+JOB_KEYS = [
+    'translate_type', 'source_language', 'target_language', 'tts_type', 'voice_role', 'volume', 'pitch',
+    'recogn_type', 'model_name', 'split_type', 'subtitle_type', 'voice_rate', 'voice_autorate', 'video_autorate',
+    'is_separate', 'cuda', 'back_audio', 'only_video', 'clear_cache', 'remove_noise', 'paraformer_spk', 'app_mode',
+    'subtitles'
+]
+# 每个任务保留的最近消息条数
+MAX_EVENTS = 2000
+# 已结束(succeed/error/stop)的任务保留的秒数和最多保留个数，超出后从内存中移除，长期运行的服务内存不会持续增长
+FINISHED_TTL = 3600
+MAX_FINISHED = 200
+
+
+class JobManager:
+    """
+    保存所有任务的状态和消息，status: ing 执行中 succeed 完成 error 出错 stop 已取消
+    已结束的任务按 FINISHED_TTL 和 MAX_FINISHED 清理
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.lock = threading.Condition()
+        self._started = False
+
+    def start(self):
+        """启动各阶段工作线程和消息读取线程，只执行一次"""
+        with self.lock:
+            if self._started:
+                return
+            self._started = True
+        from videotrans.task.job import start_thread
+        config.exec_mode = 'api'
+        start_thread()
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def submit(self, spec: dict) -> str:
+        """创建任务并投入预处理队列，返回任务 uuid"""
+        from videotrans.task.trans_create import TransCreate
+        name = spec.get('name')
+        if not name or not Path(name).is_file():
+            raise ValueError(f'File not exists: {name}')
+        self.start()
+        name = Path(name).resolve().as_posix()
+        target_dir = spec.get('target_dir') or Path(name).parent.as_posix() + "/_video_out"
+        target_dir = Path(target_dir).resolve().as_posix()
+
+        cfg = {
+            "volume": "+0%",
+            "pitch": "+0Hz",
+            "app_mode": "biaozhun",
+            "subtitles": "",
+            "clear_cache": False,
+        }
+        cfg.update({k: config.params[k] for k in JOB_KEYS if k in config.params})
+        cfg.update({k: v for k, v in spec.items() if k in JOB_KEYS})
+        try:
+            voice_rate = int(str(cfg.get('voice_rate', 0)).replace('%', '').strip() or 0)
+            cfg['voice_rate'] = f"+{voice_rate}%" if voice_rate >= 0 else f"{voice_rate}%"
+        except ValueError:
+            cfg['voice_rate'] = '+0%'
+        cfg['target_dir'] = target_dir
+
+        obj = tools.format_video(name, target_dir)
+        if cfg['clear_cache'] and Path(obj['target_dir']).is_dir():
+            import shutil
+            shutil.rmtree(obj['target_dir'], ignore_errors=True)
+        Path(obj['target_dir']).mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            self.jobs[obj['uuid']] = {
+                "uuid": obj['uuid'],
+                "name": name,
+                "target_dir": obj['target_dir'],
+                "status": "ing",
+                "precent": 0,
+                "text": "",
+                "created": time.time(),
+                "finished": 0,
+                "events": [],
+                "seq": 0
+            }
+        try:
+            trk = TransCreate(cfg=copy.deepcopy(cfg), obj=obj)
+        except Exception as e:
+            self._finish(obj['uuid'], 'error', str(e))
+            raise
+        tools.set_process(text=config.transobj['kaishichuli'], uuid=obj['uuid'])
+        config.prepare_queue.append(trk)
+        return obj['uuid']
+
+    def status(self, uuid=None):
+        """返回单个任务或全部任务的状态，不含消息列表"""
+        with self.lock:
+            if uuid is not None:
+                job = self.jobs.get(uuid)
+                return {k: v for k, v in job.items() if k != 'events'} if job else None
+            return [{k: v for k, v in job.items() if k != 'events'} for job in self.jobs.values()]
+
+    def events(self, uuid, since=0, timeout=None):
+        """
+        返回序号大于 since 的消息，没有新消息且任务未结束时最多等待 timeout 秒
+        """
+        with self.lock:
+            job = self.jobs.get(uuid)
+            if not job:
+                return None
+            if timeout and job['seq'] <= since and job['status'] == 'ing':
+                self.lock.wait(timeout)
+            return [e for e in job['events'] if e['seq'] > since]
+
+    def cancel(self, uuid) -> bool:
+        with self.lock:
+            job = self.jobs.get(uuid)
+            if not job or job['status'] != 'ing':
+                return False
+        # 只停止该任务，并结束其正在运行的 ffmpeg
+        _task_state.cancel(uuid)
+        self._finish(uuid, 'stop', 'cancelled')
+        return True
+
+    def is_done(self):
+        with self.lock:
+            return all(job['status'] != 'ing' for job in self.jobs.values())
+
+    def _add_event(self, uuid, data):
+        job = self.jobs.get(uuid)
+        if not job:
+            return
+        job['seq'] += 1
+        job['events'].append({"seq": job['seq'], "type": data.get('type'), "text": data.get('text', '')})
+        del job['events'][:-MAX_EVENTS]
+        if data.get('type') == 'set_precent':
+            # 格式为 状态文字???进度
+            text, _, precent = data.get('text', '').rpartition('???')
+            job['text'] = text
+            try:
+                job['precent'] = min(100, float(precent))
+            except ValueError:
+                pass
+        elif data.get('type') == 'logs':
+            job['text'] = data.get('text', '')
+        self.lock.notify_all()
+
+    def _finish(self, uuid, status, text):
+        config.stoped_uuid_set.add(uuid)
+        config.uuid_logs_queue.pop(uuid, None)
+        with self.lock:
+            job = self.jobs.get(uuid)
+            if not job or job['status'] != 'ing':
+                return
+            job['status'] = status
+            job['text'] = text
+            job['finished'] = time.time()
+            if status == 'succeed':
+                job['precent'] = 100
+            self._add_event(uuid, {"type": status, "text": text})
+            self._evict()
+
+    def _evict(self):
+        """移除超过保留时长或超出保留个数的已结束任务，调用时需持有 self.lock"""
+        finished = sorted((job['finished'], uuid) for uuid, job in self.jobs.items() if job['status'] != 'ing')
+        expire = time.time() - FINISHED_TTL
+        for i, (finished_time, uuid) in enumerate(finished):
+            if finished_time < expire or i < len(finished) - MAX_FINISHED:
+                del self.jobs[uuid]
+
+    def _pump(self):
+        """读取各任务的消息队列"""
+        while not config.exit_soft:
+            got = False
+            with self.lock:
+                active = [uuid for uuid, job in self.jobs.items() if job['status'] == 'ing']
+            for uuid in active:
+                q = config.uuid_logs_queue.get(uuid)
+                if q is None or isinstance(q, str):
+                    continue
+                while True:
+                    try:
+                        data = q.get_nowait()
+                    except Empty:
+                        break
+                    got = True
+                    if data.get('type') in ['succeed', 'error']:
+                        self._finish(uuid, data['type'], data.get('text', ''))
+                        break
+                    with self.lock:
+                        self._add_event(uuid, data)
+            if not got:
+                with self.lock:
+                    self._evict()
+                time.sleep(0.2)
+
+
+manager = JobManager()
+
+
+def run_jobs(specs, *, out=print):
+    """依次提交任务并等待全部结束，打印进度，全部成功返回 True"""
+    uuids = [manager.submit(spec) for spec in specs]
+    seen = {uuid: 0 for uuid in uuids}
+    # 结束状态在读到消息时记录，任务记录之后被清理也不影响结果
+    results = {}
+    while True:
+        for uuid in uuids:
+            for e in manager.events(uuid, seen[uuid]) or []:
+                seen[uuid] = e['seq']
+                if e['type'] in ['logs', 'succeed', 'error', 'stop']:
+                    out(f"[{uuid}] {e['type']}: {e['text']}")
+                if e['type'] in ['succeed', 'error', 'stop']:
+                    results[uuid] = e['type']
+        if manager.is_done():
+            break
+        time.sleep(0.5)
+    return all(results.get(uuid) == 'succeed' for uuid in uuids)
+
+
+def create_app():
+    """
+    HTTP 任务接口
+    POST /jobs                 提交任务，请求体为任务描述或 {"jobs": [任务描述,...]}
+    GET  /jobs                 全部任务状态
+    GET  /jobs/<uuid>          单个任务状态
+    GET  /jobs/<uuid>/events   text/event-stream 推送进度消息，?since=序号 从指定消息之后开始
+    POST /jobs/<uuid>/cancel   取消任务
+    """
+    from flask import Flask, Response, jsonify, request
+
+    app = Flask(__name__)
+
+    @app.post('/jobs')
+    def submit():
+        data = request.get_json(silent=True) or {}
+        specs = data['jobs'] if isinstance(data.get('jobs'), list) else [data]
+        try:
+            uuids = [manager.submit(spec) for spec in specs]
+        except Exception as e:
+            return jsonify({"code": 1, "msg": str(e)}), 400
+        return jsonify({"code": 0, "uuids": uuids})
+
+    @app.get('/jobs')
+    def job_list():
+        return jsonify({"code": 0, "jobs": manager.status()})
+
+    @app.get('/jobs/<uuid>')
+    def job_status(uuid):
+        job = manager.status(uuid)
+        if job is None:
+            return jsonify({"code": 1, "msg": "not found"}), 404
+        return jsonify({"code": 0, "job": job})
+
+    @app.get('/jobs/<uuid>/events')
+    def job_events(uuid):
+        if manager.status(uuid) is None:
+            return jsonify({"code": 1, "msg": "not found"}), 404
+        since = request.args.get('since', 0, type=int)
+
+        def stream():
+            seq = since
+            while True:
+                events = manager.events(uuid, seq, timeout=15)
+                # 任务记录已被清理
+                if events is None:
+                    return
+                for e in events:
+                    seq = e['seq']
+                    yield f"id: {seq}\ndata: {json.dumps(e, ensure_ascii=False)}\n\n"
+                job = manager.status(uuid)
+                if job is None or job['status'] != 'ing' and not manager.events(uuid, seq):
+                    return
+                # 保持连接
+                yield ": ping\n\n"
+
+        return Response(stream(), mimetype='text/event-stream', headers={"Cache-Control": "no-cache"})
+
+    @app.post('/jobs/<uuid>/cancel')
+    def job_cancel(uuid):
+        if not manager.cancel(uuid):
+            return jsonify({"code": 1, "msg": "not found or already finished"}), 404
+        return jsonify({"code": 0})
+
+    return app
+
+
+def serve(host='127.0.0.1', port=9011, threads=16):
+    from waitress import serve as waitress_serve
+    manager.start()
+    config.logger.info(f'HTTP job API listening on http://{host}:{port}')
+    waitress_serve(create_app(), host=host, port=port, threads=threads)
@@ -1,7 +1,8 @@
-import time
+from queue import Empty
 from threading import Thread
 
 from videotrans.configure import config
+from videotrans.configure._task_state import TaskCancelled
 from videotrans.task._base import BaseTask
 from videotrans.util.tools import set_process
 import traceback
@@ -42,188 +43,170 @@ assemb_queue
 """
 
 
-class WorkerPrepare(Thread):
+class StageWorker(Thread):
+    """
+    流水线阶段工作线程基类
+    阻塞等待所属阶段队列，任务入队后立即被唤醒处理，同一阶段可启动多个线程并发处理不同任务
+    """
+    # 阶段队列在 config 上的名字
+    queue_name = ''
+    # 出错时的提示文字 key
+    error_key = ''
+    # 阻塞等待的最长秒数，仅用于及时响应软件退出
+    wait_sec = 1
+
     def __init__(self, *, parent=None):
         super().__init__()
 
+    # 执行当前阶段并将任务投递到下一阶段队列
+    def process(self, trk: BaseTask):
+        raise NotImplementedError
+
+    # 附加在错误信息后的渠道名称
+    def _error_suffix(self, trk: BaseTask):
+        return ''
+
+    def _error_text(self, trk: BaseTask, except_msg: str):
+        return f'{config.transobj[self.error_key]}:{except_msg}{self._error_suffix(trk)}:\n' + traceback.format_exc()
+
     def run(self) -> None:
+        stage_queue = getattr(config, self.queue_name)
         while 1:
             if config.exit_soft:
                 return
-            if len(config.prepare_queue) < 1:
-                time.sleep(0.5)
-                continue
             try:
-                trk: BaseTask = config.prepare_queue.pop(0)
-            except:
+                trk: BaseTask = stage_queue.get(timeout=self.wait_sec)
+            except Empty:
                 continue
             if task_is_stop(trk.uuid):
                 continue
             try:
-
-                trk.prepare()
-                # 如果需要识别，则插入 recogn_queue队列，否则继续判断翻译队列、配音队列，都不吻合则插入最终队列
-                if trk.shoud_recogn:
-                    config.regcon_queue.append(trk)
-                elif trk.shoud_trans:
-                    config.trans_queue.append(trk)
-                elif trk.shoud_dubbing:
-                    config.dubb_queue.append(trk)
-                else:
-                    config.assemb_queue.append(trk)
+                self.process(trk)
+            except TaskCancelled:
+                config.logger.info(f'任务已取消 {trk.uuid}')
             except Exception as e:
                 from videotrans.configure._except import get_msg_from_except
-                except_msg=get_msg_from_except(e)
+                except_msg = get_msg_from_except(e)
                 config.logger.exception(e, exc_info=True)
-                set_process(text=f'{config.transobj["yuchulichucuo"]}:{except_msg}:\n' + traceback.format_exc(), type='error', uuid=trk.uuid)
+                if trk.token is not None:
+                    trk.token.status = 'error'
+                set_process(text=self._error_text(trk, except_msg), type='error', uuid=trk.uuid)
+
+
+class WorkerPrepare(StageWorker):
+    queue_name = 'prepare_queue'
+    error_key = 'yuchulichucuo'
+
+    def process(self, trk):
+        trk.prepare()
+        # 如果需要识别，则插入 recogn_queue队列，否则继续判断翻译队列、配音队列，都不吻合则插入最终队列
+        if trk.shoud_recogn:
+            config.regcon_queue.append(trk)
+        elif trk.shoud_trans:
+            config.trans_queue.append(trk)
+        elif trk.shoud_dubbing:
+            config.dubb_queue.append(trk)
+        else:
+            config.assemb_queue.append(trk)
 
 
-class WorkerRegcon(Thread):
-    def __init__(self, *, parent=None):
-        super().__init__()
+class WorkerRegcon(StageWorker):
+    queue_name = 'regcon_queue'
+    error_key = 'shibiechucuo'
 
-    def run(self) -> None:
-        while 1:
-            if config.exit_soft:
-                return
+    def process(self, trk):
+        trk.recogn()
+        # 如果需要识翻译,则插入翻译队列，否则就行判断配音队列，都不吻合则插入最终队列
+        if trk.shoud_trans:
+            config.trans_queue.append(trk)
+        elif trk.shoud_dubbing:
+            config.dubb_queue.append(trk)
+        else:
+            config.assemb_queue.append(trk)
 
-            if len(config.regcon_queue) < 1:
-                time.sleep(0.5)
-                continue
-            trk = config.regcon_queue.pop(0)
-            if task_is_stop(trk.uuid):
-                continue
-            try:
-                trk.recogn()
-                # 如果需要识翻译,则插入翻译队列，否则就行判断配音队列，都不吻合则插入最终队列
-                if trk.shoud_trans:
-                    config.trans_queue.append(trk)
-                elif trk.shoud_dubbing:
-                    config.dubb_queue.append(trk)
-                else:
-                    config.assemb_queue.append(trk)
-            except Exception as e:
-                from videotrans.configure._except import get_msg_from_except
-                except_msg=get_msg_from_except(e)
-                config.logger.exception(e, exc_info=True)
-                if trk.cfg.get('recogn_type') is not None:
-                    except_msg+=f"[{get_recogn_type(trk.cfg.get('recogn_type'))}]"
-                set_process(text=f'{config.transobj["shibiechucuo"]}:{except_msg}:\n' + traceback.format_exc(), type='error', uuid=trk.uuid)
+    def _error_suffix(self, trk):
+        if trk.cfg.get('recogn_type') is not None:
+            return f"[{get_recogn_type(trk.cfg.get('recogn_type'))}]"
+        return ''
 
 
-class WorkerTrans(Thread):
-    def __init__(self, *, parent=None):
-        super().__init__()
+class WorkerTrans(StageWorker):
+    queue_name = 'trans_queue'
+    error_key = 'fanyichucuo'
 
-    def run(self) -> None:
-        while 1:
-            if config.exit_soft:
-                return
-            if len(config.trans_queue) < 1:
-                time.sleep(0.5)
-                continue
-            trk = config.trans_queue.pop(0)
-            if task_is_stop(trk.uuid):
-                continue
-            try:
-                trk.trans()
-                # 如果需要配音，则插入 dubb_queue 队列，否则插入最终队列
-                if trk.shoud_dubbing:
-                    config.dubb_queue.append(trk)
-                else:
-                    config.assemb_queue.append(trk)
-            except Exception as e:
-                from videotrans.configure._except import get_msg_from_except
-                except_msg=get_msg_from_except(e)
-                if trk.cfg.get('translate_type') is not None:
-                    except_msg+=f"[{get_tanslate_type(trk.cfg.get('translate_type'))}]"
-                msg = f'{config.transobj["fanyichucuo"]}:{except_msg}:\n' + traceback.format_exc()
-                config.logger.exception(e, exc_info=True)
-                set_process(text=msg, type='error', uuid=trk.uuid)
+    def process(self, trk):
+        trk.trans()
+        # 如果需要配音，则插入 dubb_queue 队列，否则插入最终队列
+        if trk.shoud_dubbing:
+            config.dubb_queue.append(trk)
+        else:
+            config.assemb_queue.append(trk)
 
+    def _error_suffix(self, trk):
+        if trk.cfg.get('translate_type') is not None:
+            return f"[{get_tanslate_type(trk.cfg.get('translate_type'))}]"
+        return ''
 
-class WorkerDubb(Thread):
-    def __init__(self, *, parent=None):
-        super().__init__()
 
-    def run(self) -> None:
-        while 1:
-            if config.exit_soft:
-                return
-            if len(config.dubb_queue) < 1:
-                time.sleep(0.5)
-                continue
-            trk = config.dubb_queue.pop(0)
-            if task_is_stop(trk.uuid):
-                continue
-            try:
-                trk.dubbing()
-                config.align_queue.append(trk)
-            except Exception as e:
-                from videotrans.configure._except import get_msg_from_except
-                except_msg=get_msg_from_except(e)
-                if trk.cfg.get('tts_type') is not None:
-                    except_msg+=f"[{get_tts_type(trk.cfg.get('tts_type'))}]"
-                msg = f'{config.transobj["peiyinchucuo"]}:{except_msg}:\n' + traceback.format_exc()
-                config.logger.exception(e, exc_info=True)
-                set_process(text=msg, type='error', uuid=trk.uuid)
+class WorkerDubb(StageWorker):
+    queue_name = 'dubb_queue'
+    error_key = 'peiyinchucuo'
 
+    def process(self, trk):
+        trk.dubbing()
+        config.align_queue.append(trk)
 
-class WorkerAlign(Thread):
-    def __init__(self, *, parent=None):
-        super().__init__()
+    def _error_suffix(self, trk):
+        if trk.cfg.get('tts_type') is not None:
+            return f"[{get_tts_type(trk.cfg.get('tts_type'))}]"
+        return ''
 
-    def run(self) -> None:
-        while 1:
-            if config.exit_soft:
-                return
-            if len(config.align_queue) < 1:
-                time.sleep(0.5)
-                continue
-            trk = config.align_queue.pop(0)
-            if task_is_stop(trk.uuid):
-                continue
-            try:
-                trk.align()
-            except Exception as e:
-                from videotrans.configure._except import get_msg_from_except
-                except_msg=get_msg_from_except(e)
-                msg = f'{config.transobj["peiyinchucuo"]}:{except_msg}:' + traceback.format_exc()
-                config.logger.exception(e, exc_info=True)
-                set_process(text=msg, type='error', uuid=trk.uuid)
-            else:
-                config.assemb_queue.append(trk)
 
+class WorkerAlign(StageWorker):
+    queue_name = 'align_queue'
+    error_key = 'peiyinchucuo'
 
-class WorkerAssemb(Thread):
-    def __init__(self, *, parent=None):
-        super().__init__()
+    def process(self, trk):
+        trk.align()
+        config.assemb_queue.append(trk)
 
-    def run(self) -> None:
-        while 1:
-            if config.exit_soft:
-                return
-            if len(config.assemb_queue) < 1:
-                time.sleep(0.5)
-                continue
-            trk = config.assemb_queue.pop(0)
-            if task_is_stop(trk.uuid):
-                continue
-            try:
-                trk.assembling()
-                trk.task_done()
-            except Exception as e:
-                from videotrans.configure._except import get_msg_from_except
-                except_msg=get_msg_from_except(e)
-                msg = f'{config.transobj["hebingchucuo"]}:{except_msg}:' + traceback.format_exc()
-                config.logger.exception(e, exc_info=True)
-                set_process(text=msg, type='error', uuid=trk.uuid)
+    def _error_text(self, trk, except_msg):
+        return f'{config.transobj[self.error_key]}:{except_msg}:' + traceback.format_exc()
+
+
+class WorkerAssemb(StageWorker):
+    queue_name = 'assemb_queue'
+    error_key = 'hebingchucuo'
+
+    def process(self, trk):
+        trk.assembling()
+        trk.task_done()
+        if trk.token is not None:
+            trk.token.status = 'end'
+
+    def _error_text(self, trk, except_msg):
+        return f'{config.transobj[self.error_key]}:{except_msg}:' + traceback.format_exc()
+
+
+# 各阶段工作线程类及其在高级设置中的并发数 key
+STAGE_WORKERS = [
+    (WorkerPrepare, 'prepare_workers'),
+    (WorkerRegcon, 'recogn_workers'),
+    (WorkerTrans, 'trans_workers'),
+    (WorkerDubb, 'dubbing_workers'),
+    (WorkerAlign, 'align_workers'),
+    (WorkerAssemb, 'assemb_workers'),
+]
+
+
+def _get_worker_nums(key):
+    try:
+        return max(1, int(float(config.settings.get(key, 1))))
+    except (TypeError, ValueError):
+        return 1
 
 
 def start_thread(parent=None):
-    WorkerPrepare(parent=parent).start()
-    WorkerRegcon(parent=parent).start()
-    WorkerTrans(parent=parent).start()
-    WorkerDubb(parent=parent).start()
-    WorkerAlign(parent=parent).start()
-    WorkerAssemb(parent=parent).start()
+    for worker_cls, key in STAGE_WORKERS:
+        for _ in range(_get_worker_nums(key)):
+            worker_cls(parent=parent).start()
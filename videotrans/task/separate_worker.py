@@ -4,6 +4,7 @@ import threading
 from PySide6.QtCore import QThread, Signal as pyqtSignal
 
 from videotrans.configure import config
+from videotrans.configure._task_state import TaskCancelled
 from videotrans.separate import st
 from videotrans.util import tools
 
@@ -51,11 +52,13 @@ class SeparateWorker(QThread):
                 ]
                 if self.basename.split('.')[-1].lower() in ['mp4', 'mov', 'mkv', 'mpeg']:
                     cmd.insert(3, '-vn')
-                tools.runffmpeg(cmd)
+                tools.runffmpeg(cmd, uuid=self.uuid)
                 self.file = newfile
             tools.set_process(uuid=self.uuid)
             threading.Thread(target=self.getqueulog).start()
             st.start(self.file, self.out, "win", uuid=self.uuid)
+        except TaskCancelled:
+            self.finish_event.emit('end')
         except Exception as e:
             msg = f"separate vocal and background music:{str(e)}"
             self.finish_event.emit(msg)
@@ -11,6 +11,7 @@ from typing import List, Dict
 
 from videotrans import translator
 from videotrans.configure import config
+from videotrans.configure._task_state import TaskCancelled
 from videotrans.recognition import run as run_recogn, Faster_Whisper_XXL
 from videotrans.translator import run as run_trans, get_audio_code
 from videotrans.tts import run as run_tts, CLONE_VOICE_TTS, CHATTERBOX_TTS, COSYVOICE_TTS, F5_TTS, EDGE_TTS, AZURE_TTS, \
@@ -274,7 +275,10 @@ class TransCreate(BaseTask):
                 self._signal(text=config.transobj['Separating background music'])
                 self.status_text = config.transobj['Separating background music']
                 self._split_audio_byraw(True)
-            except:
+            except TaskCancelled:
+                # 取消时不按分离失败继续处理
+                raise
+            except Exception:
                 pass
             finally:
                 if not tools.vail_file(self.cfg['vocal']) or not tools.vail_file(self.cfg['instrument']):
@@ -507,7 +511,7 @@ class TransCreate(BaseTask):
             self.status_text = '声画变速对齐阶段' if config.defaulelang == 'zh' else 'Sound & video speed alignment stage'
         try:
             shoud_video_rate = self.cfg['video_autorate']
-            tools.is_novoice_mp4(self.cfg['novoice_mp4'], self.cfg['noextname'])
+            tools.is_novoice_mp4(self.cfg['novoice_mp4'], self.cfg['noextname'], uuid=self.uuid)
             rate_inst = SpeedRate(
                 queue_tts=self.queue_tts,
                 uuid=self.uuid,
@@ -547,7 +551,7 @@ class TransCreate(BaseTask):
                 volume = 1 + float(volume) / 100
                 if volume != 1.0:
                     tmp_name = self.cfg['cache_folder'] + f'/volume-{volume}-{Path(self.cfg["target_wav"]).name}'
-                    tools.runffmpeg(['-y', '-i', self.cfg['target_wav'], '-af', f"volume={volume}", tmp_name])
+                    tools.runffmpeg(['-y', '-i', self.cfg['target_wav'], '-af', f"volume={volume}", tmp_name], uuid=self.uuid)
                     shutil.copy2(tmp_name, self.cfg['target_wav'])
             except:
                 pass
@@ -628,7 +632,7 @@ class TransCreate(BaseTask):
         if not self.is_copy_video:
             cmd += ["-crf", f'{config.settings["crf"]}']
         cmd += [self.cfg['novoice_mp4']]
-        return tools.runffmpeg(cmd, noextname=self.cfg['noextname'])
+        return tools.runffmpeg(cmd, noextname=self.cfg['noextname'], uuid=self.uuid)
 
     # 从原始视频中分离出音频
     def _split_audio_byraw(self, is_separate=False):
@@ -643,7 +647,7 @@ class TransCreate(BaseTask):
             "pcm_s16le",
             self.cfg['source_wav']
         ]
-        rs = tools.runffmpeg(cmd)
+        rs = tools.runffmpeg(cmd, uuid=self.uuid)
         if not is_separate:
             return rs
 
@@ -663,7 +667,7 @@ class TransCreate(BaseTask):
             "-c:a",
             "pcm_s16le",
             tmpfile
-        ])
+        ], uuid=self.uuid)
         from videotrans.separate import st
         vocal_file = self.cfg['cache_folder'] + '/vocal.wav'
         if not tools.vail_file(vocal_file):
@@ -697,7 +701,7 @@ class TransCreate(BaseTask):
             if line_roles and f'{it["line"]}' in line_roles:
                 voice_role = line_roles[f'{it["line"]}']
             filename_md5 = tools.get_md5(
-                f"{self.cfg['tts_type']}-{it['start_time']}-{it['end_time']}-{voice_role}-{rate}-{self.cfg['volume']}-{self.cfg['pitch']}-{len(it['text'])}-{i}")
+                f"{self.uuid}-{self.cfg['tts_type']}-{it['start_time']}-{it['end_time']}-{voice_role}-{rate}-{self.cfg['volume']}-{self.cfg['pitch']}-{it['text']}-{i}")
             tmp_dict = {
                 "text": it['text'],
                 "line": it['line'],
@@ -742,12 +746,17 @@ class TransCreate(BaseTask):
         if not self.queue_tts or len(self.queue_tts) < 1:
             raise RuntimeError(f'Queue tts length is 0')
         # 具体配音操作
-        run_tts(
+        dubbed = run_tts(
             queue_tts=copy.deepcopy(self.queue_tts),
             language=self.cfg['target_language_code'],
             uuid=self.uuid,
             inst=self
         )
+        # 配音阶段已读取各片段时长，对齐阶段直接使用
+        durations = {it['filename']: it['dubb_time'] for it in dubbed or [] if it.get('dubb_time')}
+        for it in self.queue_tts:
+            if it['filename'] in durations:
+                it['dubb_time'] = durations[it['filename']]
         if config.settings.get('save_segment_audio', False):
             outname = self.cfg['target_dir'] + f'/segment_audio_{self.cfg["noextname"]}'
             Path(outname).mkdir(parents=True, exist_ok=True)
@@ -790,7 +799,7 @@ class TransCreate(BaseTask):
                      "-filter:a", f"volume={config.settings['backaudio_volume']}",
                      '-c:a', 'pcm_s16le',
                      self.cfg['cache_folder'] + f"/bgm_file_extend_volume.wav"
-                     ])
+                     ], uuid=self.uuid)
                 # 背景音频和配音合并
                 cmd = ['-y',
                        '-i', self.cfg['target_wav'],
@@ -800,7 +809,7 @@ class TransCreate(BaseTask):
                        '-c:a', 'pcm_s16le',
                        self.cfg['cache_folder'] + f"/lastend.wav"
                        ]
-                tools.runffmpeg(cmd)
+                tools.runffmpeg(cmd, uuid=self.uuid)
                 self.cfg['target_wav'] = self.cfg['cache_folder'] + f"/lastend.wav"
             except Exception as e:
                 config.logger.exception(f'添加背景音乐失败:{str(e)}', exc_info=True)
@@ -843,7 +852,7 @@ class TransCreate(BaseTask):
         self.convert_to_wav(backwav, tmpm4a, ["-filter:a", f"volume={config.settings['backaudio_volume']}"])
         tools.runffmpeg(['-y', '-i', peiyinm4a, '-i', tmpm4a, '-filter_complex',
                          "[0:a][1:a]amix=inputs=2:duration=first:dropout_transition=2", '-ac', '2', "-b:a", "128k",
-                         '-c:a', 'pcm_s16le', tmpwav])
+                         '-c:a', 'pcm_s16le', tmpwav], uuid=self.uuid)
         shutil.copy2(tmpwav, peiyinm4a)
 
     # 处理所需字幕
@@ -923,7 +932,7 @@ class TransCreate(BaseTask):
             return True
 
         # 判断novoice_mp4是否完成
-        tools.is_novoice_mp4(self.cfg['novoice_mp4'], self.cfg['noextname'])
+        tools.is_novoice_mp4(self.cfg['novoice_mp4'], self.cfg['noextname'], uuid=self.uuid)
 
         # 需要配音但没有配音文件
         if self.shoud_dubbing and not tools.vail_file(self.cfg['target_wav']):
@@ -941,8 +950,7 @@ class TransCreate(BaseTask):
 
         self.precent = min(max(95, self.precent), 98)
 
-        protxt = config.TEMP_DIR + f"/compose{time.time()}.txt"
-        threading.Thread(target=self._hebing_pro, args=(protxt,)).start()
+        base_precent = self.precent
 
         # 字幕嵌入时进入视频目录下
         os.chdir(Path(self.cfg['novoice_mp4']).parent.resolve())
@@ -958,8 +966,6 @@ class TransCreate(BaseTask):
                     # 需要配音+硬字幕
                     cmd = [
                         "-y",
-                        "-progress",
-                        protxt,
                         "-i",
                         self.cfg['novoice_mp4'],
                         "-i",
@@ -986,8 +992,6 @@ class TransCreate(BaseTask):
                     self._signal(text=config.transobj['peiyin-ruanzimu'])
                     cmd = [
                         "-y",
-                        "-progress",
-                        protxt,
                         "-i",
                         self.cfg['novoice_mp4'],
                         "-i",
@@ -1014,8 +1018,6 @@ class TransCreate(BaseTask):
                 self._signal(text=config.transobj['onlypeiyin'])
                 cmd = [
                     "-y",
-                    "-progress",
-                    protxt,
                     "-i",
                     self.cfg['novoice_mp4'],
                     "-i",
@@ -1036,8 +1038,6 @@ class TransCreate(BaseTask):
                 self._signal(text=config.transobj['onlyyingzimu'])
                 cmd = [
                     "-y",
-                    "-progress",
-                    protxt,
                     "-i",
                     self.cfg['novoice_mp4']
                 ]
@@ -1071,8 +1071,6 @@ class TransCreate(BaseTask):
                 # 原视频
                 cmd = [
                     "-y",
-                    "-progress",
-                    protxt,
                     "-i",
                     self.cfg['novoice_mp4']
                 ]
@@ -1106,7 +1104,8 @@ class TransCreate(BaseTask):
                 cmd.append(Path(self.cfg['targetdir_mp4']).as_posix())
             config.logger.info(f"\n最终确定的音视频字幕合并命令为:{cmd=}\n")
             if cmd:
-                tools.runffmpeg(cmd)
+                tools.runffmpeg(cmd, uuid=self.uuid,
+                                on_progress=lambda progress: self._hebing_pro(progress, base_precent))
         except Exception as e:
             msg = f'最后一步字幕配音嵌入时出错:{e}' if config.defaulelang == 'zh' else f'Error in embedding the final step of the subtitle dubbing:{e}'
             raise RuntimeError(msg)
@@ -1118,40 +1117,14 @@ class TransCreate(BaseTask):
         self.hasend = True
         return True
 
-    # ffmpeg进度日志
-    def _hebing_pro(self, protxt) -> None:
-        basenum = 100 - self.precent
-        video_time = self.video_time
-        while 1:
-            if self.precent >= 100:
-                return
-            if not os.path.exists(protxt):
-                time.sleep(1)
-                continue
-            with open(protxt, 'r', encoding='utf-8') as f:
-                content = f.read().strip().split("\n")
-                if content[-1] == 'progress=end':
-                    return
-                idx = len(content) - 1
-                end_time = "00:00:00"
-                while idx > 0:
-                    if content[idx].startswith('out_time='):
-                        end_time = content[idx].split('=')[1].strip()
-                        break
-                    idx -= 1
-                try:
-                    h, m, s = end_time.split(':')
-                except:
-                    time.sleep(1)
-                    continue
-                else:
-                    h, m, s = end_time.split(':')
-                    precent = round((int(h) * 3600000 + int(m) * 60000 + int(s[:2]) * 1000) * basenum / video_time, 2)
-                    if self.precent + 0.1 < 99:
-                        self.precent += 0.1
-                    else:
-                        self._signal(text=config.transobj['kaishihebing'] + f' -> {precent * 100}%')
-                    time.sleep(1)
+    # ffmpeg进度回调，将合成进度映射到 base_precent~99 之间
+    def _hebing_pro(self, progress, base_precent) -> None:
+        if not self.video_time:
+            return
+        ratio = min(1.0, progress['out_time'] * 1000 / self.video_time)
+        self.precent = round(base_precent + (99 - base_precent) * ratio, 2)
+        speed = f" {progress['speed']}x" if progress['speed'] else ""
+        self._signal(text=config.transobj['kaishihebing'] + f' -> {ratio * 100:.2f}%{speed}')
 
     # 创建说明txt
     def _create_txt(self) -> None:
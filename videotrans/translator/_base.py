@@ -1,5 +1,7 @@
-import json
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
@@ -7,9 +9,54 @@ from typing import List, Dict, Any, Optional, Union
 from videotrans.configure import config
 from videotrans.configure._base import BaseCon
 from videotrans.configure._except import TranslateSrtError
+from videotrans.translator import _cache
 from videotrans.util import tools
 
 
+class _RateLimiter:
+    """
+    单个翻译渠道的限速器，同一渠道的所有翻译任务共用
+    rps: 每秒最多发起的请求数，tpm: 每分钟最多发送的估算token数，均为0时不限制
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_request = 0.0
+        self._tokens = deque()
+
+    def acquire(self, tokens, rps, tpm, is_exit):
+        while not is_exit():
+            with self._lock:
+                now = time.time()
+                wait = 0.0
+                if rps > 0:
+                    wait = max(wait, self._last_request + 1 / rps - now)
+                if tpm > 0:
+                    while self._tokens and now - self._tokens[0][0] >= 60:
+                        self._tokens.popleft()
+                    used = sum(n for _, n in self._tokens)
+                    # 单次超过上限时只要窗口为空即放行，避免永久等待
+                    if self._tokens and used + tokens > tpm:
+                        wait = max(wait, self._tokens[0][0] + 60 - now)
+                if wait <= 0:
+                    self._last_request = now
+                    if tpm > 0:
+                        self._tokens.append((now, tokens))
+                    return
+            time.sleep(min(wait, 0.5))
+
+
+_limiters: Dict[str, _RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _get_limiter(name) -> _RateLimiter:
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = _RateLimiter()
+        return _limiters[name]
+
+
 @dataclass
 class BaseTrans(BaseCon):
     text_list: Union[List, str] = ""
@@ -31,6 +78,7 @@ class BaseTrans(BaseCon):
     split_source_text: List = field(default_factory=list, init=False)
 
     trans_thread: int = field(init=False)
+    concurrency: int = field(init=False)
     retry: int = field(init=False)
     wait_sec: float = field(init=False)
     is_srt: bool = field(init=False)
@@ -43,6 +91,8 @@ class BaseTrans(BaseCon):
         self.retry = int(config.settings.get('retries', 2))
         self.wait_sec = float(config.settings.get('translation_wait', 0))
         self.aisendsrt = config.settings.get('aisendsrt', False)
+        # 同时发出的翻译请求数，1=逐批顺序请求
+        self.concurrency = max(1, int(float(config.settings.get('trans_concurrency', 1))))
 
         self.is_srt = not isinstance(self.text_list, str)
 
@@ -51,6 +101,9 @@ class BaseTrans(BaseCon):
         pass
 
     def _exit(self):
+        token = self._token()
+        if token is not None:
+            return token.cancelled
         if config.exit_soft or (config.current_status != 'ing' and config.box_trans != 'ing' and not self.is_test):
             return True
         return False
@@ -82,52 +135,127 @@ class BaseTrans(BaseCon):
         except Exception as e:
             raise
 
+    def _send(self, data: Union[List[str], str]) -> Optional[str]:
+        """经过本渠道限速器后调用 _item_task，等待限速期间任务被取消时不再请求，返回 None"""
+        text = "\n".join(data) if isinstance(data, list) else data
+        # 按utf-8字节数估算token，CJK约1字1token，英文约3字符1token
+        tokens = max(1, len(text.encode('utf-8')) // 3)
+        _get_limiter(self.__class__.__name__).acquire(
+            tokens,
+            float(config.settings.get('trans_rps', 0)),
+            float(config.settings.get('trans_tpm', 0)),
+            self._exit)
+        if self._exit():
+            return None
+        return self._item_task(data)
+
+    def _map_groups(self, func, groups):
+        """
+        依次返回每组的翻译结果，顺序与 groups 一致
+        concurrency > 1 时由有界线程池并发请求
+        """
+        if self.concurrency <= 1:
+            for it in groups:
+                yield func(it)
+            return
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            yield from pool.map(func, groups)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _text_task(self, it):
+        if self._exit():
+            return None
+        result = self._send(it)
+        if result is None:
+            return None
+        result = tools.cleartext(result)
+        time.sleep(self.wait_sec)
+        return result
+
+    def _run_plain(self):
+        # 非srt只翻译第一组，整组发送并原样返回译文，译文行数可与原文不同
+        # 仅当整组每一行都命中翻译记忆时才使用记忆，否则发送请求
+        it = self.split_source_text[0] if self.split_source_text else []
+        cached = self._get_cache(it)
+        targets = [cached.get(_cache.normalize(line)) for line in it]
+        if it and None not in targets:
+            config.logger.info(f'翻译记忆命中 {len(it)}/{len(it)} 行')
+            result = "\n".join(targets)
+        else:
+            result = self._text_task(it)
+            if result is None:
+                return
+            sep_res = result.split("\n")
+            # 行数一致时译文才能与原文逐行对应，写入翻译记忆
+            if len(sep_res) == len(it):
+                self._set_cache(it, [x.strip() for x in sep_res])
+        if self.inst and self.inst.precent < 75:
+            self.inst.precent += 0.01
+        # 恢复原代理设置
+        if self.shound_del:
+            self._set_proxy(type='del')
+        return result
+
     def _run_text(self):
-        # 翻译字幕并且以完整srt格式发送
-        for i, it in enumerate(self.split_source_text):
-            """ it=['你好啊我的朋友','第二行'] 
-                此时 _item_task 接收的是 list[str]
-            """
+        # 以文字行形式翻译，此时 _item_task 接收的是 list[str]，如 ['你好啊我的朋友','第二行']
+        # 先从翻译记忆中批量查询所有行，只把未命中的行按 trans_thread 分批发送
+        if not self.is_srt:
+            return self._run_plain()
+        source_lines = [line for group in self.split_source_text for line in group]
+        cached = self._get_cache(source_lines)
+        translated = {}
+        misses = []
+        for i, line in enumerate(source_lines):
+            target = cached.get(_cache.normalize(line))
+            if target is None:
+                misses.append(i)
+                continue
+            translated[i] = target
+        if translated:
+            config.logger.info(f'翻译记忆命中 {len(translated)}/{len(source_lines)} 行')
+
+        # 按原文顺序显示字幕，命中记忆的行等其前面未命中的行译完后再显示
+        shown = 0
+
+        def _show_ready():
+            nonlocal shown
+            while shown < len(source_lines) and shown in translated:
+                self._signal(text=translated[shown] + "\n", type='subtitle')
+                shown += 1
+
+        _show_ready()
+
+        batches = [misses[i:i + self.trans_thread] for i in range(0, len(misses), self.trans_thread)]
+        batch_lines = [[source_lines[i] for i in batch] for batch in batches]
+        for batch, it, result in zip(batches, batch_lines, self._map_groups(self._text_task, batch_lines)):
             config.logger.info(f'##### [以文字行形式翻译]')
-            if self._exit():
+            if self._exit() or result is None:
                 return
 
-            result = self._get_cache(it)
-            if not result:
-                result = tools.cleartext(self._item_task(it))
-                self._set_cache(it, result)
             if self.inst and self.inst.precent < 75:
                 self.inst.precent += 0.01
-            # 非srt直接break
-            if not self.is_srt:
-                self.target_list.append(result)
-                break
             sep_res = result.split("\n")
+            # 行数一致时译文才能与原文逐行对应，写入翻译记忆
+            if len(sep_res) == len(it):
+                self._set_cache(it, [x.strip() for x in sep_res])
 
-            for x, result_item in enumerate(sep_res):
-                if x < len(it):
-                    self.target_list.append(result_item.strip())
-                    self._signal(
-                        text=result_item + "\n",
-                        type='subtitle')
-                    self._signal(
-                        text=config.transobj['starttrans'] + f' {i * self.trans_thread + x + 1} ')
-            # 行数不匹配填充空行
-            if len(sep_res) < len(it):
-                tmp = ["" for x in range(len(it) - len(sep_res))]
-                self.target_list += tmp
+            for x, idx in enumerate(batch):
+                # 行数不匹配填充空行
+                result_item = sep_res[x].strip() if x < len(sep_res) else ""
+                translated[idx] = result_item
+                self._signal(
+                    text=config.transobj['starttrans'] + f' {idx + 1} ')
+            _show_ready()
 
             if self.inst and self.inst.status_text:
                 self.inst.status_text = '字幕翻译中' if config.defaulelang == 'zh' else 'Translation of subtitles'
-            time.sleep(self.wait_sec)
 
+        self.target_list = [translated.get(i, "") for i in range(len(source_lines))]
         # 恢复原代理设置
         if self.shound_del:
             self._set_proxy(type='del')
-        # text_list是字符串
-        if not self.is_srt:
-            return "\n".join(self.target_list)
-
         max_i = len(self.target_list)
 
         for i, it in enumerate(self.text_list):
@@ -137,25 +265,34 @@ class BaseTrans(BaseCon):
                 self.text_list[i]['text'] = ""
         return self.text_list
 
+    def _srt_task(self, it):
+        if self._exit():
+            return None
+        for j, srt in enumerate(it):
+            srt['text'] = srt['text'].strip().replace("\n", " ")
+            it[j] = srt
+        srt_str = "\n\n".join(
+            [f"{srtinfo['line']}\n{srtinfo['time']}\n{srtinfo['text'].strip()}" for srtinfo in it])
+        # 完整SRT格式发送时，整批内容作为一条记录缓存
+        result = self._get_cache([srt_str]).get(_cache.normalize(srt_str))
+        if not result:
+            result = self._send(srt_str)
+            if result is None:
+                return None
+            if not result.strip():
+                raise TranslateSrtError('无返回翻译结果' if config.defaulelang == 'zh' else 'Translate result is empty')
+            self._set_cache([srt_str], [result])
+            time.sleep(self.wait_sec)
+        return result
+
     # 发送完整字幕格式内容进行翻译
     # 此时 _item_task 接收的是 srt格式的字符串
     def _run_srt(self):
         result_srt_str_list = []
-        for i, it in enumerate(self.split_source_text):
+        for result in self._map_groups(self._srt_task, self.split_source_text):
             config.logger.info(f'#### [以完整SRT格式发送翻译]，it应是dict列表')
-            if self._exit():
+            if self._exit() or result is None:
                 return
-            for j, srt in enumerate(it):
-                srt['text'] = srt['text'].strip().replace("\n", " ")
-                it[j] = srt
-            srt_str = "\n\n".join(
-                [f"{srtinfo['line']}\n{srtinfo['time']}\n{srtinfo['text'].strip()}" for srtinfo in it])
-            result = self._get_cache(srt_str)
-            if not result:
-                result = self._item_task(srt_str)
-                if not result.strip():
-                    raise TranslateSrtError('无返回翻译结果' if config.defaulelang == 'zh' else 'Translate result is empty')
-                self._set_cache(it, result)
 
             if self.inst and self.inst.precent < 75:
                 self.inst.precent += 0.1
@@ -165,7 +302,6 @@ class BaseTrans(BaseCon):
 
             if self.inst and self.inst.status_text:
                 self.inst.status_text = '字幕翻译中' if config.defaulelang == 'zh' else 'Translation of subtitles'
-            time.sleep(self.wait_sec)
 
         # 恢复原代理设置
         if self.shound_del:
@@ -181,26 +317,18 @@ class BaseTrans(BaseCon):
             raws_list[i] = it
         return raws_list
 
-    def _set_cache(self, it, res_str):
-        if not res_str.strip():
-            return
-        key_cache = self._get_key(it)
+    def _cache_scope(self):
+        """翻译记忆的作用域，只包含影响译文的因素"""
+        prompt = getattr(self, 'prompt', '') or ''
+        return tools.get_md5(
+            f'{self.__class__.__name__}-{self.model_name}-{self.source_code}-{self.target_code}-{self.aisendsrt and self.is_srt}-{tools.get_md5(prompt)}')
 
-        file_cache = config.TEMP_DIR + f'/translate_cache/{key_cache}.txt'
-        if not Path(config.TEMP_DIR + f'/translate_cache').is_dir():
-            Path(config.TEMP_DIR + f'/translate_cache').mkdir(parents=True, exist_ok=True)
-        Path(file_cache).write_text(res_str, encoding='utf-8')
+    def _set_cache(self, lines, targets):
+        if self.is_test or int(float(config.settings.get('trans_cache_max_rows', 200000))) <= 0:
+            return
+        _cache.put_many(self._cache_scope(), list(zip(lines, targets)))
 
-    def _get_cache(self, it):
-        if self.is_test:
-            return None
-        key_cache = self._get_key(it)
-        file_cache = config.TEMP_DIR + f'/translate_cache/{key_cache}.txt'
-        if Path(file_cache).exists():
-            return Path(file_cache).read_text(encoding='utf-8')
-        return None
-
-    def _get_key(self, it):
-        Path(config.TEMP_DIR + '/translate_cache').mkdir(parents=True, exist_ok=True)
-        return tools.get_md5(
-            f'{self.__class__.__name__}-{self.api_url}-{self.trans_thread}-{self.retry}-{self.wait_sec}-{self.iter_num}-{self.is_srt}-{self.aisendsrt}-{self.proxies}-{self.model_name}-{self.source_code}-{self.target_code}-{it if isinstance(it, str) else json.dumps(it)}')
+    def _get_cache(self, lines) -> Dict[str, str]:
+        if self.is_test or int(float(config.settings.get('trans_cache_max_rows', 200000))) <= 0:
+            return {}
+        return _cache.get_many(self._cache_scope(), lines)
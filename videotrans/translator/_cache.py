@@ -0,0 +1,72 @@
+"""
+行级翻译记忆，保存在 cache/translate_cache/memory.db
+
+以 (作用域, 规范化后的原文行) 为键，作用域由翻译渠道、模型、源语言、目标语言和提示词共同决定，
+批大小、重试次数、等待时间等不影响译文的设置不参与，调整后缓存仍然有效。
+行数超过 trans_cache_max_rows 时按最近使用时间淘汰最旧的记录。
+数据库被锁定或读写出错时视为未命中、不写入，不影响翻译；文件损坏时删除后重建。
+"""
+import re
+import sqlite3
+import time
+from typing import Dict, List
+
+from videotrans.configure import config
+from videotrans.util.sqlite_store import SqliteStore
+
+# sqlite 单条语句的参数数量有上限，批量查询时分块
+_CHUNK = 500
+
+_db = SqliteStore(lambda: config.CACHE_DIR + '/translate_cache/memory.db', [
+    'CREATE TABLE IF NOT EXISTS memory (scope TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL, '
+    'used REAL NOT NULL, PRIMARY KEY (scope, source))',
+    'CREATE INDEX IF NOT EXISTS memory_used ON memory (used)',
+], '翻译记忆')
+
+
+def normalize(line: str) -> str:
+    return re.sub(r'\s+', ' ', line).strip()
+
+
+def get_many(scope: str, lines: List[str]) -> Dict[str, str]:
+    """批量查询，返回 {规范化原文: 译文}，命中的记录刷新最近使用时间"""
+    keys = list({normalize(line) for line in lines if normalize(line)})
+    found = {}
+    if not keys:
+        return found
+    try:
+        with _db.transaction() as conn:
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i:i + _CHUNK]
+                rows = conn.execute(
+                    f'SELECT source, target FROM memory WHERE scope=? AND source IN ({",".join("?" * len(chunk))})',
+                    [scope, *chunk]).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                conn.executemany('UPDATE memory SET used=? WHERE scope=? AND source=?',
+                                 [(now, scope, source) for source in found])
+    except sqlite3.Error as e:
+        config.logger.warning(f'读取翻译记忆失败:{e}')
+        return {}
+    return found
+
+
+def put_many(scope: str, pairs: List[tuple]):
+    """写入 [(原文, 译文)]，空行和空译文不保存"""
+    now = time.time()
+    rows = [(scope, normalize(source), target, now) for source, target in pairs if
+            normalize(source) and target.strip()]
+    if not rows:
+        return
+    max_rows = int(float(config.settings.get('trans_cache_max_rows', 200000)))
+    try:
+        with _db.transaction() as conn:
+            conn.executemany('INSERT OR REPLACE INTO memory (scope, source, target, used) VALUES (?, ?, ?, ?)', rows)
+            count = conn.execute('SELECT COUNT(*) FROM memory').fetchone()[0]
+            if max_rows > 0 and count > max_rows:
+                conn.execute(
+                    'DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory ORDER BY used LIMIT ?)',
+                    (count - max_rows,))
+    except sqlite3.Error as e:
+        config.logger.warning(f'写入翻译记忆失败:{e}')
@@ -1,4 +1,4 @@
-from videotrans.configure import config
+from videotrans.configure import config, _task_state
 
 # 数字代表界面中的显示顺序
 EDGE_TTS = 0
@@ -433,11 +433,15 @@ def is_input_api(tts_type: int = None, return_str=False):
     return True
 
 
-def run(*, queue_tts=None, language=None, inst=None, uuid=None, play=False, is_test=False) -> None:
+def run(*, queue_tts=None, language=None, inst=None, uuid=None, play=False, is_test=False):
+    """返回配音后的 queue_tts，成功的条目带有 dubb_time 时长，无需配音时返回 None"""
     # 需要并行的数量3
     if len(queue_tts) < 1:
         return
-    if config.exit_soft or (not is_test and config.current_status != 'ing' and config.box_tts != 'ing'):
+    token = _task_state.get(uuid)
+    if token is not None and token.cancelled:
+        return
+    if token is None and (config.exit_soft or (not is_test and config.current_status != 'ing' and config.box_tts != 'ing')):
         return
     tts_type = queue_tts[0]['tts_type']
     kwargs = {
@@ -450,58 +454,58 @@ def run(*, queue_tts=None, language=None, inst=None, uuid=None, play=False, is_t
     }
     if tts_type == AZURE_TTS:
         from videotrans.tts._azuretts import AzureTTS
-        AzureTTS(**kwargs).run()
+        return AzureTTS(**kwargs).run()
     elif tts_type == EDGE_TTS:
         from videotrans.tts._edgetts import EdgeTTS
-        EdgeTTS(**kwargs).run()
+        return EdgeTTS(**kwargs).run()
     elif tts_type == AI302_TTS:
         from videotrans.tts._ai302tts import AI302
-        AI302(**kwargs).run()
+        return AI302(**kwargs).run()
     elif tts_type == COSYVOICE_TTS:
         from videotrans.tts._cosyvoice import CosyVoice
-        CosyVoice(**kwargs).run()
+        return CosyVoice(**kwargs).run()
     elif tts_type == CHATTTS:
         from videotrans.tts._chattts import ChatTTS
-        ChatTTS(**kwargs).run()
+        return ChatTTS(**kwargs).run()
     elif tts_type == FISHTTS:
         from videotrans.tts._fishtts import FishTTS
-        FishTTS(**kwargs).run()
+        return FishTTS(**kwargs).run()
     elif tts_type == KOKORO_TTS:
         from videotrans.tts._kokoro import KokoroTTS
-        KokoroTTS(**kwargs).run()
+        return KokoroTTS(**kwargs).run()
     elif tts_type == GPTSOVITS_TTS:
         from videotrans.tts._gptsovits import GPTSoVITS
-        GPTSoVITS(**kwargs).run()
+        return GPTSoVITS(**kwargs).run()
     elif tts_type == CHATTERBOX_TTS:
         from videotrans.tts._chatterbox import ChatterBoxTTS
-        ChatterBoxTTS(**kwargs).run()
+        return ChatterBoxTTS(**kwargs).run()
     elif tts_type == CLONE_VOICE_TTS:
         from videotrans.tts._clone import CloneVoice
-        CloneVoice(**kwargs).run()
+        return CloneVoice(**kwargs).run()
     elif tts_type == OPENAI_TTS:
         from videotrans.tts._openaitts import OPENAITTS
-        OPENAITTS(**kwargs).run()
+        return OPENAITTS(**kwargs).run()
     elif tts_type == QWEN_TTS:
         from videotrans.tts._qwentts import QWENTTS
-        QWENTTS(**kwargs).run()
+        return QWENTTS(**kwargs).run()
     elif tts_type == ELEVENLABS_TTS:
         from videotrans.tts._elevenlabs import ElevenLabsC
-        ElevenLabsC(**kwargs).run()
+        return ElevenLabsC(**kwargs).run()
     elif tts_type == GOOGLE_TTS:
         from videotrans.tts._gtts import GTTS
-        GTTS(**kwargs).run()
+        return GTTS(**kwargs).run()
     elif tts_type == TTS_API:
         from videotrans.tts._ttsapi import TTSAPI
-        TTSAPI(**kwargs).run()
+        return TTSAPI(**kwargs).run()
     elif tts_type == VOLCENGINE_TTS:
         from videotrans.tts._volcengine import VolcEngineTTS
-        VolcEngineTTS(**kwargs).run()
+        return VolcEngineTTS(**kwargs).run()
     elif tts_type == F5_TTS:
         from videotrans.tts._f5tts import F5TTS
-        F5TTS(**kwargs).run()
+        return F5TTS(**kwargs).run()
     elif tts_type == GOOGLECLOUD_TTS:
         from videotrans.tts._googlecloud import GoogleCloudTTS
-        GoogleCloudTTS(**kwargs).run()
+        return GoogleCloudTTS(**kwargs).run()
     elif tts_type == GEMINI_TTS:
         from videotrans.tts._geminitts import GEMINITTS
-        GEMINITTS(**kwargs).run()
+        return GEMINITTS(**kwargs).run()
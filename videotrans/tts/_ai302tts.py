@@ -1,7 +1,6 @@
 import json
 import logging
 
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -76,7 +75,7 @@ class AI302(BaseTTS):
         else:
             payload['provider'] = 'azure'
         # print(f'{payload=}')
-        response = requests.post('https://api.302.ai/302/v2/audio/tts', headers={
+        response = self._http('post', 'https://api.302.ai/302/v2/audio/tts', headers={
             'Authorization': f'Bearer {config.params["ai302_key"]}',
             'Content-Type': 'application/json'
         }, data=json.dumps(payload), verify=False, proxies=None)
@@ -85,8 +84,6 @@ class AI302(BaseTTS):
         audio_url = res.get("audio_url")
         if not audio_url:
             raise RuntimeError(res.get('error', {}).get("message"))
-        req_audio = requests.get(audio_url)
+        req_audio = self._http('get', audio_url)
         req_audio.raise_for_status()
-        with open(data['filename'] + ".mp3", 'wb') as f:
-            f.write(req_audio.content)
-        self.convert_to_wav(data['filename'] + ".mp3", data['filename'])
+        self.bytes_to_wav(req_audio.content, data['filename'])
@@ -98,7 +98,7 @@ class AzureTTS(BaseTTS):
                         ]
 
                     cmd += ["-ar", "44100", "-ac", "2", "-c:a", "pcm_s16le", items[i]['filename']]
-                    tools.runffmpeg(cmd)
+                    tools.runffmpeg(cmd, uuid=self.uuid)
                     self.has_done += 1
                     if self.inst and self.inst.precent < 80:
                         self.inst.precent += 0.1
@@ -185,7 +185,7 @@ class AzureTTS(BaseTTS):
         language = self.language.split("-", maxsplit=1)
         self.language = language[0].lower() + ("" if len(language) < 2 else '-' + language[1].upper())
 
-        split_queue = [self.queue_tts[i:i + self.con_num] for i in range(0, self.len, self.con_num)]
+        split_queue = [self.queue_tts[i:i + self.con_num] for i in range(0, len(self.queue_tts), self.con_num)]
         for idx, items in enumerate(split_queue):
             if self._exit():
                 return
@@ -14,6 +14,7 @@ from tenacity import RetryError
 
 from videotrans.configure import config
 from videotrans.configure._base import BaseCon
+from videotrans.tts import _cache
 
 
 from videotrans.util import tools
@@ -24,6 +25,12 @@ from videotrans.util import tools
 
 """
 
+# 同一渠道的所有配音任务共用 HTTP 连接池，避免每条字幕重新建立 TCP/TLS 连接
+_sessions = {}
+_httpx_clients = {}
+_host_limits = {}
+_pool_lock = threading.Lock()
+
 
 @dataclass
 class BaseTTS(BaseCon):
@@ -105,14 +112,19 @@ class BaseTTS(BaseCon):
     # 若捕获到异常，则直接抛出  出错时发送停止信号
     # run->exec->_local_mul_thread->item_task
     # run->exec->item_task
-    def run(self) -> None:
+    def run(self) -> Union[List[Dict[str, Any]], None]:
         Path(config.TEMP_HOME).mkdir(parents=True, exist_ok=True)
         self._signal(text="")
         if len(self.queue_tts) < 1:
             raise RuntimeError('没有需要配音的字幕' if config.defaulelang == 'zh' else 'No subtitles required')
+        # 已缓存的台词直接复制音频，只把未命中的交给子类合成
+        all_tts = self.queue_tts
+        self.queue_tts = self._restore_cache(all_tts)
+        # 命中缓存的条目计入已完成数，子类进度 has_done/self.len 仍以全部条目为分母
+        self.has_done = len(all_tts) - len(self.queue_tts)
         try:
             # 检查 self._exec 是不是一个异步函数 (coroutine)
-            if inspect.iscoroutinefunction(self._exec):
+            if self.queue_tts and inspect.iscoroutinefunction(self._exec):
                 # 如果是异步函数，我们需要一个事件循环来运行它
                 try:
                     # 尝试获取当前线程正在运行的事件循环
@@ -123,7 +135,7 @@ class BaseTTS(BaseCon):
                 else:
                     # 如果有，就在现有循环上运行它并等待完成
                     loop.run_until_complete(self._exec())
-            else:
+            elif self.queue_tts:
                 # 可能调用多线程，此时无法捕获异常
                 self._exec()
         except RetryError as e:
@@ -133,6 +145,8 @@ class BaseTTS(BaseCon):
         finally:
             if self.shound_del:
                 self._set_proxy(type='del')
+            self._save_cache(self.queue_tts)
+            self.queue_tts = all_tts
 
         # 是否播放
         if self.play:
@@ -160,6 +174,53 @@ class BaseTTS(BaseCon):
             for it in self.queue_tts:
                 if tools.vail_file(it['filename']):
                     tools.remove_silence_from_end(it['filename'])
+        # 读取 wav 头记录时长，后续对齐阶段无需再次探测
+        import soundfile as sf
+        for it in self.queue_tts:
+            if tools.vail_file(it['filename']):
+                try:
+                    info = sf.info(it['filename'])
+                    it['dubb_time'] = int(info.frames * 1000 / info.samplerate)
+                except Exception:
+                    pass
+        return self.queue_tts
+
+    def _cache_extra(self) -> str:
+        """除字幕行参数外影响合成结果的设置，如模型名、接口地址，子类按需覆盖"""
+        return self.api_url
+
+    def _cache_key(self, it) -> Union[str, None]:
+        # 克隆音色依赖每行的参考音频，不缓存
+        if int(float(config.settings.get('tts_cache_max_mb', 2048))) <= 0 or it.get('ref_wav'):
+            return None
+        text = re.sub(r'\s+', ' ', it['text']).strip()
+        return tools.get_md5(
+            f"{self.__class__.__name__}-{it.get('role', '')}-{text}-{self.rate}-{self.volume}-{self.pitch}-{self._cache_extra()}")
+
+    def _restore_cache(self, queue_tts) -> List[Dict[str, Any]]:
+        """命中缓存的条目复制音频到 filename，返回仍需合成的条目"""
+        misses = []
+        for it in queue_tts:
+            key = self._cache_key(it)
+            if key and _cache.get(key, it['filename']):
+                tools.invalidate_probe(it['filename'])
+                continue
+            misses.append(it)
+        if len(misses) < len(queue_tts):
+            stats = _cache.stats()
+            config.logger.info(
+                f'配音缓存命中 {len(queue_tts) - len(misses)}/{len(queue_tts)}，累计命中 {stats["hits"]} 未命中 {stats["misses"]}')
+        return misses
+
+    def _save_cache(self, queue_tts):
+        for it in queue_tts:
+            key = self._cache_key(it)
+            if not key or not tools.vail_file(it['filename']):
+                continue
+            try:
+                _cache.put(key, it['filename'])
+            except Exception as e:
+                config.logger.warning(f'保存配音缓存失败:{e}')
 
     # 用于除  edge-tts 之外的渠道，在此进行单或多线程气动。调用 _item_task
     # exec->_local_mul_thread->item_task
@@ -222,7 +283,7 @@ class BaseTTS(BaseCon):
 
                 tools.runffmpeg([
                     "-y", "-i", output_path + f'.{base64data_ext}', "-b:a", "128k", output_path
-                ])
+                ], uuid=self.uuid)
                 return
         # 将base64编码的字符串解码为字节
         wav_bytes = base64.b64decode(encoded_str)
@@ -230,6 +291,76 @@ class BaseTTS(BaseCon):
         with open(output_path, "wb") as wav_file:
             wav_file.write(wav_bytes)
 
+    def _pool_size(self) -> int:
+        return max(1, tools.provider_setting('tts_max_connections', self.__class__.__name__, 10))
+
+    def _http(self, method: str, url: str, **kwargs):
+        """
+        通过本渠道共用的 requests.Session 发送请求，参数同 requests.request
+        tts_host_concurrency 大于0时，同一主机同时进行的请求数不超过该值
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib.parse import urlparse
+
+        name = self.__class__.__name__
+        pool_size = self._pool_size()
+        host = urlparse(url).netloc
+        limit = tools.provider_setting('tts_host_concurrency', name, 0)
+        with _pool_lock:
+            session = _sessions.get((name, pool_size))
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _sessions[(name, pool_size)] = session
+            semaphore = None
+            if limit > 0:
+                semaphore = _host_limits.get((name, host, limit))
+                if semaphore is None:
+                    semaphore = threading.BoundedSemaphore(limit)
+                    _host_limits[(name, host, limit)] = semaphore
+        if semaphore is None:
+            return session.request(method, url, **kwargs)
+        with semaphore:
+            return session.request(method, url, **kwargs)
+
+    def _httpx_client(self, proxy=None, timeout=7200):
+        """供 OpenAI 等 SDK 使用的共用 httpx.Client，同一渠道、代理和超时只创建一次"""
+        import httpx
+        pool_size = self._pool_size()
+        key = (self.__class__.__name__, proxy, timeout, pool_size)
+        with _pool_lock:
+            client = _httpx_clients.get(key)
+            if client is None:
+                client = httpx.Client(proxy=proxy, timeout=timeout,
+                                      limits=httpx.Limits(max_connections=pool_size,
+                                                          max_keepalive_connections=pool_size))
+                _httpx_clients[key] = client
+            return client
+
+    def convert_to_wav(self, mp3_file_path: str, output_wav_file_path: str, extra=None):
+        # 配音片段较短，先在进程内解码重采样，失败时再交给 ffmpeg
+        if not extra:
+            try:
+                tools.decode_audio_to_wav(mp3_file_path, output_wav_file_path)
+                return True
+            except Exception as e:
+                config.logger.warning(f'进程内解码失败，改用ffmpeg:{e}')
+        return super().convert_to_wav(mp3_file_path, output_wav_file_path, extra)
+
+    def bytes_to_wav(self, data: bytes, output_wav_file_path: str, ext='mp3'):
+        """将接口返回的音频数据直接解码写入 wav，无法解码时保存为 .{ext} 后交给 ffmpeg"""
+        try:
+            tools.decode_audio_to_wav(data, output_wav_file_path)
+            return True
+        except Exception as e:
+            config.logger.warning(f'进程内解码失败，改用ffmpeg:{e}')
+        with open(output_wav_file_path + f'.{ext}', 'wb') as f:
+            f.write(data)
+        return super().convert_to_wav(output_wav_file_path + f'.{ext}', output_wav_file_path)
+
     def _audio_to_base64(self, file_path: str) -> Union[None, str]:
         if not file_path or not Path(file_path).exists():
             return None
@@ -239,6 +370,9 @@ class BaseTTS(BaseCon):
             return base64_encoded.decode("utf-8")
 
     def _exit(self):
+        token = self._token()
+        if token is not None:
+            return token.cancelled
         if config.exit_soft or (config.current_status != 'ing' and config.box_tts != 'ing' and not self.is_test):
             return True
         return False
@@ -0,0 +1,82 @@
+"""
+按内容寻址的配音缓存，音频保存在 cache/dubbing_cache/store，索引保存在 cache/dubbing_cache/store.db
+
+以 (配音渠道, 角色, 规范化后的文本, 语速, 音量, 音调, 模型/接口地址) 的 md5 为键，
+不同任务中相同的台词只合成一次，与字幕时间和行号无关。
+总大小超过 tts_cache_max_mb 时按最近使用时间删除最旧的音频。
+索引被锁定或读取出错时视为未命中；索引文件损坏时删除后重建。
+"""
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from videotrans.configure import config
+from videotrans.util.sqlite_store import SqliteStore
+
+# 索引损坏重建后，store 中已有的音频不再被索引，相同台词再次合成时覆盖
+_db = SqliteStore(lambda: config.CACHE_DIR + '/dubbing_cache/store.db', [
+    'CREATE TABLE IF NOT EXISTS audio (key TEXT PRIMARY KEY, size INTEGER NOT NULL, used REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS audio_used ON audio (used)',
+], '配音缓存索引')
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _store_dir():
+    return config.CACHE_DIR + '/dubbing_cache/store'
+
+
+def max_bytes() -> int:
+    return int(float(config.settings.get('tts_cache_max_mb', 2048)) * 1024 * 1024)
+
+
+def get(key: str, out_file: str) -> bool:
+    """命中时将缓存音频复制到 out_file 并返回 True"""
+    cached = f'{_store_dir()}/{key}.wav'
+    row = None
+    try:
+        with _db.transaction() as conn:
+            row = conn.execute('SELECT size FROM audio WHERE key=?', (key,)).fetchone()
+            if row and Path(cached).is_file():
+                conn.execute('UPDATE audio SET used=? WHERE key=?', (time.time(), key))
+    except sqlite3.Error as e:
+        config.logger.warning(f'读取配音缓存失败:{e}')
+        row = None
+    hit = bool(row) and Path(cached).is_file()
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+    if not hit:
+        return False
+    # copyfile 不保留原mtime，避免 ffprobe 缓存读到旧结果
+    shutil.copyfile(cached, out_file)
+    return True
+
+
+def put(key: str, audio_file: str):
+    """保存新合成的音频，并在超出容量时淘汰最久未用的记录"""
+    cached = f'{_store_dir()}/{key}.wav'
+    size = Path(audio_file).stat().st_size
+    limit = max_bytes()
+    if size > limit:
+        return
+    # 出错时回滚后交给调用方记录，本条不缓存
+    with _db.transaction() as conn:
+        Path(_store_dir()).mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(audio_file, cached)
+        conn.execute('INSERT OR REPLACE INTO audio (key, size, used) VALUES (?, ?, ?)', (key, size, time.time()))
+        total = conn.execute('SELECT SUM(size) FROM audio').fetchone()[0] or 0
+        if total > limit:
+            for old_key, old_size in conn.execute('SELECT key, size FROM audio ORDER BY used').fetchall():
+                if total <= limit:
+                    break
+                Path(f'{_store_dir()}/{old_key}.wav').unlink(missing_ok=True)
+                conn.execute('DELETE FROM audio WHERE key=?', (old_key,))
+                total -= old_size
+
+
+def stats() -> dict:
+    """本进程内的命中与未命中次数"""
+    with _stats_lock:
+        return dict(_stats)
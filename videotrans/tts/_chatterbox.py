@@ -7,8 +7,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Union
 
-import httpx
-import requests
 from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
@@ -50,7 +48,7 @@ class ChatterBoxTTS(BaseTTS):
                     self.inst.precent += 0.1
                 return
             client = OpenAI(api_key='123456', base_url=self.api_url + '/v1',
-                            http_client=httpx.Client(proxy=None, timeout=7200))
+                            http_client=self._httpx_client())
             response = client.audio.speech.create(
                 model="chatterbox-tts",  # 这是一个兼容性参数
                 voice=self.language,  # 这也是一个兼容性参数
@@ -101,7 +99,7 @@ class ChatterBoxTTS(BaseTTS):
                 'language': self.language
             }
             # 发送POST请求，设置合理的超时时间
-            response = requests.post(
+            response = self._http('post', 
                 self.api_url + '/v2/audio/speech_with_prompt',
                 data=form_data,
                 files=files_payload,
@@ -110,6 +108,4 @@ class ChatterBoxTTS(BaseTTS):
             # 检查HTTP响应状态码，如果不是2xx，则会引发HTTPError
             response.raise_for_status()
             # 将返回的二进制音频内容写入文件
-            with open(filename + ".mp3", 'wb') as output_file:
-                output_file.write(response.content)
-            self.convert_to_wav(filename + ".mp3", filename)
+            self.bytes_to_wav(response.content, filename)
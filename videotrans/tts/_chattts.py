@@ -5,7 +5,6 @@ import time
 from dataclasses import dataclass
 from pathlib import Path
 
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -44,7 +43,7 @@ class ChatTTS(BaseTTS):
             if self._exit() or tools.vail_file(data_item['filename']):
                 return
             data = {"text": data_item['text'], "voice": data_item['role'], 'prompt': '', 'is_split': 1}
-            res = requests.post(f"{self.api_url}/tts", data=data, proxies=self.proxies, timeout=3600)
+            res = self._http('post', f"{self.api_url}/tts", data=data, proxies=self.proxies, timeout=3600)
             res.raise_for_status()
             config.logger.info(f'chatTTS:{data=}')
             res = res.json()
@@ -66,14 +65,11 @@ class ChatTTS(BaseTTS):
                 self._signal(text=f'{config.transobj["kaishipeiyin"]} {self.has_done}/{self.len}')
                 return
 
-            resb = requests.get(res['url'])
+            resb = self._http('get', res['url'])
             resb.raise_for_status()
 
             config.logger.info(f'ChatTTS:resb={resb.status_code=}')
-            with open(data_item['filename'] + ".wav", 'wb') as f:
-                f.write(resb.content)
-            time.sleep(1)
-            self.convert_to_wav(data_item['filename'] + ".wav", data_item['filename'])
+            self.bytes_to_wav(resb.content, data_item['filename'], ext='wav')
 
             if self.inst and self.inst.precent < 80:
                 self.inst.precent += 0.1
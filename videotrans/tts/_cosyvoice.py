@@ -1,10 +1,7 @@
-import os
 import logging
-import time
 from dataclasses import dataclass
 from pathlib import Path
 
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -90,17 +87,11 @@ class CosyVoice(BaseTTS):
                 data['role'] = '中文女'
             config.logger.info(f'请求数据：{api_url=},{data=}')
             # 克隆声音
-            response = requests.post(f"{api_url}", data=data, proxies={"http": "", "https": ""}, timeout=3600)
+            response = self._http('post', f"{api_url}", data=data, proxies={"http": "", "https": ""}, timeout=3600)
             response.raise_for_status()
 
             # 如果是WAV音频流，获取原始音频数据
-            with open(data_item['filename'] + ".wav", 'wb') as f:
-                f.write(response.content)
-            time.sleep(1)
-            if not os.path.exists(data_item['filename'] + ".wav"):
-                time.sleep(RETRY_DELAY)
-                raise RuntimeError(f'CosyVoice 合成声音失败-2')
-            self.convert_to_wav(data_item['filename'] + ".wav", data_item['filename'])
+            self.bytes_to_wav(response.content, data_item['filename'], ext='wav')
 
             if self.inst and self.inst.precent < 80:
                 self.inst.precent += 0.1
@@ -30,6 +30,9 @@ class ElevenLabsC(BaseTTS):
         if pro:
             self.proxies = pro
 
+    def _cache_extra(self):
+        return str(config.params.get("elevenlabstts_models"))
+
     def _item_task(self, data_item: dict = None):
         @retry(retry=retry_if_not_exception_type(NO_RETRY_EXCEPT), stop=(stop_after_attempt(RETRY_NUMS)),
                wait=wait_fixed(RETRY_DELAY), before=before_log(config.logger, logging.INFO),
@@ -46,7 +49,7 @@ class ElevenLabsC(BaseTTS):
 
             client = ElevenLabs(
                 api_key=config.params['elevenlabstts_key'],
-                httpx_client=httpx.Client(proxy=self.proxies) if self.proxies else None
+                httpx_client=self._httpx_client(proxy=self.proxies, timeout=5) if self.proxies else None
             )
 
             response = client.text_to_speech.convert(
@@ -65,11 +68,7 @@ class ElevenLabsC(BaseTTS):
                     use_speaker_boost=True
                 )
             )
-            with open(data_item['filename'] + ".mp3", 'wb') as f:
-                for chunk in response:
-                    if chunk:
-                        f.write(chunk)
-            self.convert_to_wav(data_item['filename'] + ".mp3", data_item['filename'])
+            self.bytes_to_wav(b''.join(chunk for chunk in response if chunk), data_item['filename'])
             if self.inst and self.inst.precent < 80:
                 self.inst.precent += 0.1
             self.has_done += 1
@@ -133,7 +132,7 @@ class ElevenLabsClone():
     def run(self):
         # 转为mp3发送
         mp3_audio = config.TEMP_DIR + f'/elevlabs-clone-{time.time()}.mp3'
-        tools.runffmpeg(['-y', '-i', self.input_file_path, mp3_audio])
+        tools.runffmpeg(['-y', '-i', self.input_file_path, mp3_audio], uuid=self.uuid)
 
         try:
             with open(mp3_audio, "rb") as f:
@@ -156,7 +155,7 @@ class ElevenLabsClone():
                         f.write(dubbed_file)
                     tools.runffmpeg(
                         ['-y', '-i', self.output_file_path + ".mp3", "-ar", "44100", "-ac", "2", "-b:a", "128k",
-                         self.output_file_path])
+                         self.output_file_path], uuid=self.uuid)
                     return True
                 time.sleep(5)
 
@@ -1,6 +1,7 @@
 import copy
 import logging
 import re
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Union
@@ -21,6 +22,8 @@ RETRY_DELAY = 5
 @dataclass
 class F5TTS(BaseTTS):
     v1_local: bool = field(init=False)
+    clients: Dict = field(default_factory=dict, init=False)
+    clients_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
 
     def __post_init__(self):
         super().__post_init__()
@@ -40,6 +43,14 @@ class F5TTS(BaseTTS):
     def _exec(self):
         self._local_mul_thread()
 
+    def _get_client(self, **httpx_kwargs):
+        # Client 初始化时需请求接口信息，同一任务内只创建一次
+        key = tuple(sorted(httpx_kwargs.items()))
+        with self.clients_lock:
+            if key not in self.clients:
+                self.clients[key] = Client(self.api_url, httpx_kwargs=httpx_kwargs, ssl_verify=False)
+            return self.clients[key]
+
     def _item_task_v1(self, data_item: Union[Dict, List, None]):
 
         speed = 1.0
@@ -67,7 +78,7 @@ class F5TTS(BaseTTS):
         if data['ref_text'] and len(data['ref_text']) < 10:
             speed = 0.5
         try:
-            client = Client(self.api_url, httpx_kwargs={"timeout": 7200}, ssl_verify=False)
+            client = self._get_client(timeout=7200)
         except Exception as e:
             raise StopRetry( f'{e}')
         try:
@@ -120,7 +131,7 @@ class F5TTS(BaseTTS):
         if not Path(data['ref_wav']).exists():
             raise StopRetry( f'{role} 角色不存在')
         try:
-            client = Client(self.api_url, httpx_kwargs={"timeout": 7200}, ssl_verify=False)
+            client = self._get_client(timeout=7200)
         except Exception as e:
             raise StopRetry( f'{e}')
         try:
@@ -171,7 +182,7 @@ class F5TTS(BaseTTS):
             raise StopRetry(  f'{role} 角色不存在')
         config.logger.info(f'index-tts {data=}')
         try:
-            client = Client(self.api_url, httpx_kwargs={"timeout": 7200}, ssl_verify=False)
+            client = self._get_client(timeout=7200)
         except Exception as e:
             raise StopRetry(str(e))
         
@@ -232,7 +243,7 @@ class F5TTS(BaseTTS):
             self.error = f'{role} 角色不存在'
             raise StopRetry(self.error)
         try:
-            client = Client(self.api_url, httpx_kwargs={"timeout": 7200, "proxy": None}, ssl_verify=False)
+            client = self._get_client(timeout=7200, proxy=None)
         except Exception as e:
             raise StopRetry(str(e))
         try:
@@ -27,6 +27,9 @@ class GEMINITTS(BaseTTS):
         super().__post_init__()
         self.proxies = self._set_proxy(type='set')
 
+    def _cache_extra(self):
+        return config.params['gemini_ttsmodel']
+
     def _exec(self):
         self.dub_nums = 1
         self._local_mul_thread()
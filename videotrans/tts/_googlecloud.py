@@ -50,6 +50,9 @@ class GoogleCloudTTS(BaseTTS):
         if not self.cred_path or not os.path.isfile(self.cred_path):
             raise RuntimeError("Arquivo de credenciais do Google Cloud TTS não configurado ou não encontrado")
 
+    def _cache_extra(self):
+        return f'{self.language_code}-{self.voice_name}-{self.encoding}-{config.params.get("gcloud_ssml_gender", "")}'
+
     def _check_client(self):
         """Verifica se o cliente TTS está disponível e se o arquivo de credenciais existe."""
         if TextToSpeechClient is None:
@@ -151,15 +154,12 @@ class GoogleCloudTTS(BaseTTS):
             )
 
             # garante diretório
-            out_path = data_item["filename"] + ".mp3"
-            parent = os.path.dirname(out_path)
+            parent = os.path.dirname(data_item["filename"])
             if parent and not os.path.exists(parent):
                 os.makedirs(parent, exist_ok=True)
 
             # grava saída
-            with open(out_path, "wb") as f:
-                f.write(response.audio_content)
-            self.convert_to_wav(out_path, data_item['filename'])
+            self.bytes_to_wav(response.audio_content, data_item['filename'])
             # atualiza progresso
             self.has_done += 1
             self._signal(text=f"{self.has_done}/{self.len}")
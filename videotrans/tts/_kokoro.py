@@ -1,7 +1,6 @@
 import logging
 from dataclasses import dataclass
 
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -43,11 +42,9 @@ class KokoroTTS(BaseTTS):
                 return
 
             data = {"input": data_item['text'], "voice": data_item['role'], "speed": speed}
-            res = requests.post(self.api_url, json=data, proxies=self.proxies, timeout=3600)
+            res = self._http('post', self.api_url, json=data, proxies=self.proxies, timeout=3600)
             res.raise_for_status()
-            with open(data_item['filename'] + ".mp3", 'wb') as f:
-                f.write(res.content)
-            self.convert_to_wav(data_item['filename'] + ".mp3", data_item['filename'])
+            self.bytes_to_wav(res.content, data_item['filename'])
             if self.inst and self.inst.precent < 80:
                 self.inst.precent += 0.1
             self.has_done += 1
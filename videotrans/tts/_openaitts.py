@@ -3,7 +3,6 @@ import logging
 import re
 from dataclasses import dataclass
 
-import httpx
 from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
@@ -30,6 +29,9 @@ class OPENAITTS(BaseTTS):
             if pro:
                 self.proxies = pro
 
+    def _cache_extra(self):
+        return f"{self.api_url}-{config.params['openaitts_model']}"
+
     def _exec(self):
         self.dub_nums = 1
         self._local_mul_thread()
@@ -49,7 +51,7 @@ class OPENAITTS(BaseTTS):
                 return
 
             client = OpenAI(api_key=config.params.get('openaitts_key', ''), base_url=self.api_url,
-                            http_client=httpx.Client(proxy=self.proxies, timeout=7200))
+                            http_client=self._httpx_client(proxy=self.proxies))
             with client.audio.speech.with_streaming_response.create(
                     model=config.params['openaitts_model'],
                     voice=role,
@@ -58,10 +60,8 @@ class OPENAITTS(BaseTTS):
                     speed=speed,
                     instructions=config.params.get('openaitts_instructions', '')
             ) as response:
-                with open(data_item['filename'] + ".mp3", 'wb') as f:
-                    for chunk in response.iter_bytes():
-                        f.write(chunk)
-            self.convert_to_wav(data_item['filename'] + ".mp3", data_item['filename'])
+                audio_data = b''.join(response.iter_bytes())
+            self.bytes_to_wav(audio_data, data_item['filename'])
             if self.inst and self.inst.precent < 80:
                 self.inst.precent += 0.1
             self.has_done += 1
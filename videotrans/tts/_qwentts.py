@@ -3,7 +3,6 @@ import time
 from dataclasses import dataclass
 
 import dashscope
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -24,6 +23,9 @@ class QWENTTS(BaseTTS):
         super().__post_init__()
 
     # 强制单个线程执行，防止频繁并发失败
+    def _cache_extra(self):
+        return config.params.get('qwentts_model', 'qwen-tts-latest')
+
     def _exec(self):
         if not config.params['qwentts_key']:
             raise Exception(
@@ -57,11 +59,9 @@ class QWENTTS(BaseTTS):
                 time.sleep(RETRY_DELAY)
                 raise RuntimeError( f"{response.message if hasattr(response, 'message') else str(response)}")
 
-            resurl = requests.get(response.output.audio["url"])
+            resurl = self._http('get', response.output.audio["url"])
             resurl.raise_for_status()  # 检查请求是否成功
-            with open(data_item['filename'] + '.wav', 'wb') as f:
-                f.write(resurl.content)
-            self.convert_to_wav(data_item['filename'] + ".wav", data_item['filename'])
+            self.bytes_to_wav(resurl.content, data_item['filename'], ext='wav')
 
             if self.inst and self.inst.precent < 80:
                 self.inst.precent += 0.1
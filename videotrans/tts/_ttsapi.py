@@ -6,7 +6,6 @@ from dataclasses import dataclass
 from typing import List, Dict
 from typing import Union
 
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -30,6 +29,9 @@ class TTSAPI(BaseTTS):
         else:
             self.api_url = api_url
 
+    def _cache_extra(self):
+        return f"{self.api_url}-{config.params.get('ttsapi_extra', '')}-{config.params.get('ttsapi_emotion', 'happy')}-{config.params.get('ttsapi_language_boost', 'auto')}"
+
     def _exec(self) -> None:
         self._local_mul_thread()
 
@@ -73,7 +75,7 @@ class TTSAPI(BaseTTS):
             tmp_filename = data_item['filename'] + ".mp3"
             if isinstance(res['data'], str) and res['data'].startswith('http'):
                 url = res['data']
-                res = requests.get(url)
+                res = self._http('get', url)
                 res.raise_for_status()
                 with open(tmp_filename, 'wb') as f:
                     f.write(res.content)
@@ -112,7 +114,7 @@ class TTSAPI(BaseTTS):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
         }
         config.logger.info(f'发送数据 {data=}')
-        resraw = requests.post(f"{self.api_url}", data=data, verify=False, headers=headers, proxies=None)
+        resraw = self._http('post', f"{self.api_url}", data=data, verify=False, headers=headers, proxies=None)
         resraw.raise_for_status()
         return resraw.json()
 
@@ -192,6 +194,6 @@ Serene Woman:Serene_Woman
             'Content-Type': 'application/json'
         }
 
-        response = requests.request("POST", self.api_url, headers=headers, data=payload)
+        response = self._http("post", self.api_url, headers=headers, data=payload)
         response.raise_for_status()
         return response.json()
@@ -6,7 +6,6 @@ import time
 from dataclasses import dataclass, field
 from typing import Dict, Optional, ClassVar
 
-import requests
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type, before_log, after_log, \
     RetryError
 
@@ -113,15 +112,13 @@ class VolcEngineTTS(BaseTTS):
 
                 }
             }
-            resp = requests.post(api_url, json.dumps(request_json), headers=header,
+            resp = self._http('post', api_url, data=json.dumps(request_json), headers=header,
                                  proxies={"http": "", "https": ""},verify=False)
             resp.raise_for_status()
             resp_json = resp.json()
             if "data" in resp_json:
                 data = resp_json["data"]
-                with open(data_item['filename'] + ".mp3", "wb") as f:
-                    f.write(base64.b64decode(data))
-                self.convert_to_wav(data_item['filename'] + ".mp3", data_item['filename'])
+                self.bytes_to_wav(base64.b64decode(data), data_item['filename'])
                 self._signal(text=f'{config.transobj["kaishipeiyin"]} {self.has_done}/{self.len}')
                 return
             if 'code' in resp_json:
@@ -106,7 +106,13 @@ class Ui_setini(object):
                 "homedir": "家目录，用于保存视频分离、字幕配音、字幕翻译等结果的位置，默认用户家目录",
                 "llm_chunk_size": "LLM大模型重新断句时，每次发送多少个字或单词，该值越大断句效果越好，一次性发送全部字幕最佳，但受限于大模型输出token，过长输入可能导致失败",
                 "llm_ai_type": "LLM重新断句时使用的AI渠道，目前支持openai或deepseek渠道",
-                "gemini_recogn_chunk": "使用gemini识别语音时，每次发送音频切片数，越大效果越好，但失败率会升高"
+                "gemini_recogn_chunk": "使用gemini识别语音时，每次发送音频切片数，越大效果越好，但失败率会升高",
+                "prepare_workers": "同时执行预处理(分离音视频等)的任务数，修改后需重启软件",
+                "recogn_workers": "同时执行语音识别的任务数，使用GPU本地模型时建议保持1，修改后需重启软件",
+                "trans_workers": "同时执行字幕翻译的任务数，修改后需重启软件",
+                "dubbing_workers": "同时执行配音的任务数，修改后需重启软件",
+                "align_workers": "同时执行声画对齐的任务数，修改后需重启软件",
+                "assemb_workers": "同时执行最终合成的任务数，修改后需重启软件"
             },
 
             "video": {
@@ -138,6 +144,10 @@ class Ui_setini(object):
                 "aitrans_thread": "AI翻译每次发送字幕行数",
                 "retries": "翻译出错时的重试次数",
                 "translation_wait": "每次翻译后暂停时间/秒,用于限制请求频率",
+                "trans_concurrency": "同时发出的翻译请求数，大于1时多批字幕并发翻译，结果仍按原顺序组装",
+                "trans_rps": "每个翻译渠道每秒最多请求数，0=不限制",
+                "trans_tpm": "每个翻译渠道每分钟最多发送的token数(按字节估算)，0=不限制",
+                "trans_cache_max_rows": "翻译记忆最多保存的字幕行数，已翻译过的行不再重复请求，超出后淘汰最久未使用的，0=不使用缓存",
                 "google_trans_newadd": "批量字幕翻译功能当选择Google渠道时，可在此填写新的目标语言代码，请填写ISO-639 代码,多个以英文逗号分隔，语言代码在此查看  https://cloud.google.com/translate/docs/languages",
                 "aisendsrt": "是否在使用AI/Google翻译时发送完整字幕格式内容"
 
@@ -151,6 +161,18 @@ class Ui_setini(object):
             },
             "justify": {
                 "remove_silence": "是否移除配音末尾空白",
+                "audio_speed_engine": "配音加速引擎，wsola=内存中变速速度最快，pyrubberband=需安装pyrubberband和rubberband，ffmpeg=使用ffmpeg滤镜",
+                "video_clip_workers": "视频慢速对齐时同时裁切的片段数，0=根据CPU核数自动决定",
+                "video_filtergraph_max_segments": "视频慢速对齐时片段数不超过该值则用单个ffmpeg滤镜图一次编码完成，超过则逐片段裁切，0=始终逐片段裁切",
+                "ffprobe_disk_cache": "ffprobe探测结果同时保存到磁盘，重启软件后仍可复用",
+                "tts_cache_max_mb": "配音缓存最大占用空间(MB)，相同渠道、角色、文本和参数的台词只合成一次，超出后删除最久未用的音频，0=不缓存",
+                "tts_max_connections": "每个配音渠道共用的HTTP连接池大小，可写为 10,GPTSoVITS:2 单独设置某个渠道",
+                "tts_host_concurrency": "同一配音接口主机同时进行的最大请求数，0=不限制，可写为 0,CosyVoice:1 单独设置某个渠道",
+                "separate_batch_size": "人声背景分离时每批推理的窗口数，越大越快但占用更多显存/内存，默认4",
+                "recogn_concurrency": "云端语音识别(Gemini/Qwen3-ASR/OpenAI兼容接口)同时发送的片段请求数，结果仍按时间顺序组装，可写为 4,GeminiRecogn:2 单独设置某个渠道",
+                "recogn_rps": "云端语音识别每个渠道每秒最多请求数，0=不限制，可写为 0,Qwen3ASRRecogn:5 单独设置某个渠道",
+                "recogn_chunk_retry": "云端语音识别单个片段失败后的重试次数，只重发失败的片段",
+                "recogn_upload_format": "云端语音识别上传片段的编码格式，可选 wav/flac/mp3/opus，flac无损且小于wav，mp3和opus体积约为wav的1/8，上传慢时可选opus",
             },
             "whisper": {
                 "vad": "是否在faster-whisper字幕整体识别模式时启用VAD",
@@ -165,6 +187,8 @@ class Ui_setini(object):
                 "interval_split": "均等分割模式下每个片段时长秒数",
                 "model_list": "faster模式和openai模式下的模型名字列表，英文逗号分隔",
                 "cuda_com_type": "faster模式时cuda数据类型，int8=消耗资源少，速度快，精度低，float32=消耗资源多，速度慢，精度高，int8_float16=设备自选",
+                "whisper_server_idle": "faster-whisper模型常驻进程空闲多少秒后退出以释放显存，多个视频连续识别时无需重复加载模型，0=每个任务单独加载",
+                "whisper_batch_size": "faster模式均等分割识别时的批量推理大小，CPU使用int8时可成倍提升速度，片段需不超过30s，0=逐段识别",
                 "beam_size": "字幕识别时精度调整，1-5，1=消耗显存最低，5=消耗显存最多",
                 "best_of": "字幕识别时精度调整，1-5，1=消耗显存最低，5=消耗显存最多",
                 "condition_on_previous_text": "若开启将占用更多GPU，效果也更好",
@@ -209,6 +233,12 @@ class Ui_setini(object):
             "llm_ai_type": "LLM重新断句时使用的AI渠道",
             "prompt_init":"Whisper模型提示词",
             "gemini_recogn_chunk": "Gemini语音识别时，单次发送音频切片数",
+            "prepare_workers": "同时预处理任务数",
+            "recogn_workers": "同时语音识别任务数",
+            "trans_workers": "同时翻译任务数",
+            "dubbing_workers": "同时配音任务数",
+            "align_workers": "同时对齐任务数",
+            "assemb_workers": "同时合成任务数",
             "ai302_models": "302.ai翻译模型列表",
             "llm_chunk_size": "LLM重新断句每批次发送字或单词数",
             "ai302tts_models": "302.aiTTS模型列表",
@@ -228,6 +258,18 @@ class Ui_setini(object):
             "zijiehuoshan_model": "字节火山推理接入点",
             "model_list": "faster和openai的模型列表",
             "remove_silence": "移除配音末尾空白",
+            "audio_speed_engine": "配音加速引擎",
+            "video_clip_workers": "视频慢速并发片段数",
+            "video_filtergraph_max_segments": "单次滤镜图最大片段数",
+            "ffprobe_disk_cache": "ffprobe结果磁盘缓存",
+            "tts_cache_max_mb": "配音缓存上限MB",
+            "tts_max_connections": "配音连接池大小",
+            "tts_host_concurrency": "配音单主机并发数",
+            "separate_batch_size": "人声分离批大小",
+            "recogn_concurrency": "识别片段并发数",
+            "recogn_rps": "识别每秒请求数上限",
+            "recogn_chunk_retry": "识别片段重试次数",
+            "recogn_upload_format": "识别片段上传格式",
             "bgm_split_time": "背景音分离切割片段/s",
             "vad": "启用VAD",
 
@@ -248,6 +290,8 @@ class Ui_setini(object):
             "backaudio_volume": "背景音量倍数",
             "loop_backaudio": "循环播放背景音",
             "cuda_com_type": "CUDA数据类型",
+            "whisper_server_idle": "模型常驻空闲秒数",
+            "whisper_batch_size": "均等分割批量大小",
             "beam_size": "字幕识别准确度控制beam_size",
             "best_of": "字幕识别准确度控制best_of",
             "condition_on_previous_text": "上下文感知",
@@ -268,6 +312,10 @@ class Ui_setini(object):
             "azure_lines": "AzureTTS批量行数",
             "chattts_voice": "ChatTTS音色值",
             "translation_wait": "翻译后暂停时间/s",
+            "trans_concurrency": "翻译并发请求数",
+            "trans_rps": "翻译每秒请求数上限",
+            "trans_tpm": "翻译每分钟token上限",
+            "trans_cache_max_rows": "翻译记忆最大行数",
             "dubbing_wait": "配音后暂停时间/s",
             "gemini_model": "Gemini模型列表",
             "google_trans_newadd": "Google字幕翻译新增语言代码",
@@ -326,7 +374,13 @@ class Ui_setini(object):
                     "homedir": "Home directory, used to save the results of video separation, subtitle dubbing, subtitle translation, etc. Default user home directory",
                     "llm_chunk_size": "When the LLM large model re-segmentation, how many words to send each time to prevent the subtitles from being too long and exceeding the LLM output limit",
                     "llm_ai_type": "The AI channel used when LLM re-segmentation, currently supports openai or deepseek channels",
-                    "gemini_recogn_chunk": "When using Gemini to recognize speech, the larger the number of audio slices sent each time, the better the effect, but the failure rate will increase"
+                    "gemini_recogn_chunk": "When using Gemini to recognize speech, the larger the number of audio slices sent each time, the better the effect, but the failure rate will increase",
+                    "prepare_workers": "Number of tasks preprocessed (audio/video split etc.) concurrently, restart required",
+                    "recogn_workers": "Number of tasks recognized concurrently, keep 1 when using local GPU models, restart required",
+                    "trans_workers": "Number of tasks translated concurrently, restart required",
+                    "dubbing_workers": "Number of tasks dubbed concurrently, restart required",
+                    "align_workers": "Number of tasks aligned concurrently, restart required",
+                    "assemb_workers": "Number of tasks assembled concurrently, restart required"
                 },
                 "video": {
                     "crf": "Loss control during video transcoding, 0 = minimum loss, 51 = maximum loss, default is 13",
@@ -364,6 +418,10 @@ class Ui_setini(object):
                     "aitrans_thread": "Number of subtitles AI translated simultaneously",
                     "retries": "Number of retries when translation fails",
                     "translation_wait": "Pause time in seconds after each translation, used to limit request frequency",
+                    "trans_concurrency": "Number of translation requests sent concurrently, batches are still reassembled in order when greater than 1",
+                    "trans_rps": "Max requests per second for each translation channel, 0 = unlimited",
+                    "trans_tpm": "Max tokens per minute for each translation channel (estimated from bytes), 0 = unlimited",
+                    "trans_cache_max_rows": "Max lines kept in translation memory, lines already translated are not requested again, least recently used are evicted, 0 = disable cache",
                     "google_trans_newadd": "Batch Subtitle Translation Function When selecting Google channel, you can fill in the new target language code here, please fill in the ISO-639 code, the language code can be viewed here.  https://cloud.google.com/translate/docs/languages",
                     "aisendsrt": "Sending full subtitle content when use ai translation"
                 },
@@ -376,6 +434,18 @@ class Ui_setini(object):
                 },
                 "justify": {
                     "remove_silence": "Whether to remove silence at the end of the dubbing",
+                    "audio_speed_engine": "Dubbing speed-up engine, wsola = in-memory and fastest, pyrubberband = requires pyrubberband and rubberband, ffmpeg = use ffmpeg filters",
+                    "video_clip_workers": "Number of clips cut concurrently during video slow-down alignment, 0 = decided by CPU cores",
+                    "video_filtergraph_max_segments": "During video slow-down alignment, encode in a single ffmpeg filtergraph pass when the clip count is at most this value, otherwise cut clip by clip, 0 = always cut clip by clip",
+                    "ffprobe_disk_cache": "Also save ffprobe results to disk so they can be reused after restart",
+                    "tts_cache_max_mb": "Max size of the dubbing cache in MB. Lines with the same provider, role, text and parameters are synthesized once, least recently used audio is removed when full, 0 = disabled",
+                    "tts_max_connections": "HTTP connection pool size shared by each dubbing provider, write e.g. 10,GPTSoVITS:2 to set a provider separately",
+                    "tts_host_concurrency": "Max concurrent requests to the same dubbing API host, 0 = unlimited, write e.g. 0,CosyVoice:1 to set a provider separately",
+                    "separate_batch_size": "Number of windows inferred per batch when separating vocals and background, larger is faster but uses more GPU/RAM, default 4",
+                    "recogn_concurrency": "Number of chunk requests sent concurrently by cloud speech recognition (Gemini/Qwen3-ASR/OpenAI compatible), results are still reassembled in time order, write e.g. 4,GeminiRecogn:2 to set a provider separately",
+                    "recogn_rps": "Max requests per second for each cloud speech recognition provider, 0 = unlimited, write e.g. 0,Qwen3ASRRecogn:5 to set a provider separately",
+                    "recogn_chunk_retry": "Retries for a failed cloud speech recognition chunk, only the failed chunk is resent",
+                    "recogn_upload_format": "Encoding of chunks uploaded for cloud speech recognition: wav/flac/mp3/opus. flac is lossless and smaller than wav, mp3 and opus are about 1/8 the size of wav, choose opus on slow links",
                 },
                 "whisper": {
                     "vad": "Enable VAD in faster-whisper overall subtitle recognition mode",
@@ -390,6 +460,8 @@ class Ui_setini(object):
 
                     "model_list": "Model names list for faster mode and openai mode, separated by commas",
                     "cuda_com_type": "Data type for cuda in faster mode, int8 = less resource usage, faster speed, lower precision, float32 = more resource usage, slower speed, higher precision, int8_float16 = device auto-select",
+                    "whisper_server_idle": "Seconds an idle faster-whisper model process stays loaded before exiting, so consecutive videos do not reload the model, 0 = load per task",
+                    "whisper_batch_size": "Batch size for batched inference in faster-whisper equal-division mode, several times faster on CPU with int8, segments must be at most 30s, 0 = one segment at a time",
                     "beam_size": "Precision adjustment during subtitle recognition, 1-5, 1 = lowest memory usage, 5 = highest memory usage",
                     "best_of": "Precision adjustment during subtitle recognition, 1-5, 1 = lowest memory usage, 5 = highest memory usage",
                     "condition_on_previous_text": "true = more GPU usage and better performance, false = less GPU usage but slightly worse performance",
@@ -446,6 +518,12 @@ class Ui_setini(object):
                 "llm_ai_type": "The AI channel used when LLM re-segmentation",
                 "prompt_init":"Whisper model prompt initial",
                 "gemini_recogn_chunk": "Gemini to recognize speech,number of audio slices sent",
+                "prepare_workers": "Concurrent preprocess tasks",
+                "recogn_workers": "Concurrent recognition tasks",
+                "trans_workers": "Concurrent translation tasks",
+                "dubbing_workers": "Concurrent dubbing tasks",
+                "align_workers": "Concurrent alignment tasks",
+                "assemb_workers": "Concurrent assembling tasks",
                 "homedir": "Set Home directory",
                 "llm_chunk_size": "LLM re-segmentation sends each batch of words",
                 "ai302_models": "302.ai Translation Models",
@@ -466,6 +544,18 @@ class Ui_setini(object):
                 "zijiehuoshan_model": "Byte Volcano Inference Access Point",
                 "model_list": "Models for Faster and OpenAI",
                 "remove_silence": "Remove End Silence in Dubbing",
+                "audio_speed_engine": "Dubbing speed-up engine",
+                "video_clip_workers": "Concurrent video slow-down clips",
+                "video_filtergraph_max_segments": "Max clips for single-pass filtergraph",
+                "ffprobe_disk_cache": "ffprobe disk cache",
+                "tts_cache_max_mb": "Dubbing cache limit MB",
+                "tts_max_connections": "Dubbing connection pool size",
+                "tts_host_concurrency": "Dubbing per-host concurrency",
+                "separate_batch_size": "Vocal separation batch size",
+                "recogn_concurrency": "Recognition chunk concurrency",
+                "recogn_rps": "Recognition requests per second",
+                "recogn_chunk_retry": "Recognition chunk retries",
+                "recogn_upload_format": "Recognition chunk upload format",
                 "bgm_split_time": "bgm segment time/s",
 
                 "max_speech_duration_s": "max speech duration sec.",
@@ -486,6 +576,8 @@ class Ui_setini(object):
                 "backaudio_volume": "Background Volume Multiplier",
                 "loop_backaudio": "Loop Background Audio",
                 "cuda_com_type": "CUDA Data Type",
+                "whisper_server_idle": "Idle seconds to keep model loaded",
+                "whisper_batch_size": "Equal-division batch size",
                 "beam_size": "Subtitle Recognition Accuracy Control 1",
                 "best_of": "Subtitle Recognition Accuracy Control 2",
                 "condition_on_previous_text": "Context Awareness",
@@ -507,6 +599,10 @@ class Ui_setini(object):
                 "azure_lines": "Azure TTS Batch Line Count",
                 "chattts_voice": "ChatTTS Voice Tone Value",
                 "translation_wait": "Pause Time After Translation",
+                "trans_concurrency": "Concurrent Translation Requests",
+                "trans_rps": "Translation Requests per Second",
+                "trans_tpm": "Translation Tokens per Minute",
+                "trans_cache_max_rows": "Translation Memory Max Lines",
                 "dubbing_wait": "Pause Time After Dubbing",
                 "gemini_model": "Gemini Model List",
                 "google_trans_newadd": "Google translation subtitles new language code",
@@ -3,10 +3,11 @@ import re
 import time
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QTime, Signal, QTimer, QSize, QEvent, QThread
+from PySide6.QtCore import Qt, QTime, Signal, QTimer, QSize, QEvent, QThread, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QFont, QColor, QDragEnterEvent, QDropEvent
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QScrollArea, QLabel, QComboBox, QPushButton, QLineEdit, \
-    QFileDialog, QTextEdit, QFontDialog, QColorDialog, QTimeEdit
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QComboBox, QPushButton, QLineEdit, \
+    QFileDialog, QFontDialog, QColorDialog, QTimeEdit, QTableView, QStyledItemDelegate, QPlainTextEdit, \
+    QHeaderView, QAbstractItemView, QSpinBox
 
 from videotrans import translator
 from videotrans.configure import config
@@ -27,7 +28,133 @@ class NoWheelTimeEdit(QTimeEdit):
         return super().eventFilter(obj, event)
 
 
-class DropWidget(QWidget):
+class SubtitleModel(QAbstractTableModel):
+    """
+    字幕数据，每行为 {"start": 开始毫秒, "end": 结束毫秒, "text": 文字}
+    列依次为 行号、开始时间、结束时间、文字
+    视图只绘制可见行，编辑控件由委托在编辑时创建，字幕行数增加时加载耗时和内存基本不变
+    """
+    TIME_FORMAT = "HH:mm:ss.zzz"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.headers = ['行', '开始时间', '结束时间', '字幕'] if config.defaulelang == 'zh' else ['Line', 'Start', 'End',
+                                                                                             'Subtitle']
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 4
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        it = self.rows[index.row()]
+        col = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if col == 0:
+                return f'[{index.row() + 1}]'
+            if col == 3:
+                return it['text']
+            ms = it['start'] if col == 1 else it['end']
+            if role == Qt.EditRole:
+                return QTime.fromMSecsSinceStartOfDay(ms)
+            return QTime.fromMSecsSinceStartOfDay(ms).toString(self.TIME_FORMAT)
+        if role == Qt.TextAlignmentRole and col < 3:
+            return Qt.AlignCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return flags | Qt.ItemIsEditable if index.column() > 0 else flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() == 0:
+            return False
+        it = self.rows[index.row()]
+        if index.column() == 3:
+            it['text'] = value
+        else:
+            ms = value.msecsSinceStartOfDay() if isinstance(value, QTime) else int(value)
+            it['start' if index.column() == 1 else 'end'] = ms
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def insert_row(self, row, item):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(row, item)
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+
+    def shift(self, ms, rows=None):
+        """开始和结束时间整体平移 ms 毫秒，rows 为空时平移所有行，平移后小于0的按0处理"""
+        if not self.rows:
+            return
+        rows = range(len(self.rows)) if not rows else rows
+        for row in rows:
+            it = self.rows[row]
+            it['start'] = max(0, it['start'] + ms)
+            it['end'] = max(0, it['end'] + ms)
+        self.dataChanged.emit(self.index(0, 1), self.index(len(self.rows) - 1, 2), [Qt.DisplayRole, Qt.EditRole])
+
+    def find(self, text, start=0):
+        """从 start 行开始向后查找包含 text 的行，到末尾后从头继续，找不到返回 -1"""
+        text = text.strip().lower()
+        total = len(self.rows)
+        if not text or total < 1:
+            return -1
+        for i in range(total):
+            row = (start + i) % total
+            if text in self.rows[row]['text'].lower():
+                return row
+        return -1
+
+
+class TimeDelegate(QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        editor = NoWheelTimeEdit(parent)
+        editor.setDisplayFormat(SubtitleModel.TIME_FORMAT)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setTime(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.time(), Qt.EditRole)
+
+
+class TextDelegate(QStyledItemDelegate):
+    # 多行文字，双语字幕时原文译文各占一行
+    def createEditor(self, parent, option, index):
+        return QPlainTextEdit(parent)
+
+    def setEditorData(self, editor, index):
+        editor.setPlainText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.toPlainText(), Qt.EditRole)
+
+
+class SubtitleTableView(QTableView):
     fileDropped = Signal(str)  # 自定义信号
 
     def __init__(self, parent=None):
@@ -40,6 +167,12 @@ class DropWidget(QWidget):
         else:
             event.ignore()
 
+    def dragMoveEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
     def dropEvent(self, event: QDropEvent):
         urls = event.mimeData().urls()
         for url in urls:
@@ -48,33 +181,12 @@ class DropWidget(QWidget):
                 self.fileDropped.emit(file_path)  # 发射信号
                 break
 
-    def handle_dropped_file(self, file_path):
-        # 处理文件，例如解析SRT, VTT, ASS字幕
-        return file_path
-
     def is_valid_file(self, file_path):
         # Check file extension
         valid_extensions = ('.srt', '.ass', '.vtt')
         return file_path.lower().endswith(valid_extensions)
 
 
-class DropScrollArea(QScrollArea):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setAcceptDrops(True)  # 启用拖放
-
-    def dragEnterEvent(self, event: QDragEnterEvent):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-        else:
-            event.ignore()
-
-    def dropEvent(self, event: QDropEvent):
-        # 将事件传递到子部件
-        widget = self.widget()
-        if widget:
-            widget.dragEnterEvent(event)
-            widget.dropEvent(event)
 
 
 class SignThread(QThread):
@@ -121,7 +233,6 @@ class Ui_subtitleEditor(QWidget):
         super().__init__()
         self.has_done = False
         self.target_file = None
-        self.lastend_time = 0
 
         self.setWindowTitle("Subtitle Editor" if config.defaulelang != 'zh' else '导入字幕编辑修改后导出')
         # self.resize(1200, 640)
@@ -196,22 +307,46 @@ class Ui_subtitleEditor(QWidget):
 
         main_layout.addLayout(self.fanyi_layout)
 
-        # 第二行：内容区域（初始为空白）
-        self.content_widget = DropWidget()
-        self.content_layout = QVBoxLayout()
-        self.content_layout.setAlignment(Qt.AlignTop)  # 顶部对齐
-        self.content_widget.setLayout(self.content_layout)
-        self.content_widget.fileDropped.connect(self.load_subtitles)
-        # 启用拖放
-
-        # 创建滚动区域并设置内容区域为其子部件
-        self.scroll_area = DropScrollArea()
-        self.scroll_area.setObjectName("scroll_area")
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.content_widget)
-        self.loglabel.setVisible(True)
-        main_layout.addWidget(self.scroll_area)
-        self.scroll_area.setStyleSheet("""#scroll_area{border:1px solid #32414B}""")
+        # 查找、增删行、批量平移时间，导入字幕后显示
+        self.edit_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setFixedWidth(250)
+        self.search_edit.setPlaceholderText(
+            '输入文字查找，回车查找下一处' if config.defaulelang == 'zh' else 'Type to search, Enter for next match')
+        self.search_edit.textChanged.connect(lambda: self.search_subtitle(next_match=False))
+        self.search_edit.returnPressed.connect(lambda: self.search_subtitle(next_match=True))
+        self.search_next = QPushButton('下一处' if config.defaulelang == 'zh' else 'Next')
+        self.search_next.setCursor(Qt.PointingHandCursor)
+        self.search_next.clicked.connect(lambda: self.search_subtitle(next_match=True))
+
+        self.add_button = QPushButton('在选中行下方增加一行' if config.defaulelang == 'zh' else 'Add a line below')
+        self.add_button.setCursor(Qt.PointingHandCursor)
+        self.add_button.clicked.connect(self.add_subtitle_row_below)
+        self.delete_button = QPushButton('删除选中行' if config.defaulelang == 'zh' else 'Delete selected rows')
+        self.delete_button.setCursor(Qt.PointingHandCursor)
+        self.delete_button.clicked.connect(self.delete_subtitle_rows)
+
+        self.shift_ms = QSpinBox()
+        self.shift_ms.setRange(-86400000, 86400000)
+        self.shift_ms.setSingleStep(100)
+        self.shift_ms.setSuffix(' ms')
+        self.shift_ms.setFixedWidth(120)
+        self.shift_button = QPushButton('平移时间' if config.defaulelang == 'zh' else 'Shift Time')
+        self.shift_button.setCursor(Qt.PointingHandCursor)
+        self.shift_button.setToolTip(
+            '选中行的开始和结束时间整体前移(负数)或后移，未选中时平移全部字幕' if config.defaulelang == 'zh' else 'Shift start and end times of the selected rows earlier (negative) or later, all rows when none is selected')
+        self.shift_button.clicked.connect(self.shift_subtitle_time)
+
+        self.edit_layout.addWidget(self.search_edit)
+        self.edit_layout.addWidget(self.search_next)
+        self.edit_layout.addStretch()
+        self.edit_layout.addWidget(self.add_button)
+        self.edit_layout.addWidget(self.delete_button)
+        self.edit_layout.addWidget(self.shift_ms)
+        self.edit_layout.addWidget(self.shift_button)
+        tools.hide_show_element(self.edit_layout, False)
+
+        main_layout.addLayout(self.edit_layout)
 
         loglayout = QHBoxLayout()
         loglayout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
@@ -219,8 +354,35 @@ class Ui_subtitleEditor(QWidget):
         loglayout.addStretch()
         loglayout.addWidget(self.loglabel)
         loglayout.addStretch()
-
-        self.content_layout.addLayout(loglayout)
+        main_layout.addLayout(loglayout)
+
+        # 第二行：内容区域，表格只创建可见行，双击单元格编辑
+        self.model = SubtitleModel(self)
+        self.table = SubtitleTableView()
+        self.table.setObjectName("scroll_area")
+        self.table.setStyleSheet("""#scroll_area{border:1px solid #32414B}""")
+        self.table.setModel(self.model)
+        time_delegate = TimeDelegate(self.table)
+        self.table.setItemDelegateForColumn(1, time_delegate)
+        self.table.setItemDelegateForColumn(2, time_delegate)
+        self.table.setItemDelegateForColumn(3, TextDelegate(self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        self.table.setWordWrap(True)
+        # 固定行高和列宽，不按内容逐行计算尺寸
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(50)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Fixed)
+        header.resizeSection(0, 70)
+        header.resizeSection(1, 130)
+        header.resizeSection(2, 130)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.fileDropped.connect(self.load_subtitles)
+        main_layout.addWidget(self.table)
 
         # 第三行：输出字幕格式下拉框和相关选项
         format_layout = QHBoxLayout()
@@ -392,20 +554,11 @@ class Ui_subtitleEditor(QWidget):
         if not Path(self.target_file).exists():
             return tools.show_error('翻译失败' if config.defaulelang == 'zh' else 'Translate failed')
         target_list = tools.get_subtitle_from_srt(self.target_file)
-        for i in range(self.content_layout.count()):
-            layout = self.content_layout.itemAt(i)
-            if layout:
-                for j in range(layout.layout().count()):
-                    widget = layout.layout().itemAt(j).widget()
-                    if isinstance(widget, QTextEdit):
-                        text = widget.toPlainText()
-                        try:
-                            tmp = target_list.pop(0)
-                        except:
-                            pass
-                        else:
-                            text = text.strip().replace("\n", '') + "\n" + tmp['text'].strip().replace("\n", '')
-                            widget.setPlainText(text)
+        if not self.model.rows:
+            return
+        for it, tmp in zip(self.model.rows, target_list):
+            it['text'] = it['text'].strip().replace("\n", '') + "\n" + tmp['text'].strip().replace("\n", '')
+        self.model.dataChanged.emit(self.model.index(0, 3), self.model.index(len(self.model.rows) - 1, 3))
 
     def import_subtitles(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -431,6 +584,7 @@ class Ui_subtitleEditor(QWidget):
             self.loglabel.setVisible(False)
             self.loglabel.setText('字幕编辑区' if config.defaulelang == 'zh' else 'Subtitles Edit area')
             tools.hide_show_element(self.fanyi_layout, True)
+            tools.hide_show_element(self.edit_layout, True)
             self.export_format.setVisible(False)
 
         QTimer.singleShot(50, render)
@@ -439,8 +593,8 @@ class Ui_subtitleEditor(QWidget):
         with open(file_path, 'r', encoding='utf-8') as file:
             lines = file.readlines()
 
+        rows = []
         i = 0
-        num = 0
         while i < len(lines):
             if lines[i].strip().isdigit():  # 字幕编号
                 times = lines[i + 1].strip().split(' --> ')
@@ -452,9 +606,9 @@ class Ui_subtitleEditor(QWidget):
                 while i < len(lines) and lines[i].strip():
                     text += lines[i].strip() + "\n"
                     i += 1
-                num += 1
-                self.add_subtitle_row(start_time=start_time, end_time=end_time, text=text.strip(), line=num)
+                rows.append(self._make_row(start_time, end_time, text.strip()))
             i += 1
+        self.model.set_rows(rows)
 
     def load_ass(self, file_path):
         with open(file_path, 'r', encoding='utf-8') as file:
@@ -466,7 +620,7 @@ class Ui_subtitleEditor(QWidget):
         except ValueError:
             raise Exception("ASS 文件格式不正确，未找到 [Events] 部分。")
 
-        num = 0
+        rows = []
         for line in lines[events_start:]:
             line = line.strip()
             if not line or not line.startswith('Dialogue:'):
@@ -477,25 +631,24 @@ class Ui_subtitleEditor(QWidget):
                 start_time = self.parse_ass_time(parts[1].strip())
                 end_time = self.parse_ass_time(parts[2].strip())
                 text = parts[9].strip().replace('\\N', '\n')
-                num += 1
-                self.add_subtitle_row(start_time=start_time, end_time=end_time, text=text, line=num)
+                rows.append(self._make_row(start_time, end_time, text))
             else:
                 Exception(f"ASS 行格式不正确: {line}")
+        self.model.set_rows(rows)
 
     def load_vtt(self, file_path):
         with open(file_path, 'r', encoding='utf-8') as file:
             lines = file.readlines()
 
         # 跳过文件头
+        rows = []
         i = 1
-        num = 0
         while i < len(lines):
             line = lines[i].strip()
             if line:
                 # 处理时间戳和字幕文本
                 times, text = "", ""
                 if '-->' in line:
-                    num += 1  # 更新行号
                     times = line
                     i += 1
                     # 读取字幕文本
@@ -506,57 +659,50 @@ class Ui_subtitleEditor(QWidget):
                     if len(times) == 2:
                         start_time = self.parse_vtt_time(times[0])
                         end_time = self.parse_vtt_time(times[1])
-                        self.add_subtitle_row(start_time=start_time, end_time=end_time, text=text.strip(), line=num)
+                        rows.append(self._make_row(start_time, end_time, text.strip()))
             i += 1
-
-    def add_subtitle_row(self, start_time=(0, 0, 0, 0), end_time=(0, 0, 0, 0), text="", insert_at=None, line=0):
-        subtitle_layout = QHBoxLayout()
-
-        subtitle_layout.addWidget(QLabel(text=f'[{line}]'))
-        start_spinboxes = NoWheelTimeEdit()
-        start_spinboxes.setDisplayFormat("HH:mm:ss.zzz")
-        start_spinboxes.setTime(QTime(*start_time))
-        subtitle_layout.addWidget(start_spinboxes)
-        subtitle_layout.addWidget(QLabel(text='->'))
-
-        end_spinboxes = NoWheelTimeEdit()
-        end_spinboxes.setDisplayFormat("HH:mm:ss.zzz")
-        end_spinboxes.setTime(QTime(*end_time))
-        subtitle_layout.addWidget(end_spinboxes)
-
-        text_edit = QTextEdit(text)
-        text_edit.setFixedHeight(50)
-        subtitle_layout.addWidget(text_edit, stretch=1)
-
-        add_button = QPushButton("+")
-        add_button.setCursor(Qt.PointingHandCursor)
-        add_button.setStyleSheet("""color:#009688;font-size:18px;background-color:transparent""")
-        add_button.setToolTip('在下方增加一行字幕' if config.defaulelang == 'zh' else 'Add a line of captioning below')
-        add_button.clicked.connect(lambda: self.add_subtitle_row_below(subtitle_layout))
-        delete_button = QPushButton("x")
-        delete_button.setCursor(Qt.PointingHandCursor)
-        delete_button.setStyleSheet('''color:#dddddd;background-color:transparent''')
-        delete_button.setToolTip('删除该行' if config.defaulelang == 'zh' else 'delete row')
-        delete_button.clicked.connect(lambda: self.delete_subtitle_row(subtitle_layout))
-
-        subtitle_layout.addWidget(add_button)
-        subtitle_layout.addWidget(delete_button)
-
-        if insert_at is None:
-            self.content_layout.addLayout(subtitle_layout)
-        else:
-            self.content_layout.insertLayout(insert_at + 1, subtitle_layout)
-
-    def delete_subtitle_row(self, layout):
-        for i in reversed(range(layout.count())):
-            widget = layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-        layout.setParent(None)
-
-    def add_subtitle_row_below(self, layout):
-        index = self.content_layout.indexOf(layout)
-        self.add_subtitle_row(start_time=(0, 0, 0, 0), end_time=(0, 0, 0, 0), text="new text", insert_at=index)
+        self.model.set_rows(rows)
+
+    def _make_row(self, start_time, end_time, text):
+        # start_time/end_time 为 parse_time 返回的 (时, 分, 秒, 毫秒)
+        h, m, s, ms = start_time
+        start = ((h * 60 + m) * 60 + s) * 1000 + ms
+        h, m, s, ms = end_time
+        end = ((h * 60 + m) * 60 + s) * 1000 + ms
+        return {"start": start, "end": end, "text": text}
+
+    def _selected_rows(self):
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
+
+    def _select_row(self, row):
+        index = self.model.index(row, 3)
+        self.table.setCurrentIndex(index)
+        self.table.scrollTo(index, QAbstractItemView.PositionAtCenter)
+
+    def add_subtitle_row_below(self):
+        rows = self._selected_rows()
+        row = rows[-1] + 1 if rows else len(self.model.rows)
+        # 新行时间取上一行的结束时间，导出时不会与上一行冲突
+        ms = self.model.rows[row - 1]['end'] if row > 0 else 0
+        self.model.insert_row(row, {"start": ms, "end": ms, "text": "new text"})
+        self._select_row(row)
+
+    def delete_subtitle_rows(self):
+        rows = self._selected_rows()
+        if rows:
+            self.model.remove_rows(rows)
+
+    def shift_subtitle_time(self):
+        if self.shift_ms.value() != 0:
+            self.model.shift(self.shift_ms.value(), self._selected_rows())
+
+    def search_subtitle(self, next_match=False):
+        # 输入时从当前行开始查找，当前行仍匹配则不跳转；回车或“下一处”从下一行开始查找
+        current = self.table.currentIndex().row()
+        start = current + 1 if next_match else max(current, 0)
+        row = self.model.find(self.search_edit.text(), start)
+        if row > -1:
+            self._select_row(row)
 
     def parse_time(self, time_str):
         try:
@@ -646,44 +792,37 @@ class Ui_subtitleEditor(QWidget):
             elif format == "vtt":
                 self.save_vtt(file_path, out_format)
 
+    def _export_rows(self, time_format, out_format=-1):
+        """检查时间顺序，返回 [(开始时间, 结束时间, 文字)]，有错误时提示并返回 None"""
+        lastend_time = 0
+        result = []
+        for index, it in enumerate(self.model.rows, start=1):
+            if it['start'] < lastend_time:
+                return tools.show_error(
+                    f'第{index}行不正确，开始时间不得小于上行字幕的结束时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the start time must not be less than the end time of the previous line of credits')
+            if it['end'] < it['start']:
+                return tools.show_error(
+                    f'第{index}行不正确，结束时间不得小于开始时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the end time must not be less than the start time')
+            lastend_time = it['end']
+            text = it['text']
+            if out_format > -1:
+                text_split = text.strip().split('\n')
+                if len(text_split) > out_format:
+                    text = text_split[out_format]
+            result.append((
+                QTime.fromMSecsSinceStartOfDay(it['start']).toString(time_format),
+                QTime.fromMSecsSinceStartOfDay(it['end']).toString(time_format),
+                text
+            ))
+        return result
+
     def save_srt(self, file_path, out_format=-1):
-        self.lastend_time = 0
+        rows = self._export_rows('HH:mm:ss,zzz', out_format)
+        if rows is None:
+            return
         with open(file_path, 'w', encoding='utf-8') as file:
-            index = 1
-            for i in range(self.content_layout.count()):
-                layout = self.content_layout.itemAt(i)
-                if layout:
-                    start_time, end_time = '', ''
-                    text = ""
-                    n = 0
-                    for j in range(layout.layout().count()):
-                        widget = layout.layout().itemAt(j).widget()
-                        if isinstance(widget, NoWheelTimeEdit):
-                            msec = widget.time().msecsSinceStartOfDay()
-                            msg = ''
-                            if n < 1:
-                                if msec < self.lastend_time:
-                                    msg = f'第{index}行不正确，开始时间不得小于上行字幕的结束时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the start time must not be less than the end time of the previous line of credits'
-                                n += 1
-                                start_time = widget.time().toString('HH:mm:ss,zzz')
-                            else:
-                                if msec < self.lastend_time:
-                                    msg = f'第{index}行不正确，结束时间不得小于开始时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the end time must not be less than the start time'
-                                end_time = widget.time().toString('HH:mm:ss,zzz')
-                            if msg:
-                                return tools.show_error(msg)
-                            self.lastend_time = msec
-                        elif isinstance(widget, QTextEdit):
-                            text = widget.toPlainText().strip()
-                            if out_format > -1:
-                                text_split = text.split('\n')
-                                if len(text_split) > out_format:
-                                    text = text_split[out_format]
-                    if start_time and end_time:
-                        start_str = f"{start_time}"
-                        end_str = f"{end_time}"
-                        file.write(f"{index}\n{start_str} --> {end_str}\n{text}\n\n")
-                        index += 1
+            for index, (start_str, end_str, text) in enumerate(rows, start=1):
+                file.write(f"{index}\n{start_str} --> {end_str}\n{text.strip()}\n\n")
         return True
 
     def qcolor_to_ass_color(self, color, type='fc'):
@@ -697,7 +836,9 @@ class Ui_subtitleEditor(QWidget):
         return f"&H{b:02X}{g:02X}{r:02X}"
 
     def save_ass(self, file_path, out_format=-1):
-        self.lastend_time = 0
+        rows = self._export_rows('HH:mm:ss.zz', out_format)
+        if rows is None:
+            return
         with open(file_path, 'w', encoding='utf-8') as file:
             # 写入 ASS 文件的头部信息
             stem = Path(file_path).stem
@@ -725,88 +866,19 @@ class Ui_subtitleEditor(QWidget):
                 f'Style: Default,{self.selected_font.family()},{self.font_size_edit.text() if self.font_size_edit.text() else "20"},{fontcolor},{fontcolor},{bdcolor},{bgcolor},{int(self.selected_font.bold())},{int(self.selected_font.italic())},0,0,100,100,0,0,1,1,0,2,{left},{right},{vbottom},1\n')
             file.write("\n[Events]\n")
             file.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
-
-            index = 1
-
-            for i in range(self.content_layout.count()):
-                layout = self.content_layout.itemAt(i)
-                if layout:
-                    start_time, end_time = '', ''
-                    text = ""
-                    n = 0
-                    for j in range(layout.layout().count()):
-                        widget = layout.layout().itemAt(j).widget()
-                        if isinstance(widget, NoWheelTimeEdit):
-                            msec = widget.time().msecsSinceStartOfDay()
-                            msg = ''
-                            if n < 1:
-                                if msec < self.lastend_time:
-                                    msg = f'第{index}行不正确，开始时间不得小于上行字幕的结束时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the start time must not be less than the end time of the previous line of credits'
-                                n += 1
-                                start_time = widget.time().toString('HH:mm:ss.zz')
-                            else:
-                                if msec < self.lastend_time:
-                                    msg = f'第{index}行不正确，结束时间不得小于开始时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the end time must not be less than the start time'
-                                end_time = widget.time().toString('HH:mm:ss.zz')
-                            if msg:
-                                return tools.show_error(msg)
-                            self.lastend_time = msec
-                        elif isinstance(widget, QTextEdit):
-                            text = widget.toPlainText()
-                            if out_format > -1:
-                                text_split = text.split('\n')
-                                if len(text_split) > out_format:
-                                    text = text_split[out_format]
-
-                    if start_time and end_time:
-                        start_str = f"{start_time}"
-                        end_str = f"{end_time}"
-                        text = text.replace('\n', '\\N')
-                        file.write(f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{text}\n")
-                        index += 1
+            for start_str, end_str, text in rows:
+                text = text.replace('\n', '\\N')
+                file.write(f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{text}\n")
         return True
 
     def save_vtt(self, file_path, out_format=-1):
-        self.lastend_time = 0
+        rows = self._export_rows('HH:mm:ss.zzz', out_format)
+        if rows is None:
+            return
         with open(file_path, 'w', encoding='utf-8') as file:
             file.write("WEBVTT\n\n")
-            index = 1
-            for i in range(self.content_layout.count()):
-                layout = self.content_layout.itemAt(i)
-                if layout:
-                    start_time, end_time = '', ''
-                    text = ""
-                    n = 0
-                    for j in range(layout.layout().count()):
-                        widget = layout.layout().itemAt(j).widget()
-                        if isinstance(widget, NoWheelTimeEdit):
-                            msec = widget.time().msecsSinceStartOfDay()
-                            msg = ""
-                            if n < 1:
-                                n += 1
-                                if msec < self.lastend_time:
-                                    msg = f'第{index}行不正确，开始时间不得小于上行字幕的结束时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the start time must not be less than the end time of the previous line of credits'
-                                start_time = widget.time().toString('HH:mm:ss.zzz')
-                            else:
-                                if msec < self.lastend_time:
-                                    msg = f'第{index}行不正确，结束时间不得小于开始时间' if config.defaulelang == 'zh' else f'Line {index} is incorrect, the end time must not be less than the start time'
-                                end_time = widget.time().toString('HH:mm:ss.zzz')
-                            if msg:
-                                return tools.show_error(msg)
-                            self.lastend_time = msec
-
-                        elif isinstance(widget, QTextEdit):
-                            text = widget.toPlainText()
-                            if out_format > -1:
-                                text_split = text.split('\n')
-                                if len(text_split) > out_format:
-                                    text = text_split[out_format]
-
-                    if start_time and end_time:
-                        start_str = f"{start_time}"
-                        end_str = f"{end_time}"
-                        file.write(f"{index}\n{start_str} --> {end_str}\n{text}\n\n")
-                        index += 1
+            for index, (start_str, end_str, text) in enumerate(rows, start=1):
+                file.write(f"{index}\n{start_str} --> {end_str}\n{text}\n\n")
         return True
 
     def update_format_options(self):
@@ -829,44 +901,9 @@ class Ui_subtitleEditor(QWidget):
             self.font_size_edit.setVisible(False)
 
     def clear_content_layout(self):
-        # 遍历并删除所有子布局和部件
         self.loglabel.setVisible(True)
         tools.hide_show_element(self.fanyi_layout, False)
+        tools.hide_show_element(self.edit_layout, False)
         self.export_format.setVisible(False)
         self.fanyi_log.setText('')
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            if item is not None:
-                widget = item.widget()
-                if widget and widget.objectName() != 'renderlog':
-                    widget.deleteLater()  # 删除部件
-                layout = item.layout()
-                if layout:
-                    # 递归删除子布局
-                    while layout.count():
-                        sub_item = layout.takeAt(0)
-                        if sub_item is not None:
-                            sub_widget = sub_item.widget()
-                            if sub_widget and sub_widget.objectName() != 'renderlog':
-                                sub_widget.deleteLater()  # 删除部件
-                            sub_layout = sub_item.layout()
-                            if sub_layout:
-                                # 递归删除更深层的布局
-                                self.delete_layout(sub_layout)
-                    if layout.objectName() != 'renderlog':
-                        layout.deleteLater()  # 删除布局
-
-    def delete_layout(self, layout):
-        # 递归删除布局及其子布局和部件
-        while layout.count():
-            item = layout.takeAt(0)
-            if item is not None:
-                widget = item.widget()
-                if widget and widget.objectName() != 'renderlog':
-                    widget.deleteLater()  # 删除部件
-                sub_layout = item.layout()
-                if sub_layout:
-                    # 递归删除更深层的布局
-                    self.delete_layout(sub_layout)
-        if layout.objectName() != 'renderlog_layout':
-            layout.deleteLater()  # 删除布局
+        self.model.set_rows([])
@@ -7,9 +7,14 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from videotrans.configure import _task_state
+
 
 def extract_concise_error(stderr_text: str, max_lines=3, max_length=250) -> str:
     """
@@ -188,8 +193,9 @@ def _build_hw_command(args: list, hw_codec: str):
         ('.mp4', '.mkv', '.mov', '.ts', '.txt'))
 
     # 无字幕嵌入时可尝试硬件解码
-    # 有字幕或 -vf 滤镜时不使用，容易出错且需要上传下载数据
-    if "-c:s" not in new_args and "-vf" not in new_args and is_input_media and is_output_mp4 and config.settings.get(
+    # 有字幕或 -vf/-filter_complex 滤镜时不使用，容易出错且需要上传下载数据
+    has_filter = any(a in new_args for a in ("-vf", "-filter_complex", "-filter_complex_script"))
+    if "-c:s" not in new_args and not has_filter and is_input_media and is_output_mp4 and config.settings.get(
             'cuda_decode', False):
         if encoder_family == 'nvenc':
             hw_decode_opts = ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
@@ -204,7 +210,102 @@ def _build_hw_command(args: list, hw_codec: str):
     return new_args, hw_decode_opts
 
 
-def runffmpeg(arg, *, noextname=None, uuid=None, force_cpu=False):
+# 出错时保留的 ffmpeg stderr 末尾行数
+FFMPEG_STDERR_TAIL = 30
+
+
+def _parse_progress(block: dict) -> dict:
+    """
+    将一组 -progress 输出转为进度信息
+    out_time: 已处理的时长(秒)，speed: 处理速度倍数，fps: 每秒编码帧数，frame: 已编码帧数，end: 是否已结束
+    """
+
+    def _num(value, default=0.0):
+        try:
+            return float(str(value).rstrip('x'))
+        except (TypeError, ValueError):
+            return default
+
+    out_time_us = block.get('out_time_us') or block.get('out_time_ms')
+    return {
+        "out_time": max(0.0, _num(out_time_us) / 1000000),
+        "speed": _num(block.get('speed'), None),
+        "fps": _num(block.get('fps')),
+        "frame": int(_num(block.get('frame'))),
+        "end": block.get('progress') == 'end'
+    }
+
+
+def _exec_ffmpeg(cmd, *, token=None, on_progress=None, creationflags=0):
+    """
+    启动 ffmpeg 并流式读取输出，返回 (返回码, stderr 末尾若干行)
+    stdout 是 -progress pipe:1 输出的 key=value 行，每组以 progress=continue|end 结束，解析后回调 on_progress
+    stderr 只保留最后 FFMPEG_STDERR_TAIL 行，长任务不会在内存中积累全部日志
+    token 为任务的取消标记，取消时结束 ffmpeg 并抛出 TaskCancelled
+    """
+    from collections import deque
+    from videotrans.configure import config
+    if token is not None:
+        token.check()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+        errors='replace',
+        text=True,
+        creationflags=creationflags
+    )
+    if token is not None:
+        token.add_process(proc)
+    tail = deque(maxlen=FFMPEG_STDERR_TAIL)
+
+    def _read_stderr():
+        for line in proc.stderr:
+            if line.strip():
+                tail.append(line.rstrip())
+
+    def _read_progress():
+        block = {}
+        for line in proc.stdout:
+            key, sep, value = line.strip().partition('=')
+            if not sep:
+                continue
+            block[key] = value
+            if key != 'progress':
+                continue
+            if on_progress:
+                try:
+                    on_progress(_parse_progress(block))
+                except Exception as e:
+                    config.logger.warning(f'ffmpeg 进度回调出错:{e}')
+            block = {}
+
+    readers = [threading.Thread(target=_read_stderr, daemon=True),
+               threading.Thread(target=_read_progress, daemon=True)]
+    for t in readers:
+        t.start()
+    try:
+        while True:
+            try:
+                proc.wait(timeout=1)
+                break
+            except subprocess.TimeoutExpired:
+                # 界面停止开关等变化时也能及时结束 ffmpeg
+                if token is not None and token.cancelled:
+                    proc.kill()
+        for t in readers:
+            t.join()
+    finally:
+        if token is not None:
+            token.remove_process(proc)
+    if token is not None:
+        token.check()
+    return proc.returncode, "\n".join(tail)
+
+
+def runffmpeg(arg, *, noextname=None, uuid=None, force_cpu=False, on_progress=None):
     """
     执行 ffmpeg 命令，智能应用硬件加速并处理平台兼容性。
 
@@ -215,6 +316,7 @@ def runffmpeg(arg, *, noextname=None, uuid=None, force_cpu=False):
         noextname (str, optional): 用于任务队列跟踪的标识符。
         uuid (str, optional): 用于进度更新的 UUID。
         force_cpu (bool): 如果为 True，则强制使用 CPU 编码，不尝试硬件加速。
+        on_progress (callable, optional): 进度回调，参数见 _parse_progress，传入时自动添加 -progress pipe:1。
     """
     from videotrans.configure import config
     arg_copy = copy.deepcopy(arg)
@@ -247,6 +349,8 @@ def runffmpeg(arg, *, noextname=None, uuid=None, force_cpu=False):
             config.logger.info("未找到或未选择硬件编码器，将使用软件编码。")
 
     cmd = [config.FFMPEG_BIN, "-hide_banner", "-ignore_unknown"]
+    if on_progress:
+        cmd.extend(["-progress", "pipe:1", "-nostats"])
     if "-y" not in final_args:
         cmd.append("-y")
     cmd.extend(hw_decode_opts)
@@ -272,16 +376,10 @@ def runffmpeg(arg, *, noextname=None, uuid=None, force_cpu=False):
         if sys.platform == 'win32':
             creationflags = subprocess.CREATE_NO_WINDOW
 
-        subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            encoding="utf-8",
-            errors='replace',
-            check=True,
-            text=True,
-            creationflags=creationflags
-        )
+        returncode, stderr = _exec_ffmpeg(cmd, token=_task_state.get(uuid), on_progress=on_progress,
+                                          creationflags=creationflags)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
         if noextname:
             config.queue_novice[noextname] = "end"
         return True
@@ -309,17 +407,114 @@ def runffmpeg(arg, *, noextname=None, uuid=None, force_cpu=False):
                     fallback_args.append(arg_copy[i])
                     i += 1
 
-            return runffmpeg(fallback_args, noextname=noextname, uuid=uuid, force_cpu=True)
+            return runffmpeg(fallback_args, noextname=noextname, uuid=uuid, force_cpu=True, on_progress=on_progress)
 
         if noextname: config.queue_novice[noextname] = "error"
         raise RuntimeError(extract_concise_error(e.stderr))
 
+    except _task_state.TaskCancelled:
+        if noextname: config.queue_novice[noextname] = "error"
+        raise
+
     except Exception as e:
         if noextname: config.queue_novice[noextname] = "error"
         config.logger.exception(f"执行 ffmpeg 时发生未知错误 (force_cpu={force_cpu})。")
         raise
 
 
+# ffmpeg 能力表，按 ffmpeg 可执行文件区分，保存在 cache/ffmpeg_caps.json，与其他运行时缓存一起由"清理缓存"清空
+_caps = None
+_caps_lock = threading.Lock()
+
+
+def _ffmpeg_binary_key() -> str:
+    """ffmpeg 可执行文件的路径、大小和修改时间，更换或升级 ffmpeg 后自动失效"""
+    from videotrans.configure import config
+    path = shutil.which(config.FFMPEG_BIN) or config.FFMPEG_BIN
+    try:
+        st = Path(path).stat()
+        return f'{Path(path).resolve().as_posix()}|{st.st_size}|{st.st_mtime_ns}'
+    except OSError:
+        return path
+
+
+def _caps_file() -> Path:
+    from videotrans.configure import config
+    return Path(config.CACHE_DIR) / 'ffmpeg_caps.json'
+
+
+def _ffmpeg_output(*args) -> str:
+    from videotrans.configure import config
+    creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+    try:
+        return subprocess.run([config.FFMPEG_BIN, '-hide_banner', *args], capture_output=True, text=True,
+                              encoding='utf-8', errors='ignore', creationflags=creationflags, timeout=30).stdout
+    except Exception as e:
+        config.logger.warning(f'执行 ffmpeg {args} 失败:{e}')
+        return ''
+
+
+def _detect_capabilities() -> dict:
+    """执行 ffmpeg -version/-encoders/-filters/-hwaccels 获取能力表"""
+    version = _ffmpeg_output('-version').strip().split("\n")[0]
+    # 两种列表都以 ------ 行分隔表头，之后每行第2列为名称
+    encoders = []
+    started = False
+    for line in _ffmpeg_output('-encoders').split("\n"):
+        if line.strip().startswith('------'):
+            started = True
+            continue
+        parts = line.split()
+        if started and len(parts) > 1:
+            encoders.append(parts[1])
+    filters = []
+    for line in _ffmpeg_output('-filters').split("\n"):
+        parts = line.split()
+        # 格式为 "标志 名称 输入->输出 说明"
+        if len(parts) > 2 and '->' in parts[2]:
+            filters.append(parts[1])
+    hwaccels = []
+    for line in _ffmpeg_output('-hwaccels').split("\n"):
+        line = line.strip()
+        if line and not line.endswith(':'):
+            hwaccels.append(line)
+    return {"version": version, "encoders": encoders, "filters": filters, "hwaccels": hwaccels, "video_codec": {}}
+
+
+def _save_capabilities():
+    from videotrans.configure import config
+    try:
+        _caps_file().parent.mkdir(parents=True, exist_ok=True)
+        _caps_file().write_text(json.dumps(_caps, ensure_ascii=False), encoding='utf-8')
+    except OSError as e:
+        config.logger.warning(f'保存 ffmpeg 能力表失败:{e}')
+
+
+def ffmpeg_capabilities(refresh: bool = False) -> dict:
+    """
+    返回当前 ffmpeg 的能力表 {version, encoders, filters, hwaccels, video_codec}
+    首次调用时从磁盘读取，ffmpeg 可执行文件变化或 refresh=True 时重新检测，同一进程内只检测一次
+    video_codec 保存 get_video_codec 的硬件编码器测试结果
+    """
+    global _caps
+    from videotrans.configure import config
+    with _caps_lock:
+        key = _ffmpeg_binary_key()
+        if _caps is None:
+            try:
+                _caps = json.loads(_caps_file().read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                _caps = {}
+        if refresh or key not in _caps:
+            config.logger.info(f'检测 ffmpeg 能力:{key}')
+            # 只保留当前 ffmpeg 的记录
+            _caps = {key: _detect_capabilities()}
+            # 未找到 ffmpeg 时不保存，下次运行重新检测
+            if _caps[key]['version']:
+                _save_capabilities()
+        return _caps[key]
+
+
 def get_video_codec(force_test: bool = False) -> str:
     """
     通过测试确定最佳可用的硬件加速 H.264/H.265 编码器。
@@ -350,6 +545,13 @@ def get_video_codec(force_test: bool = False) -> str:
     if not force_test and cache_key in _codec_cache:
         config.logger.info(f"返回缓存的编解码器 {cache_key}: {_codec_cache[cache_key]}")
         return _codec_cache[cache_key]
+    # 上次运行的测试结果，ffmpeg 未变化时直接使用
+    caps = ffmpeg_capabilities()
+    caps_key = f'{plat}-{video_codec_pref}'
+    if not force_test and caps_key in caps['video_codec']:
+        _codec_cache[cache_key] = caps['video_codec'][caps_key]
+        config.logger.info(f"使用已保存的编解码器 {cache_key}: {_codec_cache[cache_key]}")
+        return _codec_cache[cache_key]
 
     h_prefix, default_codec = ('hevc', 'libx265') if video_codec_pref == 265 else ('h264', 'libx264')
     if video_codec_pref not in [264, 265]:
@@ -373,7 +575,7 @@ def get_video_codec(force_test: bool = False) -> str:
         timestamp = int(time.time() * 1000)
         output_file = temp_dir / f"test_{encoder_to_test}_{timestamp}.mp4"
         command = [
-            "ffmpeg", "-y", "-hide_banner",
+            config.FFMPEG_BIN, "-y", "-hide_banner",
             "-t", "1", "-i", str(test_input_file),
             "-c:v", encoder_to_test, "-f", "mp4", str(output_file)
         ]
@@ -431,6 +633,9 @@ def get_video_codec(force_test: bool = False) -> str:
                         config.logger.info("未找到 torch 模块，将直接尝试 nvenc 测试。")
 
                 full_encoder_name = f"{h_prefix}_{encoder_suffix}"
+                # ffmpeg 未编译该编码器时无需测试
+                if caps['encoders'] and full_encoder_name not in caps['encoders']:
+                    continue
                 if test_encoder_internal(full_encoder_name):
                     selected_codec = full_encoder_name
                     config.logger.info(f"已选择硬件编码器: {selected_codec}")
@@ -447,6 +652,9 @@ def get_video_codec(force_test: bool = False) -> str:
 
     # --- 最终结果 ---
     _codec_cache[cache_key] = selected_codec
+    with _caps_lock:
+        caps['video_codec'][caps_key] = selected_codec
+        _save_capabilities()
     config.logger.info(f"最终确定的编码器: {selected_codec}")
     return selected_codec
 
@@ -517,6 +725,107 @@ def runffprobe(cmd):
         raise
 
 
+# ffprobe 结果缓存，键为 (绝对路径, 文件大小, mtime_ns)，文件被改写后键自然失效
+_PROBE_CACHE_SIZE = 512
+_probe_lock = threading.Lock()
+_probe_cache = OrderedDict()
+_probe_db = None
+
+
+def _probe_key(file_path):
+    p = Path(file_path).resolve()
+    st = p.stat()
+    return p.as_posix(), st.st_size, st.st_mtime_ns
+
+
+def _probe_disk():
+    """高级设置 ffprobe_disk_cache 为真时，使用 cache/ffprobe_cache.db 跨进程、跨会话保存探测结果"""
+    global _probe_db
+    from videotrans.configure import config
+    if not config.settings.get('ffprobe_disk_cache', False):
+        return None
+    if _probe_db is None:
+        from videotrans.util.sqlite_store import SqliteStore
+        # 调用方持有 _probe_lock，被其他进程锁定时不长时间阻塞其他探测
+        _probe_db = SqliteStore(lambda: config.CACHE_DIR + '/ffprobe_cache.db', [
+            'CREATE TABLE IF NOT EXISTS probe (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, data TEXT)'
+        ], 'ffprobe 缓存', timeout=1)
+    return _probe_db
+
+
+def _probe_disk_run(sql, params, fetch=False):
+    """
+    执行一条磁盘缓存语句，磁盘缓存未开启或被锁定、损坏时返回 None，
+    此时只使用进程内 LRU 缓存，不影响 ffprobe 探测
+    """
+    import sqlite3
+    from videotrans.configure import config
+    db = _probe_disk()
+    if db is None:
+        return None
+    try:
+        with db.transaction() as conn:
+            cur = conn.execute(sql, params)
+            return cur.fetchone() if fetch else None
+    except sqlite3.Error as e:
+        config.logger.warning(f'ffprobe 磁盘缓存读写失败，仅使用内存缓存:{e}')
+        return None
+
+
+def probe_media(file_path):
+    """
+    获取 ffprobe -show_format -show_streams 的解析结果，进程内 LRU 缓存，可选磁盘缓存。
+    返回的字典为共享缓存，调用方不可修改
+    """
+    key = _probe_key(file_path)
+    with _probe_lock:
+        if key in _probe_cache:
+            _probe_cache.move_to_end(key)
+            return _probe_cache[key]
+        row = _probe_disk_run('SELECT data FROM probe WHERE path=? AND size=? AND mtime_ns=?', key, fetch=True)
+        if row:
+            data = json.loads(row[0])
+            _probe_cache[key] = data
+            return data
+
+    out = runffprobe(['-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', key[0]])
+    data = json.loads(out)
+    with _probe_lock:
+        _probe_cache[key] = data
+        while len(_probe_cache) > _PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+        _probe_disk_run('INSERT OR REPLACE INTO probe (path, size, mtime_ns, data) VALUES (?, ?, ?, ?)',
+                        (*key, json.dumps(data)))
+    return data
+
+
+def probe_media_many(file_list, max_workers=None):
+    """
+    批量探测，返回 {路径: 探测结果}，未命中缓存的文件并发调用 ffprobe，探测失败的值为 None
+    """
+    from videotrans.configure import config
+
+    def _probe(file_path):
+        try:
+            return probe_media(file_path)
+        except Exception as e:
+            config.logger.warning(f'ffprobe error: {e}. {file_path=}')
+            return None
+
+    file_list = list(file_list)
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 2)) as pool:
+        return dict(zip(file_list, pool.map(_probe, file_list)))
+
+
+def invalidate_probe(file_path):
+    """改写文件后显式清除其探测缓存，避免复制保留mtime或时间精度不足导致读到旧结果"""
+    path = Path(file_path).resolve().as_posix()
+    with _probe_lock:
+        for key in [k for k in _probe_cache if k[0] == path]:
+            _probe_cache.pop(key)
+        _probe_disk_run('DELETE FROM probe WHERE path=?', (path,))
+
+
 def get_video_info(mp4_file, *, video_fps=False, video_scale=False, video_time=False, get_codec=False):
     """
     (兼容性接口) 获取视频信息。
@@ -525,21 +834,13 @@ def get_video_info(mp4_file, *, video_fps=False, video_scale=False, video_time=F
     if not Path(mp4_file).exists():
         raise Exception(f'{mp4_file} is not exists')
     try:
-        out_json = runffprobe(
-            ['-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', mp4_file]
-        )
-        if not out_json:
-            raise Exception('ffprobe error: dont get video information')
+        out = probe_media(mp4_file)
+    except json.JSONDecodeError as e:
+        raise Exception('ffprobe error: failed to parse JSON output') from e
     except Exception as e:
         # 确保抛出的异常与旧版本一致
         raise Exception(f'ffprobe error: {e}. {mp4_file=}') from e
 
-    # 解析 JSON 并填充结果字典
-    try:
-        out = json.loads(out_json)
-    except json.JSONDecodeError as e:
-        raise Exception('ffprobe error: failed to parse JSON output') from e
-
     result = {
         "video_fps": 30,
         "video_codec_name": "",
@@ -753,14 +1054,81 @@ def send_notification(title, message):
 
 # 获取音频时长
 def get_audio_time(audio_file):
-    # 如果存在缓存并且没有禁用缓存
-    out = runffprobe(['-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', audio_file])
-    if out is False:
-        raise Exception(f'ffprobe error:dont get video information')
-    out = json.loads(out)
+    out = probe_media(audio_file)
     return float(out['format']['duration'])
 
 
+def _resample(samples, src_rate, dst_rate):
+    """
+    带抗混叠滤波的重采样，依次尝试 soxr、scipy、librosa
+    均不可用时抛出 ImportError，由调用方改用 ffmpeg 转换
+    """
+    import numpy as np
+    try:
+        import soxr
+        return soxr.resample(samples, src_rate, dst_rate)
+    except ImportError:
+        pass
+    try:
+        from math import gcd
+        from scipy.signal import resample_poly
+        g = gcd(int(src_rate), int(dst_rate))
+        return resample_poly(samples, int(dst_rate) // g, int(src_rate) // g, axis=0).astype(np.float32)
+    except ImportError:
+        pass
+    import librosa
+    return librosa.resample(np.ascontiguousarray(samples.T), orig_sr=src_rate, target_sr=dst_rate).T.astype(np.float32)
+
+
+def _decode_audio_data(data):
+    """返回 (float32 数组 (帧数, 声道), 采样率)，优先 soundfile，其次 PyAV"""
+    import io
+    import numpy as np
+    try:
+        import soundfile as sf
+        samples, sample_rate = sf.read(io.BytesIO(data), dtype='float32', always_2d=True)
+        return samples, sample_rate
+    except Exception as e:
+        sf_error = e
+    try:
+        import av
+    except ImportError:
+        raise sf_error
+    with av.open(io.BytesIO(data)) as container:
+        stream = container.streams.audio[0]
+        # 交错格式的双声道，to_ndarray 返回 (1, 帧数*2)
+        resampler = av.AudioResampler(format='flt', layout='stereo')
+        chunks = []
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1, 2))
+        if not chunks:
+            raise RuntimeError('no audio frames')
+        return np.concatenate(chunks), stream.rate
+
+
+def decode_audio_to_wav(source, output_wav, sample_rate=44100, channels=2):
+    """
+    在进程内将音频数据或文件解码、重采样并写为 pcm_s16le wav，不启动 ffmpeg
+    source 为 bytes 或文件路径，返回写入的时长毫秒，无法解码或缺少重采样库时抛出异常
+    """
+    import numpy as np
+    import soundfile as sf
+    if not isinstance(source, (bytes, bytearray)):
+        source = Path(source).read_bytes()
+    samples, src_rate = _decode_audio_data(bytes(source))
+    if len(samples) < 1:
+        raise RuntimeError('empty audio')
+    if samples.shape[1] != channels:
+        mono = samples.mean(axis=1, keepdims=True)
+        samples = np.repeat(mono, channels, axis=1)
+    if src_rate != sample_rate:
+        samples = _resample(samples, src_rate, sample_rate)
+    sf.write(output_wav, np.clip(samples, -1.0, 1.0), sample_rate, format='WAV', subtype='PCM_16')
+    invalidate_probe(output_wav)
+    return int(len(samples) * 1000 / sample_rate)
+
+
 # input_file_path 可能是字符串：文件路径，也可能是音频数据
 def remove_silence_from_end(input_file_path, silence_threshold=-50.0, chunk_size=10, is_start=True):
     from pydub import AudioSegment
@@ -266,14 +266,17 @@ def is_novoice_mp4(novoice_mp4, noextname, uuid=None):
     # 预先创建好的
     # 判断novoice_mp4是否完成
     t = 0
-    from videotrans.configure import config
+    from videotrans.configure import config, _task_state
+    token = _task_state.get(uuid)
     if noextname not in config.queue_novice and vail_file(novoice_mp4):
         return True
     if noextname in config.queue_novice and config.queue_novice[noextname] == 'end':
         return True
     last_size = 0
     while True:
-        if config.current_status != 'ing' or config.exit_soft:
+        if token is not None and token.cancelled:
+            return False
+        if token is None and (config.current_status != 'ing' or config.exit_soft):
             return False
         if vail_file(novoice_mp4):
             current_size = os.path.getsize(novoice_mp4)
@@ -311,3 +314,23 @@ def pygameaudio(filepath):
     from .playmp3 import AudioPlayer
     player = AudioPlayer(filepath)
     player.start()
+
+
+def provider_setting(name, provider, default):
+    """
+    读取形如 "10,GPTSoVITS:2,CosyVoice:1" 的设置，provider 为渠道类名，不带名称的数字为默认值，名称:数字 为对应渠道的值
+    """
+    from videotrans.configure import config
+    value = default
+    for part in str(config.settings.get(name, default)).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if ':' not in part:
+                value = int(float(part))
+            elif part.split(':')[0].strip().lower() == provider.lower():
+                return int(float(part.split(':')[1]))
+        except ValueError:
+            continue
+    return value
@@ -0,0 +1,83 @@
+"""
+缓存用 sqlite 文件的共享连接，供配音缓存、翻译记忆和 ffprobe 磁盘缓存使用
+
+文件被其他进程锁定时等待 timeout 秒后抛出 sqlite3.OperationalError，下次调用时重试；
+文件损坏(不是有效的 sqlite 数据库)时删除后按 schema 重建，缓存数据可随时丢弃。
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, List
+
+from videotrans.configure import config
+
+
+class SqliteStore:
+
+    def __init__(self, path: Callable[[], str], schema: List[str], name: str, timeout: float = 5):
+        """
+        path 返回数据库文件路径，首次连接时才调用，以便使用运行时的缓存目录
+        schema 为建表、建索引语句，name 用于日志
+        """
+        self.path = path
+        self.schema = schema
+        self.name = name
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._conn = None
+
+    def _open(self, path):
+        conn = sqlite3.connect(path, timeout=self.timeout, check_same_thread=False)
+        try:
+            for sql in self.schema:
+                conn.execute(sql)
+            conn.commit()
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def connect(self) -> sqlite3.Connection:
+        """返回共享连接，调用方须持有 self.lock"""
+        if self._conn is None:
+            path = self.path()
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            try:
+                self._conn = self._open(path)
+            except sqlite3.OperationalError:
+                # 被锁定等暂时性错误，下次调用时重试
+                raise
+            except sqlite3.DatabaseError as e:
+                config.logger.warning(f'{self.name}文件已损坏，删除后重建:{e}')
+                Path(path).unlink(missing_ok=True)
+                self._conn = self._open(path)
+        return self._conn
+
+    def rollback(self):
+        # 出错时放弃未提交的修改，避免连接一直持有写锁
+        try:
+            if self._conn is not None:
+                self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def transaction(self):
+        """
+        加锁后返回连接，正常结束时提交，出错时回滚并继续抛出
+        """
+        with self.lock:
+            try:
+                conn = self.connect()
+                yield conn
+                conn.commit()
+            except BaseException:
+                self.rollback()
+                raise
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -33,7 +33,6 @@ def openwin():
     import json
     import os
 
-    import threading
     import time
     from pathlib import Path
     from PySide6.QtCore import QThread, Signal, QUrl
@@ -69,37 +68,11 @@ def openwin():
             self.uito.emit(json.dumps({"type": type, "text": text}))
 
         #
-        def hebing_pro(self, protxt, video_time):
-            percent = 0
-            while 1:
-                if percent >= 100:
-                    return
-                if not os.path.exists(protxt):
-                    time.sleep(1)
-                    continue
-                try:
-                    content = Path(protxt).read_text(encoding='utf-8').strip().split("\n")
-                except Exception:
-                    continue
-
-                if content[-1] == 'progress=end':
-                    return
-                idx = len(content) - 1
-                end_time = "00:00:00"
-                while idx > 0:
-                    if content[idx].startswith('out_time='):
-                        end_time = content[idx].split('=')[1].strip()
-                        break
-                    idx -= 1
-                try:
-                    h, m, s = end_time.split(':')
-                    tmp1 = round((int(h) * 3600000 + int(m) * 60000 + int(s[:2]) * 1000) / video_time, 2)
-                except:
-                    tmp1 = 0
-                if percent + tmp1 < 99.9:
-                    percent += tmp1
-                self.post(type='jd', text=f'{percent:.2f}%')
-                time.sleep(1)
+        def hebing_pro(self, progress, video_time):
+            if not video_time:
+                return
+            percent = min(100.0, progress['out_time'] * 100000 / video_time)
+            self.post(type='jd', text=f'{percent:.2f}%')
 
         def run(self):
             try:
@@ -185,13 +158,8 @@ def openwin():
                     # 存在中间结果mp4
                     if end_mp4:
                         self.video = end_mp4
-                    protxt = config.TEMP_HOME + f'/jd{time.time()}.txt'
-                    threading.Thread(target=self.hebing_pro, args=(protxt, self.video_time,)).start()
-
                     cmd = [
                         '-y',
-                        "-progress",
-                        protxt,
                         '-i',
                         os.path.normpath(self.video)
                     ]
@@ -226,7 +194,7 @@ def openwin():
                             f"language={subtitle_language}"
                         ]
                     cmd.append(self.file)
-                    tools.runffmpeg(cmd)
+                    tools.runffmpeg(cmd, on_progress=lambda progress: self.hebing_pro(progress, self.video_time))
             except Exception as e:
                 print(e)
                 self.post(type='error', text=str(e))
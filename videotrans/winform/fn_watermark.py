@@ -2,8 +2,6 @@
 def openwin():
     import json
     import os
-    import threading
-    import time
     from pathlib import Path
 
     from PySide6.QtCore import QThread, Signal, QUrl
@@ -29,40 +27,15 @@ def openwin():
             self.pos = int(pos)
             self.every_percent = 1 / len(winobj.videourls)
             self.percent = 0
-            self.end = False
 
         def post(self, type='logs', text=""):
             self.uito.emit(json.dumps({"type": type, "text": text}))
 
-        def hebing_pro(self, protxt, video_time):
-            percent = 0
-            while 1:
-                if self.end or percent >= 100:
-                    return
-                if not os.path.exists(protxt):
-                    time.sleep(1)
-                    continue
-                try:
-                    content = Path(protxt).read_text(encoding='utf-8').strip().split("\n")
-                except Exception:
-                    continue
-                if content[-1] == 'progress=end':
-                    return
-                idx = len(content) - 1
-                end_time = "00:00:00"
-                while idx > 0:
-                    if content[idx].startswith('out_time='):
-                        end_time = content[idx].split('=')[1].strip()
-                        break
-                    idx -= 1
-
-                h, m, s = end_time.split(':')
-                tmp1 = round((int(h) * 3600000 + int(m) * 60000 + int(s[:2]) * 1000) / video_time, 2)
-                if percent + tmp1 < 99.9:
-                    percent += tmp1
-                self.percent += percent * self.every_percent / 100
-                self.post(type='jd', text=f'{self.percent * 100}%')
-                time.sleep(1)
+        def hebing_pro(self, progress, video_time, base_percent):
+            if not video_time:
+                return
+            ratio = min(1.0, progress['out_time'] * 1000 / video_time)
+            self.post(type='jd', text=f'{(base_percent + ratio * self.every_percent) * 100:.2f}%')
 
         def run(self) -> None:
             os.chdir(RESULT_DIR)
@@ -82,14 +55,11 @@ def openwin():
                 ]
 
                 position = positions[self.pos]
-                protxt = config.TEMP_HOME + f'/jd{time.time()}.txt'
-                threading.Thread(target=self.hebing_pro, args=(protxt, duration,)).start()
+                base_percent = self.percent
 
                 # 构建 FFmpeg 命令
                 ffmpeg_command = [
                     "-y",
-                    "-progress",
-                    protxt,
                     "-i", os.path.normpath(video),
                     "-i", os.path.normpath(self.png),
                     "-filter_complex",
@@ -102,14 +72,14 @@ def openwin():
                     result_file
                 ]
                 try:
-                    tools.runffmpeg(ffmpeg_command)
+                    tools.runffmpeg(ffmpeg_command,
+                                    on_progress=lambda progress: self.hebing_pro(progress, duration, base_percent))
                 except Exception as e:
                     self.post(type='error', text=f'{str(e)}')
                 finally:
                     self.percent += self.every_percent
                 self.post(type='jd', text=f'{self.percent * 100}%')
             self.post(type='ok', text='Ended')
-            self.end = True
 
     def feed(d):
         if winobj.has_done: